@@ -0,0 +1,510 @@
+"""
+Benchmarks for loading, formatting and writing LaTeX tables
+
+Synthetic inputs are generated once per size and format and kept in the data
+directory, so repeated runs time the same files. Each stage is timed on its
+own and the results are written as JSON. With --compare, a run is checked
+against a stored baseline and regressions are reported. Startup is timed in
+fresh interpreters, so it includes importing the module.
+
+    python benchmark.py --output baseline.json
+    python benchmark.py --compare baseline.json
+    python benchmark.py --formats ""    # only the escaping check and benchmark
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tarfile
+import zipfile
+import tempfile
+import tracemalloc
+import subprocess
+import statistics
+import numpy as np
+import pandas as pd
+import h5py
+
+import file_to_latex
+from tests.escape_corpus import ESCAPE_CONTROL_CORPUS, ESCAPE_CORPUS
+
+
+FORMATS = ["csv", "tab", "whitespace", "h5", "h5-compound", "parquet", "feather", "npy", "tar.gz", "zip"]
+STYLES = list(file_to_latex.TABLE_STYLES)
+QUICK_ROWS = [1000, 100000]
+QUICK_COLUMNS = [2, 20]
+FULL_ROWS = [1000, 100000, 1000000, 10000000]
+FULL_COLUMNS = [2, 20, 200]
+
+# Rows read by the load_slice stage of inputs that can select rows and columns
+SLICE_ROWS = 1000
+
+# Inputs are generated this many rows at a time so 10M row files don't need 10M rows in memory
+GENERATE_CHUNK_ROWS = 500000
+WORDS = np.array(["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta", "iota", "kappa"], dtype=object)
+
+
+# Cells in the escaping benchmark, drawn from the corpus and plain words
+ESCAPE_BENCH_CELLS = 500000
+
+# Modules that importing file_to_latex must not load, they are imported on first use
+DEFERRED_MODULES = ["pandas", "numpy", "h5py", "tkinter", "pyarrow"]
+# Size of the input converted by the first-conversion benchmark
+STARTUP_ROWS = 100
+STARTUP_COLUMNS = 5
+
+
+def make_frame(rows, columns, seed, start=0):
+    """
+    Generate rows of synthetic data starting at row start
+    Columns cycle through integers, floats and short strings; the same seed
+    and start always give the same values.
+    """
+    rng = np.random.default_rng([seed, start])
+    data = {}
+    for i in range(columns):
+        if i % 3 == 0:
+            data[f"c{i}"] = rng.integers(0, 1000, rows)
+        elif i % 3 == 1:
+            data[f"c{i}"] = rng.random(rows) * 100
+        else:
+            data[f"c{i}"] = WORDS[rng.integers(0, len(WORDS), rows)]
+    
+    return pd.DataFrame(data)
+
+
+def iter_frames(rows, columns, seed):
+    """Yield the synthetic data in chunks of GENERATE_CHUNK_ROWS rows"""
+    for start in range(0, rows, GENERATE_CHUNK_ROWS):
+        yield make_frame(min(GENERATE_CHUNK_ROWS, rows - start), columns, seed, start)
+
+
+def write_text(path, rows, columns, seed, sep=",", header=True):
+    """Write a delimited text input"""
+    with open(path, 'w', newline="") as f:
+        for i, chunk in enumerate(iter_frames(rows, columns, seed)):
+            chunk.to_csv(f, sep=sep, index=False, header=header and i == 0)
+
+
+def write_h5(path, rows, columns, seed, compound=False):
+    """Write an HDF5 input: a 2-D float dataset, or a compound dataset with one field per column"""
+    with h5py.File(path, 'w') as f:
+        dataset = None
+        start = 0
+        for chunk in iter_frames(rows, columns, seed):
+            if compound:
+                values = chunk.to_records(index=False, column_dtypes={
+                    name: "S8" for name in chunk.columns if not pd.api.types.is_numeric_dtype(chunk[name])
+                })
+            else:
+                values = np.random.default_rng([seed, start]).random((len(chunk), columns)) * 100
+            
+            if dataset is None:
+                dataset = f.create_dataset("data", shape=(rows,) + values.shape[1:], dtype=values.dtype)
+            dataset[start:start + len(chunk)] = values
+            start += len(chunk)
+
+
+def write_columnar(path, rows, columns, seed, fmt):
+    """Write a Parquet, Feather or .npy input; .npy holds a 2-D float array like the plain HDF5 input"""
+    if fmt == "npy":
+        values = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(rows, columns))
+        for start in range(0, rows, GENERATE_CHUNK_ROWS):
+            stop = min(start + GENERATE_CHUNK_ROWS, rows)
+            values[start:stop] = np.random.default_rng([seed, start]).random((stop - start, columns)) * 100
+        values.flush()
+        return
+    
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    # One row group or record batch per generated chunk
+    writer = None
+    try:
+        for chunk in iter_frames(rows, columns, seed):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema) if fmt == "parquet" else pa.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_archive(path, rows, columns, seed, archive_type):
+    """Write a tar.gz or zip archive holding a single CSV input"""
+    csv_path = path + ".csv"
+    write_text(csv_path, rows, columns, seed)
+    try:
+        if archive_type == "tar.gz":
+            with tarfile.open(path, "w:gz") as archive:
+                archive.add(csv_path, arcname="data.csv")
+        else:
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.write(csv_path, arcname="data.csv")
+    finally:
+        os.remove(csv_path)
+
+
+def input_path(data_dir, fmt, rows, columns, seed):
+    """Path of a generated input; the name records everything it was generated from"""
+    extension = {"csv": "csv", "tab": "txt", "whitespace": "txt", "h5": "h5", "h5-compound": "h5"}.get(fmt, fmt)
+    return os.path.join(data_dir, f"{fmt}-{rows}x{columns}-seed{seed}.{extension}")
+
+
+def generate_input(data_dir, fmt, rows, columns, seed):
+    """Generate an input file unless it already exists, and return its path"""
+    path = input_path(data_dir, fmt, rows, columns, seed)
+    if os.path.exists(path):
+        return path
+    
+    # Generate next to the final name, so an interrupted run never leaves a truncated input behind
+    partial_path = path + ".part"
+    if fmt == "csv":
+        write_text(partial_path, rows, columns, seed)
+    elif fmt == "tab":
+        write_text(partial_path, rows, columns, seed, sep="\t")
+    elif fmt == "whitespace":
+        write_text(partial_path, rows, columns, seed, sep=" ", header=False)
+    elif fmt in ["h5", "h5-compound"]:
+        write_h5(partial_path, rows, columns, seed, compound=fmt == "h5-compound")
+    elif fmt in ["parquet", "feather", "npy"]:
+        write_columnar(partial_path, rows, columns, seed, fmt)
+    else:
+        write_archive(partial_path, rows, columns, seed, fmt)
+    
+    os.replace(partial_path, path)
+    return path
+
+
+def file_type_for(fmt):
+    """The file type to load an input with"""
+    return {"csv": "csv", "tab": "text", "whitespace": "text", "h5": "h5", "h5-compound": "h5",
+            "parquet": "parquet", "feather": "feather", "npy": "npy", "tar.gz": "tar", "zip": "zip"}[fmt]
+
+
+def measure(stage, repeat, track_memory):
+    """
+    Time stage() repeat times and measure its peak memory in one more run
+    Memory is traced separately because tracemalloc slows the timed runs down.
+    Returns (result, runs, peak_bytes); peak_bytes is None without track_memory.
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = stage()
+        runs.append(time.perf_counter() - start)
+        del result
+    
+    peak_bytes = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            result = stage()
+            peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+    else:
+        result = stage()
+    
+    return result, runs, peak_bytes
+
+
+def record(results, name, runs, peak_bytes, **fields):
+    """Add one measurement to the results"""
+    results[name] = dict(fields, seconds=min(runs), median_seconds=statistics.median(runs),
+                         runs=runs, peak_bytes=peak_bytes)
+    peak = f", peak {peak_bytes / 1024 ** 2:.1f} MiB" if peak_bytes is not None else ""
+    print(f"{name}: {min(runs):.4f}s{peak}", file=sys.stderr)
+
+
+def bench_case(results, path, fmt, rows, columns, styles, repeat, track_memory, out_dir, format_jobs=None):
+    """Benchmark loading, formatting and writing one input; with format_jobs, parallel formatting too"""
+    file_type = file_type_for(fmt)
+    case = f"{fmt}/{rows}x{columns}"
+    fields = {"format": fmt, "rows": rows, "columns": columns}
+    
+    def load():
+        # Archive indexes are cached per process, start every load cold
+        file_to_latex._read_archive_index.cache_clear()
+        return file_to_latex.load_data(path, file_type)
+    
+    data, runs, peak_bytes = measure(load, repeat, track_memory)
+    record(results, f"{case}/load", runs, peak_bytes, stage="load", style=None, **fields)
+    
+    # The command line loads straight into a ColumnTable, HDF5 and .npy inputs without a DataFrame
+    def load_table():
+        file_to_latex._read_archive_index.cache_clear()
+        return file_to_latex.load_table(path, file_type)
+    
+    _, runs, peak_bytes = measure(load_table, repeat, track_memory)
+    record(results, f"{case}/load_table", runs, peak_bytes, stage="load_table", style=None, **fields)
+    
+    if file_type in ["h5", "parquet", "feather", "npy"]:
+        # Two columns of a page from the middle, only that much should be read
+        selection = file_to_latex.HDF5Selection(rows=(rows // 2, rows // 2 + SLICE_ROWS), columns=(0, 1)[:columns])
+        _, runs, peak_bytes = measure(lambda: file_to_latex.load_data(path, file_type, selection=selection),
+                                      repeat, track_memory)
+        record(results, f"{case}/load_slice", runs, peak_bytes, stage="load_slice", style=None, **fields)
+    
+    output_path = os.path.join(out_dir, "table.tex")
+    for style in styles:
+        try:
+            tabular, runs, peak_bytes = measure(lambda: file_to_latex.format_tabular(data, style),
+                                                repeat, track_memory)
+        except Exception as e:
+            print(f"{case}/format_{style}: skipped, {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        record(results, f"{case}/format_{style}", runs, peak_bytes, stage="format", style=style, **fields)
+        
+        if format_jobs:
+            _, runs, peak_bytes = measure(lambda: file_to_latex.format_tabular(data, style, jobs=format_jobs),
+                                          repeat, track_memory)
+            record(results, f"{case}/format_{style}_jobs{format_jobs}", runs, peak_bytes, stage="format",
+                   style=style, jobs=format_jobs, **fields)
+        
+        def write():
+            with open(output_path, 'w') as f:
+                f.write(file_to_latex.wrap_tabular(tabular, style, "Benchmark", "tab:bench"))
+        
+        _, runs, peak_bytes = measure(write, repeat, track_memory)
+        record(results, f"{case}/write_{style}", runs, peak_bytes, stage="write", style=style, **fields)
+        
+        # The streaming path loads, formats and writes in one pass
+        def longtable():
+            file_to_latex._read_archive_index.cache_clear()
+            return file_to_latex.stream_to_latex(path, output_path, file_type, style=style,
+                                                 caption="Benchmark", label="tab:bench")
+        
+        try:
+            _, runs, peak_bytes = measure(longtable, repeat, track_memory)
+        except ValueError as e:
+            # Styles that can't break across pages have no streaming path
+            print(f"{case}/longtable_{style}: skipped, {e}", file=sys.stderr)
+            continue
+        record(results, f"{case}/longtable_{style}", runs, peak_bytes, stage="longtable", style=style, **fields)
+
+
+def chained_escape(text):
+    """The escaping the formatters used to do, ten str.replace calls per cell; timed for comparison only"""
+    return (text.replace("&", "\\&").replace("%", "\\%").replace("$", "\\$").replace("#", "\\#")
+            .replace("_", "\\_").replace("{", "\\{").replace("}", "\\}").replace("~", "\\textasciitilde")
+            .replace("^", "\\textasciicircum").replace("\\", "\\textbackslash"))
+
+
+def check_escaping():
+    """Check every escaping path against the corpus and return the lines describing mismatches"""
+    failures = []
+    for corpus in [ESCAPE_CORPUS, ESCAPE_CORPUS + ESCAPE_CONTROL_CORPUS]:
+        texts = [text for text, _ in corpus]
+        expected = [escaped for _, escaped in corpus]
+        outputs = {
+            "escape_latex": [file_to_latex.escape_latex(text) for text in texts],
+            "escape_latex_column": file_to_latex.escape_latex_column(texts),
+            "format_column": file_to_latex.format_column(np.array(texts, dtype=object), None, None, 2, "--"),
+        }
+        for name, output in outputs.items():
+            failures.extend(f"{name}({text!r}) = {got!r}, expected {want!r}"
+                            for text, got, want in zip(texts, output, expected) if got != want)
+    
+    return list(dict.fromkeys(failures))
+
+
+def bench_escaping(results, repeat, track_memory, seed):
+    """Benchmark escaping a text-heavy column cell by cell and as a whole"""
+    words = np.array(list(WORDS) + [text for text, _ in ESCAPE_CORPUS], dtype=object)
+    cells = np.random.default_rng(seed).choice(words, ESCAPE_BENCH_CELLS).tolist()
+    fields = {"format": "text", "rows": ESCAPE_BENCH_CELLS, "columns": 1}
+    
+    stages = {
+        "chained_replace": lambda: [chained_escape(cell) for cell in cells],
+        "per_cell": lambda: [file_to_latex.escape_latex(cell) for cell in cells],
+        "column": lambda: file_to_latex.escape_latex_column(cells),
+    }
+    for name, stage in stages.items():
+        _, runs, peak_bytes = measure(stage, repeat, track_memory)
+        record(results, f"escape/{name}", runs, peak_bytes, stage="escape", style=None, **fields)
+
+
+def run_python(*args):
+    """Run a fresh interpreter next to file_to_latex and return its stdout"""
+    return subprocess.run([sys.executable, *args], cwd=os.path.dirname(os.path.abspath(file_to_latex.__file__)),
+                          check=True, capture_output=True, text=True).stdout
+
+
+def check_startup():
+    """Return the lines describing modules that importing file_to_latex loads eagerly"""
+    loaded = run_python("-c", "import sys, file_to_latex; print(*sys.modules)").split()
+    return [f"import file_to_latex loads {name}" for name in DEFERRED_MODULES if name in loaded]
+
+
+def bench_startup(results, repeat, data_dir, seed, out_dir):
+    """
+    Time a cold import, the command line help and converting one small file
+    Each run is a new interpreter, so this is the latency a user sees before
+    anything happens; the bare interpreter is timed too, to tell the two apart.
+    """
+    path = generate_input(data_dir, "csv", STARTUP_ROWS, STARTUP_COLUMNS, seed)
+    script = os.path.abspath(file_to_latex.__file__)
+    fields = {"format": "csv", "rows": STARTUP_ROWS, "columns": STARTUP_COLUMNS}
+    
+    stages = {
+        "interpreter": ["-c", "pass"],
+        "import": ["-c", "import file_to_latex"],
+        "help": [script, "--help"],
+        "first_conversion": [script, path, "--output-dir", out_dir],
+    }
+    for name, args in stages.items():
+        _, runs, _ = measure(lambda: run_python(*args), repeat, False)
+        record(results, f"startup/{name}", runs, None, stage="startup", style=None, **fields)
+
+
+def run_benchmarks(args):
+    """Generate any missing inputs and benchmark every requested case"""
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+    bench_escaping(results, args.repeat, not args.no_memory, args.seed)
+    with tempfile.TemporaryDirectory() as out_dir:
+        bench_startup(results, args.repeat, args.data_dir, args.seed, out_dir)
+        for fmt in args.formats:
+            for rows in args.rows:
+                for columns in args.columns:
+                    if args.max_cells and rows * columns > args.max_cells:
+                        print(f"{fmt}/{rows}x{columns}: skipped, more than {args.max_cells} cells", file=sys.stderr)
+                        continue
+                    
+                    print(f"{fmt}/{rows}x{columns}: generating input...", file=sys.stderr)
+                    path = generate_input(args.data_dir, fmt, rows, columns, args.seed)
+                    bench_case(results, path, fmt, rows, columns, args.styles, args.repeat,
+                               not args.no_memory, out_dir, args.format_jobs)
+    
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "h5py": h5py.__version__,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline, current, threshold, min_seconds, min_bytes):
+    """
+    Compare two benchmark runs and return the lines describing regressions
+    A time counts as a regression if it grew by more than threshold (a
+    fraction) and by more than min_seconds, so timer noise on tiny cases is
+    ignored; peak memory likewise with min_bytes.
+    """
+    regressions = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        
+        if new["seconds"] > old["seconds"] * (1 + threshold) and new["seconds"] - old["seconds"] > min_seconds:
+            change = (new["seconds"] / old["seconds"] - 1) * 100 if old["seconds"] else float("inf")
+            regressions.append(f"{name}: time {old['seconds']:.4f}s -> {new['seconds']:.4f}s (+{change:.0f}%)")
+        
+        if old.get("peak_bytes") and new.get("peak_bytes") is not None:
+            if new["peak_bytes"] > old["peak_bytes"] * (1 + threshold) and new["peak_bytes"] - old["peak_bytes"] > min_bytes:
+                change = (new["peak_bytes"] / old["peak_bytes"] - 1) * 100
+                regressions.append(f"{name}: peak memory {old['peak_bytes'] / 1024 ** 2:.1f} MiB -> "
+                                   f"{new['peak_bytes'] / 1024 ** 2:.1f} MiB (+{change:.0f}%)")
+    
+    return regressions
+
+
+def comma_list(convert=str):
+    """argparse type for comma separated lists"""
+    return lambda text: [convert(item) for item in text.split(",") if item.strip()]
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Benchmark loading, formatting and writing LaTeX tables.")
+    parser.add_argument("--formats", type=comma_list(), default=FORMATS,
+                        help=f"input formats to benchmark (default: {','.join(FORMATS)})")
+    parser.add_argument("--rows", type=comma_list(int), help="row counts (default: 1000,100000)")
+    parser.add_argument("--columns", type=comma_list(int), help="column counts (default: 2,20)")
+    parser.add_argument("--full", action="store_true",
+                        help="1k to 10M rows and 2 to 200 columns; needs tens of GB of disk and a long time")
+    parser.add_argument("--max-cells", type=int, help="skip inputs with more rows x columns than this")
+    parser.add_argument("--styles", type=comma_list(), default=STYLES, help="table styles to format")
+    parser.add_argument("--format-jobs", type=int, metavar="N",
+                        help="also time formatting on N processes; tables under "
+                             f"{file_to_latex.PARALLEL_FORMAT_MIN_CELLS:,} cells are formatted serially anyway")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage, the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated inputs")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "file_to_latex_bench"),
+                        help="where generated inputs are kept between runs")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run that measures peak memory")
+    parser.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="report regressions against a stored JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown or memory growth counted as a regression (default: 0.2)")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="ignore slowdowns smaller than this many seconds (default: 0.005)")
+    parser.add_argument("--min-bytes", type=int, default=1024 ** 2,
+                        help="ignore memory growth smaller than this many bytes (default: 1 MiB)")
+    args = parser.parse_args(argv)
+    
+    unknown = set(args.formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+    
+    args.rows = args.rows or (FULL_ROWS if args.full else QUICK_ROWS)
+    args.columns = args.columns or (FULL_COLUMNS if args.full else QUICK_COLUMNS)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # A fast escaper is no use if its output is wrong
+    failures = check_escaping()
+    for line in failures:
+        print(f"ESCAPING {line}", file=sys.stderr)
+    if failures:
+        return 1
+    
+    # Neither should a startup that pulls in pandas before it needs it
+    failures = check_startup()
+    for line in failures:
+        print(f"STARTUP {line}", file=sys.stderr)
+    if failures:
+        return 1
+    
+    current = run_benchmarks(args)
+    
+    output = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        
+        regressions = compare_results(baseline, current, args.threshold, args.min_seconds, args.min_bytes)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        print(f"{len(regressions)} regressions against {args.compare}", file=sys.stderr)
+        return 1 if regressions else 0
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
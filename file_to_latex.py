@@ -1,13 +1,2579 @@
 import os
+import re
+import sys
+import glob
+import time
+import argparse
+import threading
+import contextlib
+import functools
+import itertools
+import hashlib
+import pickle
+import json
+import csv
+import io
+import mmap
+import cProfile
+import pstats
+import contextvars
+from collections import OrderedDict, namedtuple
 import tarfile
 import zipfile
 import tempfile
-import pandas as pd
-import numpy as np
-import h5py
-import tkinter as tk
-from tkinter import filedialog, ttk, messagebox
+import importlib
 from pathlib import Path
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit, parse_qs
+import ipaddress
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first use
+    pandas and numpy take most of the startup time, h5py is only needed for
+    HDF5 inputs and tkinter only for the GUI, so none of them is imported until
+    something is looked up on it. The import then replaces the stand-in in this
+    module's globals, so later lookups go straight to the module.
+    """
+    
+    def __init__(self, name, alias):
+        self._name = name
+        self._alias = alias
+    
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+    
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+pd = LazyModule("pandas", "pd")
+np = LazyModule("numpy", "np")
+h5py = LazyModule("h5py", "h5py")
+tk = LazyModule("tkinter", "tk")
+tkfont = LazyModule("tkinter.font", "tkfont")
+ttk = LazyModule("tkinter.ttk", "ttk")
+filedialog = LazyModule("tkinter.filedialog", "filedialog")
+messagebox = LazyModule("tkinter.messagebox", "messagebox")
+
+
+# Characters that need escaping in LaTeX text, mapped to their escaped form
+LATEX_ESCAPES = {
+    "&": "\\&",
+    "%": "\\%",
+    "$": "\\$",
+    "#": "\\#",
+    "_": "\\_",
+    "{": "\\{",
+    "}": "\\}",
+    "~": "\\textasciitilde{}",
+    "^": "\\textasciicircum{}",
+    "\\": "\\textbackslash{}",
+}
+_LATEX_ESCAPE_TABLE = str.maketrans(LATEX_ESCAPES)
+
+# Joins the cells of a column, and stands in for backslashes while the other characters are escaped
+_CELL_SEPARATOR = "\x00"
+_BACKSLASH_PLACEHOLDER = "\x01"
+
+
+def escape_latex(text):
+    """
+    Escape special LaTeX characters in a single string, as LATEX_ESCAPES maps them
+    Backslashes are swapped for a placeholder first and restored last, so the
+    backslashes and braces put in for & or ~ are never escaped again. Most
+    text has few special characters, so checking for each one and replacing
+    only those that occur beats a translate table; the checks are unrolled
+    because a loop over the table costs more than they do.
+    """
+    backslash = "\\" in text
+    if backslash:
+        if _BACKSLASH_PLACEHOLDER in text:
+            # The placeholder occurs in the text itself, translate does it in one pass instead
+            return text.translate(_LATEX_ESCAPE_TABLE)
+        text = text.replace("\\", _BACKSLASH_PLACEHOLDER)
+    
+    if "&" in text:
+        text = text.replace("&", "\\&")
+    if "%" in text:
+        text = text.replace("%", "\\%")
+    if "$" in text:
+        text = text.replace("$", "\\$")
+    if "#" in text:
+        text = text.replace("#", "\\#")
+    if "_" in text:
+        text = text.replace("_", "\\_")
+    # Braces before ~ and ^, whose escapes end in {}
+    if "{" in text:
+        text = text.replace("{", "\\{")
+    if "}" in text:
+        text = text.replace("}", "\\}")
+    if "~" in text:
+        text = text.replace("~", "\\textasciitilde{}")
+    if "^" in text:
+        text = text.replace("^", "\\textasciicircum{}")
+    
+    return text.replace(_BACKSLASH_PLACEHOLDER, "\\textbackslash{}") if backslash else text
+
+
+def escape_latex_column(values):
+    """
+    Escape a list of strings, giving the same result as escape_latex on each
+    The cells are joined into one string, so each special character costs a
+    single str.replace over the whole column instead of a call per cell.
+    """
+    text = _CELL_SEPARATOR.join(values)
+    if text.count(_CELL_SEPARATOR) != len(values) - 1:
+        # No cells, or cells containing the separator
+        return [escape_latex(value) for value in values]
+    return escape_latex(text).split(_CELL_SEPARATOR)
+
+
+def _null_mask(values):
+    """Boolean mask of the missing values in a column array, or None if it has none"""
+    if not isinstance(values, np.ndarray):
+        na_mask = np.asarray(values.isna())
+    elif values.dtype.kind in "biuSU":
+        return None
+    elif values.dtype.kind == "f":
+        na_mask = np.isnan(values)
+    else:
+        na_mask = pd.isna(values)
+    return na_mask if na_mask.any() else None
+
+
+def _column_values(column):
+    """The array a ColumnTable keeps for a Series: its NumPy or extension array, without a copy"""
+    if isinstance(column.dtype, np.dtype):
+        return column.to_numpy()
+    return column.array
+
+
+class ColumnTable:
+    """
+    Compact typed table handed from the loaders to the formatters
+    columns holds one array per column, the data as loaded without a copy: a
+    1-D NumPy array, or the pandas extension array of a nullable, Arrow-backed
+    or categorical column. Cells only become Python objects while their column
+    is formatted. masks holds a boolean mask of the missing values per column,
+    None for columns without any. headers are the column names escaped for
+    LaTeX, and row_dtype the dtype a whole row upcasts to (see _row_dtype).
+    """
+    __slots__ = ("names", "headers", "columns", "masks", "row_dtype", "num_rows")
+    
+    def __init__(self, names, columns, num_rows, masks=None, row_dtype=None, headers=None):
+        self.names = list(names)
+        self.headers = escape_latex_column([str(name) for name in self.names]) if headers is None else headers
+        self.columns = list(columns)
+        self.masks = [_null_mask(values) for values in self.columns] if masks is None else list(masks)
+        self.row_dtype = row_dtype
+        self.num_rows = num_rows
+    
+    @classmethod
+    def from_arrays(cls, names, arrays):
+        """A table of 1-D arrays of equal length, kept as they are"""
+        return cls(names, arrays, len(arrays[0]) if arrays else 0,
+                   row_dtype=_row_dtype(values.dtype for values in arrays))
+    
+    @classmethod
+    def from_frame(cls, data):
+        """A table of the columns of a DataFrame, sharing its numeric data"""
+        columns = [_column_values(data.iloc[:, i]) for i in range(len(data.columns))]
+        return cls(data.columns, columns, len(data), row_dtype=_row_dtype(data.dtypes))
+    
+    def __len__(self):
+        return self.num_rows
+    
+    @property
+    def size(self):
+        """Number of cells"""
+        return self.num_rows * len(self.columns)
+    
+    @property
+    def dtypes(self):
+        return [values.dtype for values in self.columns]
+    
+    def head(self, n):
+        """The first n rows, as views of this table"""
+        return ColumnTable(self.names, [values[:n] for values in self.columns], min(n, self.num_rows),
+                           [None if na_mask is None else na_mask[:n] for na_mask in self.masks], self.row_dtype,
+                           self.headers)
+    
+    def to_frame(self, start=0):
+        """A DataFrame of the table, with row labels counting from start"""
+        return pd.DataFrame(dict(zip(self.names, self.columns)), index=pd.RangeIndex(start, start + self.num_rows))
+
+
+def as_column_table(data):
+    """A ColumnTable of data, which may already be one or a DataFrame"""
+    return data if isinstance(data, ColumnTable) else ColumnTable.from_frame(data)
+
+
+def format_cell(val, precision, na_rep, escape=True):
+    """Format a single value the same way the column formatter does; with escape False, text is left unescaped"""
+    if pd.isna(val):
+        return na_rep
+    elif isinstance(val, (int, np.integer)):
+        # Format integers without decimal point
+        return f"{val:d}"
+    elif isinstance(val, (float, np.floating)):
+        # Format floats with the requested precision, dropping it for whole numbers
+        if val.is_integer():
+            return f"{int(val)}"
+        return f"{val:.{precision}f}"
+    elif escape:
+        return escape_latex(str(val))
+    return str(val)
+
+
+def _row_dtype(dtypes):
+    """
+    Return the dtype a single row of a DataFrame with these column dtypes takes
+    on, or None if rows are object dtype. Mixed int/float frames upcast every
+    cell to float per row, so the column formatter must do the same to produce
+    identical output.
+    """
+    dtypes = list(dtypes)
+    if dtypes and all(isinstance(dtype, np.dtype) and dtype.kind in "iuf" for dtype in dtypes):
+        return np.result_type(*dtypes)
+    return None
+
+
+def _format_float_column(values, na_mask, precision, na_rep):
+    """Vectorized formatting of a float64 array; na_mask marks the NaNs, None if there are none"""
+    out = np.empty(len(values), dtype=object)
+    if na_mask is None:
+        na_mask = np.zeros(len(values), dtype=bool)
+    out[na_mask] = na_rep
+    
+    # Whole numbers are printed as integers, everything else with fixed precision
+    with np.errstate(invalid="ignore"):
+        integral = ~na_mask & np.isfinite(values) & (values == np.trunc(values))
+    small = integral & (np.abs(values) < 2.0 ** 63)
+    if small.any():
+        out[small] = values[small].astype(np.int64).astype(str)
+    large = integral & ~small
+    if large.any():
+        out[large] = [str(int(val)) for val in values[large]]
+    rest = ~(na_mask | integral)
+    if rest.any():
+        fmt = f"%.{precision}f"
+        out[rest] = [fmt % val for val in values[rest].tolist()]
+    return out.tolist()
+
+
+def format_column(values, na_mask, row_dtype, precision, na_rep):
+    """
+    Format every cell of a ColumnTable column to its LaTeX string in one pass,
+    dispatching on the array dtype rather than on each value.
+    """
+    if not isinstance(values, np.ndarray):
+        # Extension arrays: nullable, Arrow-backed and categorical columns
+        values = values.to_numpy(dtype=object)
+    
+    kind = values.dtype.kind
+    if kind == "b":
+        # Booleans are integers to the formatter and print as 1 and 0
+        return values.astype(np.int64).astype(str).tolist()
+    
+    if kind in "iu":
+        if row_dtype is not None and row_dtype.kind == "f":
+            return _format_float_column(values.astype(row_dtype).astype(np.float64), None, precision, na_rep)
+        return values.astype(str).tolist()
+    
+    if kind == "f":
+        return _format_float_column(values.astype(np.float64, copy=False), na_mask, precision, na_rep)
+    
+    if kind != "O":
+        # Strings, datetimes and the like read straight into arrays, as pandas would hand them out
+        values = pd.Series(values, copy=False).to_numpy(dtype=object)
+    if na_mask is None:
+        na_mask = np.zeros(len(values), dtype=bool)
+    if pd.api.types.infer_dtype(values, skipna=True) == "string":
+        # Pure text column: escaped as a whole, not cell by cell
+        out = np.full(len(values), na_rep, dtype=object)
+        out[~na_mask] = escape_latex_column(values[~na_mask].tolist())
+        return out.tolist()
+    
+    # Mixed or exotic column (datetimes, categories, nullable types, ...): converted cell by cell, then
+    # escaped as a whole, which leaves the numbers unchanged
+    out = np.full(len(values), na_rep, dtype=object)
+    out[~na_mask] = escape_latex_column([format_cell(val, precision, na_rep, escape=False)
+                                         for val in values[~na_mask].tolist()])
+    return out.tolist()
+
+
+def format_rows(data, precision, na_rep):
+    """Format a ColumnTable or DataFrame into LaTeX row strings (without the trailing \\\\)"""
+    table = as_column_table(data)
+    if not table.columns:
+        return [""] * len(table)
+    
+    columns = [format_column(values, na_mask, table.row_dtype, precision, na_rep)
+               for values, na_mask in zip(table.columns, table.masks)]
+    return [" & ".join(cells) for cells in zip(*columns)]
+
+
+@functools.lru_cache(maxsize=32)
+def _read_archive_index(file_path, mtime_ns, archive_type):
+    """Read the member index of an archive, cached per path and modification time"""
+    if archive_type == "tar":
+        # Only the tar headers are read, member data is skipped
+        with tarfile.open(file_path, "r:*") as tar:
+            return {member.name: member for member in tar.getmembers() if member.isfile()}
+    
+    # Zip archives list their members in the central directory
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        return {info.filename: info for info in zip_ref.infolist() if not info.is_dir()}
+
+
+def archive_index(file_path, archive_type):
+    """Return a mapping of member name to member info for a tar or zip archive"""
+    file_path = os.path.abspath(file_path)
+    return _read_archive_index(file_path, os.stat(file_path).st_mtime_ns, archive_type)
+
+
+@contextlib.contextmanager
+def open_archive_member(file_path, archive_type, member):
+    """Open a single archive member as a binary file object without extracting it to disk"""
+    index = archive_index(file_path, archive_type)
+    if member not in index:
+        raise ValueError(f"No member named {member} in archive")
+    
+    if archive_type == "tar":
+        with tarfile.open(file_path, "r:*") as tar:
+            # Passing the cached header lets tarfile seek straight to the member data
+            with tar.extractfile(index[member]) as f:
+                yield f
+    else:
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            with zip_ref.open(index[member]) as f:
+                yield f
+
+
+# Rows read per chunk when a load reports progress or output is streamed
+READ_CHUNK_ROWS = 100000
+
+
+# Counters shown as columns in stats reports, in this order; other counters are listed after them
+STATS_COLUMNS = ["rows", "cells", "bytes_in", "bytes_out"]
+
+
+class RunStats:
+    """
+    Timers and counters for the stages of a conversion
+    Each stage accumulates its wall time, how often it ran and any counters
+    recorded for it, e.g. rows, cells, bytes_in and bytes_out.
+    """
+    
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.profile = None
+        self._lock = threading.Lock()
+    
+    def add(self, name, seconds=0.0, **counters):
+        """Add one run of a stage"""
+        with self._lock:
+            stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            stage["seconds"] += seconds
+            stage["calls"] += 1
+            for counter, value in counters.items():
+                stage[counter] = stage.get(counter, 0) + value
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time the block as one run of a stage; counters set on the yielded dict are added to it"""
+        counters = {}
+        start = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            self.add(name, time.perf_counter() - start, **counters)
+    
+    def add_profile(self, profiler):
+        """Keep the results of a cProfile run, merged with any earlier ones"""
+        with self._lock:
+            if self.profile is None:
+                self.profile = pstats.Stats(profiler)
+            else:
+                self.profile.add(profiler)
+    
+    def report(self):
+        """The stages as a dict of plain values, e.g. for JSON"""
+        with self._lock:
+            return {name: dict(stage) for name, stage in self.stages.items()}
+    
+    def summary(self):
+        """One line for a status bar: the stages that took the most time"""
+        stages = sorted(self.report().items(), key=lambda item: -item[1]["seconds"])
+        return ", ".join(f"{name} {stage['seconds']:.3f}s" for name, stage in stages[:4])
+    
+    def profile_text(self, limit=30):
+        """The slowest functions of the captured profile by cumulative time, or "" without one"""
+        if self.profile is None:
+            return ""
+        
+        stream = io.StringIO()
+        with self._lock:
+            self.profile.stream = stream
+            self.profile.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+    
+    def format_report(self, profile_limit=30):
+        """The stages as a text table, followed by the profile if one was captured"""
+        text = format_stats(self.report())
+        profile = self.profile_text(profile_limit)
+        return f"{text}\n\n{profile.strip()}" if profile else text
+
+
+def format_stats(report):
+    """Format a RunStats report as a text table"""
+    lines = [f"{'stage':<10} {'calls':>7} {'seconds':>9} " + " ".join(f"{name:>12}" for name in STATS_COLUMNS)]
+    for name, stage in report.items():
+        line = f"{name:<10} {stage['calls']:>7,} {stage['seconds']:>9.3f} "
+        line += " ".join(f"{stage[column]:>12,}" if column in stage else f"{'-':>12}" for column in STATS_COLUMNS)
+        
+        others = [f"{counter}={value:,}" for counter, value in stage.items()
+                  if counter not in STATS_COLUMNS + ["seconds", "calls"]]
+        lines.append(line + ("  " + " ".join(others) if others else ""))
+    
+    total = sum(stage["seconds"] for stage in report.values())
+    lines.append(f"{'total':<10} {'':>7} {total:>9.3f}")
+    return "\n".join(lines)
+
+
+# The RunStats that stage() records into, set by collect_stats
+_current_stats = contextvars.ContextVar("current_stats", default=None)
+
+
+@contextlib.contextmanager
+def collect_stats(stats=None, profile=False):
+    """
+    Record the stages of the conversion code run inside the block
+    Yields the RunStats (a new one unless stats is given). With profile, the
+    block also runs under cProfile and the results are kept in stats.profile.
+    Only code running in the current thread is recorded.
+    """
+    stats = RunStats() if stats is None else stats
+    token = _current_stats.set(stats)
+    profiler = cProfile.Profile() if profile else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        yield stats
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            stats.add_profile(profiler)
+        _current_stats.reset(token)
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Time the block as a stage of the collect_stats run in progress; a no-op outside of one"""
+    stats = _current_stats.get()
+    if stats is None:
+        yield {}
+        return
+    
+    with stats.stage(name) as counters:
+        yield counters
+
+
+def _bytes_read(source):
+    """Input size of a source: the file size of a path, the read position of a file object"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    
+    try:
+        return source.tell()
+    except (OSError, ValueError):
+        return 0
+
+
+class ConversionCancelled(Exception):
+    """Raised from a progress callback to abort a running load"""
+
+
+def parse_range(text):
+    """Parse "start:stop" (either side optional) or a single index into a (start, stop) tuple"""
+    text = text.strip()
+    if ":" not in text:
+        return (int(text), int(text) + 1)
+    
+    start, stop = text.split(":", 1)
+    return (int(start) if start.strip() else 0, int(stop) if stop.strip() else None)
+
+
+def parse_columns(text):
+    """Parse a column selection: comma separated names or indices, or a "start:stop" index range"""
+    text = text.strip()
+    if ":" in text:
+        start, stop = parse_range(text)
+        return tuple(range(start, stop))
+    
+    return tuple(int(col) if col.strip().isdigit() else col.strip() for col in text.split(",") if col.strip())
+
+
+class HDF5Selection(namedtuple("HDF5Selection", ["dataset", "rows", "columns"], defaults=[None, None, None])):
+    """
+    Which part of an HDF5, Parquet, Feather or .npy file to read
+    dataset is the HDF5 dataset path (the first dataset by default), rows a
+    (start, stop) tuple and columns a tuple of column or field names or column
+    indices. Only the selected rows and columns are read from disk.
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def from_strings(cls, dataset="", rows="", columns=""):
+        """Build a selection from UI or command line text, empty strings meaning everything"""
+        return cls(
+            dataset=dataset.strip() or None,
+            rows=parse_range(rows) if rows.strip() else None,
+            columns=parse_columns(columns) if columns.strip() else None
+        )
+
+
+def first_dataset_name(f):
+    """Return the path of the first dataset in an open HDF5 file, stopping the walk as soon as it is found"""
+    # visititems stops as soon as the callback returns something other than None
+    name = f.visititems(lambda name, obj: name if isinstance(obj, h5py.Dataset) else None)
+    
+    if name is None:
+        raise ValueError("No datasets found in HDF5 file")
+    
+    return name
+
+
+def list_h5_group(source, group="/"):
+    """
+    List the direct children of an HDF5 group as (path, is_group, description) tuples
+    Only this group is read, so large files can be browsed one level at a time.
+    """
+    children = []
+    with h5py.File(source, 'r') as f:
+        for name, obj in f[group].items():
+            path = f"{group.rstrip('/')}/{name}"
+            if isinstance(obj, h5py.Group):
+                children.append((path, True, f"{len(obj)} items"))
+            elif isinstance(obj, h5py.Dataset):
+                children.append((path, False, f"{obj.shape} {obj.dtype}"))
+    
+    return children
+
+
+def _decode_strings(values):
+    """Decode byte strings read from HDF5 into str, leaving other values alone"""
+    if values.dtype.kind == "S":
+        return np.char.decode(values, "utf-8")
+    
+    if values.dtype.kind == "O" and len(values) and isinstance(values[0], bytes):
+        # Variable-length strings come back as an object array of bytes
+        return np.array([val.decode("utf-8") if isinstance(val, bytes) else val for val in values], dtype=object)
+    
+    return values
+
+
+def _check_table_shape(dataset):
+    """Raise if an HDF5 dataset can't be shown as a table"""
+    if dataset.ndim == 0 or dataset.ndim > 2:
+        raise ValueError(f"Only 1-D and 2-D datasets can be shown as a table, {dataset.name} has shape {dataset.shape}")
+
+
+def _row_bounds(num_rows, rows=None, max_rows=None):
+    """Clip a (start, stop) row range to a table of num_rows rows and the row limit"""
+    start, stop = rows or (0, None)
+    stop = num_rows if stop is None else min(stop, num_rows)
+    if max_rows:
+        stop = min(stop, start + max_rows)
+    return min(start, stop), stop
+
+
+def read_h5_table(dataset, rows=None, columns=None, max_rows=None):
+    """
+    Read a hyperslab of an HDF5 dataset into a ColumnTable
+    Compound datasets become one column per field, 2-D datasets one column per
+    index along the second axis. Only the selected rows and columns are read,
+    and the columns are views of what was read.
+    """
+    _check_table_shape(dataset)
+    start, stop = _row_bounds(len(dataset), rows, max_rows)
+    
+    if dataset.dtype.names:
+        # Compound dtype: read only the selected fields and name the columns after them
+        fields = _selected_names(list(dataset.dtype.names), columns)
+        values = dataset.fields(fields)[start:stop] if columns else dataset[start:stop]
+        if values.dtype.names is None:
+            # h5py returns a plain array when a single field is read
+            values = {fields[0]: values}
+        return ColumnTable.from_arrays(fields, [_decode_strings(values[name]) for name in fields])
+    
+    if dataset.ndim == 1:
+        return ColumnTable.from_arrays([0], [_decode_strings(dataset[start:stop])])
+    
+    # 2-D: h5py needs increasing column indices, a contiguous range is read as a slice
+    cols = _selected_names(list(range(dataset.shape[1])), columns)
+    read = sorted(cols)
+    if read and read == list(range(read[0], read[-1] + 1)):
+        values = dataset[start:stop, read[0]:read[-1] + 1]
+    else:
+        values = dataset[start:stop, read]
+    
+    # Then put the columns back in the order they were selected in
+    position = {col: i for i, col in enumerate(read)}
+    return ColumnTable.from_arrays(cols, [_decode_strings(values[:, position[col]]) for col in cols])
+
+
+def read_h5_dataset(dataset, rows=None, columns=None, max_rows=None):
+    """Read a hyperslab of an HDF5 dataset into a DataFrame (see read_h5_table)"""
+    table = read_h5_table(dataset, rows, columns, max_rows)
+    return table.to_frame(_row_bounds(len(dataset), rows, max_rows)[0])
+
+
+def _selected_names(names, columns):
+    """The names of the columns selected by names or indices, all of them without a selection"""
+    if not columns:
+        return list(names)
+    
+    selected = []
+    for col in columns:
+        if isinstance(col, int):
+            if col >= len(names):
+                raise ValueError(f"Column index {col} out of range, the file has {len(names)} columns")
+            col = names[col]
+        elif col not in names:
+            raise ValueError(f"Column {col!r} not found in file")
+        selected.append(col)
+    return list(dict.fromkeys(selected))
+
+
+# File types read through pyarrow, a row group or record batch at a time
+ARROW_FILE_TYPES = ["parquet", "feather"]
+
+
+@contextlib.contextmanager
+def open_arrow_file(source, file_type):
+    """
+    Open a Parquet or Feather file and yield (column names, piece lengths, read_piece)
+    A piece is a Parquet row group or an Arrow record batch, read_piece(i, names)
+    reads only those columns of piece i. Feather files given by path are
+    memory-mapped, so only the pages of the pieces read are loaded.
+    """
+    import pyarrow as pa
+    
+    if file_type == "parquet":
+        import pyarrow.parquet as pq
+        with pq.ParquetFile(source) as f:
+            # Index columns stored by pandas aren't table columns
+            index_columns = [col for col in (f.schema_arrow.pandas_metadata or {}).get("index_columns", [])
+                             if isinstance(col, str)]
+            names = [name for name in f.schema_arrow.names if name not in index_columns]
+            lengths = [f.metadata.row_group(i).num_rows for i in range(f.num_row_groups)]
+            yield names, lengths, lambda i, columns: f.read_row_group(i, columns=columns)
+        return
+    
+    # Feather version 2 is the Arrow IPC file format
+    opened = pa.memory_map(str(source)) if isinstance(source, (str, os.PathLike)) else contextlib.nullcontext(source)
+    with opened as f:
+        reader = pa.ipc.open_file(f)
+        lengths = [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+        yield reader.schema.names, lengths, lambda i, columns: pa.Table.from_batches(
+            [reader.get_batch(i).select(columns)])
+
+
+def iter_arrow_tables(source, file_type, rows=None, columns=None, max_rows=None):
+    """
+    Yield (first row, pyarrow Table) for the selected rows and columns of a Parquet or Feather file
+    Only the pieces overlapping the row range are read, and of those only the
+    selected columns. An empty selection yields one empty table.
+    """
+    with open_arrow_file(source, file_type) as (names, lengths, read_piece):
+        names = _selected_names(names, columns)
+        start, stop = _row_bounds(sum(lengths), rows, max_rows)
+        
+        offset = 0
+        for i, length in enumerate(lengths):
+            piece_start, piece_stop = max(start, offset), min(stop, offset + length)
+            if piece_start < piece_stop or (start == stop and i == len(lengths) - 1):
+                table = read_piece(i, names)
+                yield piece_start, table.slice(piece_start - offset, max(piece_stop - piece_start, 0))
+            offset += length
+
+
+def _arrow_table_to_frame(table, start):
+    """Convert a pyarrow Table to a DataFrame whose row labels start at start"""
+    data = table.to_pandas()
+    data.index = pd.RangeIndex(start, start + len(data))
+    return data
+
+
+def read_arrow(source, file_type, rows=None, columns=None, max_rows=None):
+    """Read the selected rows and columns of a Parquet or Feather file into a DataFrame"""
+    import pyarrow as pa
+    
+    pieces = list(iter_arrow_tables(source, file_type, rows, columns, max_rows))
+    if not pieces:
+        # A file without row groups or record batches
+        return pd.DataFrame()
+    return _arrow_table_to_frame(pa.concat_tables([table for _, table in pieces]), pieces[0][0])
+
+
+def open_npy(source):
+    """
+    Open a .npy file as an array
+    Files given by path are memory-mapped, so only the rows read are loaded.
+    Object arrays are refused, loading them would unpickle arbitrary data.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        values = np.load(source, mmap_mode="r", allow_pickle=False)
+    else:
+        # Archive members can't be mapped, and numpy trips over tar members' missing fileno, so read them whole
+        values = np.load(io.BytesIO(source.read()), allow_pickle=False)
+    if values.ndim == 0 or values.ndim > 2:
+        raise ValueError(f"Only 1-D and 2-D arrays can be shown as a table, this one has shape {values.shape}")
+    return values
+
+
+def read_npy_table(values, rows=None, columns=None, max_rows=None):
+    """
+    Read the selected rows and columns of an array from open_npy into a ColumnTable
+    Structured arrays become one column per field, 2-D arrays one column per
+    index along the second axis, like HDF5 datasets. The columns are views of
+    the array, so a memory-mapped file is only read as they are formatted.
+    """
+    start, stop = _row_bounds(len(values), rows, max_rows)
+    
+    if values.dtype.names:
+        fields = _selected_names(list(values.dtype.names), columns)
+        return ColumnTable.from_arrays(fields, [_decode_strings(values[name][start:stop]) for name in fields])
+    
+    if values.ndim == 1:
+        return ColumnTable.from_arrays([0], [_decode_strings(values[start:stop])])
+    
+    cols = _selected_names(list(range(values.shape[1])), columns)
+    if cols != list(range(values.shape[1])):
+        # Picking columns copies, but only the selected rows
+        values = values[start:stop, cols]
+        start, stop = 0, len(values)
+    return ColumnTable.from_arrays(cols, [_decode_strings(values[start:stop, i]) for i in range(len(cols))])
+
+
+def read_npy_array(values, rows=None, columns=None, max_rows=None):
+    """Read the selected rows and columns of an array from open_npy into a DataFrame (see read_npy_table)"""
+    table = read_npy_table(values, rows, columns, max_rows)
+    return table.to_frame(_row_bounds(len(values), rows, max_rows)[0])
+
+
+TEXT_SAMPLE_BYTES = 64 * 1024
+
+
+def parse_dtypes(text):
+    """Parse comma separated "column:type" pairs into a tuple of (column, type) tuples"""
+    dtypes = []
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        
+        col, sep, dtype = item.rpartition(":")
+        if not sep or not col.strip() or not dtype.strip():
+            raise ValueError(f"Expected column:type, got {item.strip()!r}")
+        
+        # Fail early on a misspelt type rather than halfway through a large file
+        try:
+            pd.api.types.pandas_dtype(dtype.strip())
+        except TypeError as e:
+            raise ValueError(str(e)) from e
+        col = col.strip()
+        dtypes.append((int(col) if col.isdigit() else col, dtype.strip()))
+    
+    return tuple(dtypes)
+
+
+class TextOptions(namedtuple("TextOptions", ["engine", "usecols", "dtype"], defaults=["c", None, None])):
+    """
+    How to parse CSV and text files
+    engine is "c" (the pandas parser) or "pyarrow" (multi-threaded, requires
+    pyarrow), usecols a tuple of column names or indices to read and dtype a
+    tuple of (column, type) pairs, e.g. (("price", "float32"),).
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def from_strings(cls, engine="c", usecols="", dtype=""):
+        """Build options from UI or command line text, empty strings meaning the defaults"""
+        if engine not in ["c", "pyarrow"]:
+            raise ValueError(f"Unknown CSV engine: {engine}")
+        
+        return cls(
+            engine=engine,
+            usecols=parse_columns(usecols) if usecols.strip() else None,
+            dtype=parse_dtypes(dtype) if dtype.strip() else None
+        )
+
+
+class TextFormat(namedtuple("TextFormat", ["delimiter", "quotechar", "header", "columns"])):
+    """
+    Layout of a delimited text file
+    delimiter is None for whitespace separated files, header tells whether the
+    first line holds column names and columns lists them (or the column indices
+    if there is no header).
+    """
+    __slots__ = ()
+
+
+def _is_number(text):
+    """Whether read_csv would parse text as a number"""
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _has_header(rows, default):
+    """
+    Guess whether the first of the sampled rows is a header
+    Each column whose values are all numbers votes for a header if its first
+    cell is text and against one if it is a number; default breaks a tie.
+    """
+    votes = 0
+    for i, name in enumerate(rows[0]):
+        values = [row[i] for row in rows[1:] if i < len(row) and row[i].strip()]
+        if values and all(_is_number(value) for value in values):
+            votes += -1 if _is_number(name) else 1
+    
+    if len(rows) == 1:
+        # Nothing to compare against: a line of numbers is data
+        return not all(_is_number(name) for name in rows[0])
+    
+    return votes > 0 if votes else default
+
+
+def sniff_text_format(source, delimiter=None, header=None):
+    """
+    Work out the delimiter, quoting and header of a delimited text file from its first lines
+    delimiter and header can be given to skip guessing them, as for .csv files.
+    File objects are rewound afterwards.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            sample = f.read(TEXT_SAMPLE_BYTES)
+    else:
+        sample = source.read(TEXT_SAMPLE_BYTES)
+        source.seek(0)
+    
+    lines = sample.decode(errors="replace").splitlines()
+    if len(sample) == TEXT_SAMPLE_BYTES and len(lines) > 1:
+        # The last line is probably cut off
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()]
+    sample = "\n".join(lines)
+    
+    quotechar = '"'
+    if delimiter is None and lines:
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",\t;| ")
+            quotechar = dialect.quotechar
+            if dialect.delimiter != " ":
+                delimiter = dialect.delimiter
+        except csv.Error:
+            # No consistent delimiter, e.g. a single column: split on whitespace
+            pass
+    
+    if delimiter is None:
+        rows = [line.split() for line in lines]
+    else:
+        rows = list(csv.reader(lines, delimiter=delimiter, quotechar=quotechar))
+    
+    if header is None:
+        # Delimited files have always been read with a header, whitespace separated ones without
+        header = _has_header(rows, default=delimiter is not None) if rows else False
+    
+    if header and rows:
+        columns = rows[0]
+    else:
+        columns = list(range(max((len(row) for row in rows), default=0)))
+    
+    return TextFormat(delimiter, quotechar, header, columns)
+
+
+def _resolve_column(fmt, col):
+    """Map a column name or index from the options to the column label read_csv will use"""
+    if isinstance(col, int) and fmt.header:
+        if col >= len(fmt.columns):
+            raise ValueError(f"Column index {col} out of range, the file has {len(fmt.columns)} columns")
+        return fmt.columns[col]
+    
+    if col not in fmt.columns:
+        raise ValueError(f"Column {col!r} not found in file")
+    return col
+
+
+def _read_csv_options(fmt, options):
+    """Keyword arguments for pd.read_csv"""
+    kwargs = {
+        "sep": r"\s+" if fmt.delimiter is None else fmt.delimiter,
+        "quotechar": fmt.quotechar,
+        "header": 0 if fmt.header else None
+    }
+    if options.usecols:
+        kwargs["usecols"] = [_resolve_column(fmt, col) for col in options.usecols]
+    if options.dtype:
+        kwargs["dtype"] = {_resolve_column(fmt, col): dtype for col, dtype in options.dtype}
+    
+    return kwargs
+
+
+def _arrow_csv_options(fmt, options):
+    """ReadOptions, ParseOptions and ConvertOptions for pyarrow.csv, plus dtypes it can't convert itself"""
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    
+    # pyarrow names headerless columns f0, f1, ... and read_csv names them 0, 1, ...
+    def arrow_name(col):
+        col = _resolve_column(fmt, col)
+        return col if fmt.header else f"f{col}"
+    
+    convert_options = pa_csv.ConvertOptions(timestamp_parsers=[], strings_can_be_null=False)
+    if options.usecols:
+        # Keep file order, as read_csv does
+        position = {arrow_name(col): i for i, col in enumerate(fmt.columns)}
+        convert_options.include_columns = sorted({arrow_name(col) for col in options.usecols}, key=position.get)
+    
+    other_dtypes = {}
+    column_types = {}
+    for col, dtype in options.dtype or ():
+        try:
+            column_types[arrow_name(col)] = pa.from_numpy_dtype(np.dtype(dtype))
+        except (TypeError, pa.ArrowNotImplementedError):
+            # e.g. "category": converted after reading
+            other_dtypes[_resolve_column(fmt, col)] = dtype
+    convert_options.column_types = column_types
+    
+    read_options = pa_csv.ReadOptions(autogenerate_column_names=not fmt.header)
+    parse_options = pa_csv.ParseOptions(delimiter=fmt.delimiter, quote_char=fmt.quotechar)
+    return read_options, parse_options, convert_options, other_dtypes
+
+
+def _arrow_to_frame(table, fmt, other_dtypes, start=0):
+    """Convert a pyarrow Table or RecordBatch to a DataFrame labelled like read_csv would"""
+    data = table.to_pandas()
+    if not fmt.header:
+        data.columns = [int(name[1:]) for name in data.columns]
+    if other_dtypes:
+        data = data.astype(other_dtypes)
+    if start:
+        data.index = pd.RangeIndex(start, start + len(data))
+    
+    return data
+
+
+def iter_text_chunks(source, file_type, max_rows=None, chunk_rows=READ_CHUNK_ROWS, options=None):
+    """
+    Parse a CSV or text file into DataFrames of at most chunk_rows rows (see iter_chunks)
+    A file without rows yields one empty DataFrame that keeps the header's columns.
+    """
+    options = options or TextOptions()
+    if file_type == "csv":
+        fmt = sniff_text_format(source, delimiter=",", header=True)
+    else:
+        fmt = sniff_text_format(source)
+    
+    if options.engine != "pyarrow" or fmt.delimiter is None:
+        # pyarrow only splits on a single character, so whitespace separated files always use the C parser
+        if max_rows == 0:
+            # The chunked reader yields nothing at all for no rows
+            yield pd.read_csv(source, nrows=0, **_read_csv_options(fmt, options))
+            return
+        with pd.read_csv(source, nrows=max_rows, chunksize=chunk_rows, **_read_csv_options(fmt, options)) as reader:
+            yield from reader
+        return
+    
+    from pyarrow import csv as pa_csv
+    read_options, parse_options, convert_options, other_dtypes = _arrow_csv_options(fmt, options)
+    read_options.block_size = 1 << 20
+    
+    rows = 0
+    with pa_csv.open_csv(source, read_options, parse_options, convert_options) as reader:
+        for batch in reader:
+            if max_rows is not None:
+                batch = batch.slice(0, max_rows - rows)
+            for offset in range(0, len(batch), chunk_rows):
+                chunk = batch.slice(offset, chunk_rows)
+                yield _arrow_to_frame(chunk, fmt, other_dtypes, rows)
+                rows += len(chunk)
+            if max_rows is not None and rows >= max_rows:
+                break
+        
+        if not rows:
+            yield _arrow_to_frame(reader.schema.empty_table(), fmt, other_dtypes)
+
+
+def read_text(source, file_type, max_rows=None, options=None):
+    """Parse a CSV or text file into a DataFrame"""
+    options = options or TextOptions()
+    if file_type == "csv":
+        fmt = sniff_text_format(source, delimiter=",", header=True)
+    else:
+        fmt = sniff_text_format(source)
+    
+    if options.engine == "pyarrow" and fmt.delimiter is not None:
+        if max_rows is not None:
+            # pyarrow can't stop after a number of rows, so read blocks until there are enough
+            return pd.concat(iter_text_chunks(source, file_type, max_rows, options=options))
+        
+        from pyarrow import csv as pa_csv
+        read_options, parse_options, convert_options, other_dtypes = _arrow_csv_options(fmt, options)
+        table = pa_csv.read_csv(source, read_options, parse_options, convert_options)
+        return _arrow_to_frame(table, fmt, other_dtypes)
+    
+    return pd.read_csv(source, nrows=max_rows, **_read_csv_options(fmt, options))
+
+
+def iter_chunks(source, file_type, max_rows=None, chunk_rows=READ_CHUNK_ROWS, selection=None, text_options=None):
+    """
+    Parse a data file into a sequence of DataFrames of at most chunk_rows rows
+    Only one chunk is held in memory at a time; row labels continue across chunks.
+    selection is an HDF5Selection for HDF5, Parquet, Feather and .npy files,
+    text_options a TextOptions for CSV and text files.
+    """
+    if file_type in ["csv", "text"]:
+        yield from iter_text_chunks(source, file_type, max_rows, chunk_rows, text_options)
+    
+    elif file_type in ARROW_FILE_TYPES:
+        selection = selection or HDF5Selection()
+        for start, table in iter_arrow_tables(source, file_type, selection.rows, selection.columns, max_rows):
+            # Row groups can be much larger than a chunk
+            for offset in range(0, max(len(table), 1), chunk_rows):
+                yield _arrow_table_to_frame(table.slice(offset, chunk_rows), start + offset)
+    
+    elif file_type == "npy":
+        selection = selection or HDF5Selection()
+        values = open_npy(source)
+        start, stop = _row_bounds(len(values), selection.rows, max_rows)
+        if start >= stop:
+            yield read_npy_array(values, (start, start), selection.columns)
+        
+        for chunk_start in range(start, stop, chunk_rows):
+            yield read_npy_array(values, (chunk_start, min(chunk_start + chunk_rows, stop)), selection.columns)
+    
+    elif file_type == "h5":
+        selection = selection or HDF5Selection()
+        with h5py.File(source, 'r') as f:
+            dataset = f[selection.dataset or first_dataset_name(f)]
+            _check_table_shape(dataset)
+            
+            # Read the selected rows one slice at a time
+            start, stop = selection.rows or (0, None)
+            stop = len(dataset) if stop is None else min(stop, len(dataset))
+            if max_rows:
+                stop = min(stop, start + max_rows)
+            if start >= stop:
+                yield read_h5_dataset(dataset, (start, start), selection.columns)
+            
+            for chunk_start in range(start, stop, chunk_rows):
+                yield read_h5_dataset(dataset, (chunk_start, min(chunk_start + chunk_rows, stop)), selection.columns)
+    
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+
+def read_data(source, file_type, max_rows=None, progress=None, selection=None, text_options=None):
+    """
+    Parse a data file into a DataFrame
+    source is either a path or a binary file object, e.g. an archive member.
+    progress, if given, is called with the number of rows read so far and may
+    raise ConversionCancelled to abort the load.
+    selection is an HDF5Selection for HDF5, Parquet, Feather and .npy files,
+    text_options a TextOptions for CSV and text files.
+    """
+    if progress is not None:
+        # Read in chunks so progress can be reported and the load aborted
+        chunks = []
+        rows = 0
+        for chunk in iter_chunks(source, file_type, max_rows, selection=selection, text_options=text_options):
+            chunks.append(chunk)
+            rows += len(chunk)
+            progress(rows)
+        
+        # Arrow files without row groups or record batches yield no chunks
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+    
+    # Load based on file type
+    if file_type in ["csv", "text"]:
+        # The delimiter and header of text files are sniffed from their first lines
+        return read_text(source, file_type, max_rows, text_options)
+    
+    elif file_type == "h5":
+        selection = selection or HDF5Selection()
+        with h5py.File(source, 'r') as f:
+            # Only the selected hyperslab is read from disk
+            dataset = f[selection.dataset or first_dataset_name(f)]
+            return read_h5_dataset(dataset, selection.rows, selection.columns, max_rows)
+    
+    elif file_type in ARROW_FILE_TYPES:
+        selection = selection or HDF5Selection()
+        return read_arrow(source, file_type, selection.rows, selection.columns, max_rows)
+    
+    elif file_type == "npy":
+        selection = selection or HDF5Selection()
+        return read_npy_array(open_npy(source), selection.rows, selection.columns, max_rows)
+    
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+
+def detect_archive_type(file_path, file_type="auto"):
+    """Return "tar" or "zip" if the file is an archive, otherwise None"""
+    if file_type in ["tar", "zip"]:
+        return file_type
+    
+    if file_type == "auto":
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in [".tar", ".gz"]:
+            return "tar"
+        elif extension == ".zip":
+            return "zip"
+    
+    return None
+
+
+# File types an input can be read as, "auto" picks one from the extension
+FILE_TYPES = ["auto", "csv", "h5", "text", "parquet", "feather", "npy", "tar", "zip"]
+
+
+def detect_file_type(file_path):
+    """Determine the data file type from its extension"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    elif extension == ".h5":
+        return "h5"
+    elif extension in [".parquet", ".pq"]:
+        return "parquet"
+    elif extension in [".feather", ".arrow"]:
+        return "feather"
+    elif extension == ".npy":
+        return "npy"
+    else:
+        return "text"
+
+
+def list_archive_members(file_path, file_type="auto"):
+    """List the files in a tar or zip archive"""
+    members = list(archive_index(file_path, detect_archive_type(file_path, file_type)))
+    
+    if not members:
+        raise ValueError("No files found in archive")
+    
+    return members
+
+
+@contextlib.contextmanager
+def open_source(file_path, file_type="auto", member=None):
+    """
+    Yield (source, file_type) for a data file, streaming it from an archive if needed
+    For archives, member selects the file to read (the first one by default).
+    """
+    archive_type = detect_archive_type(file_path, file_type)
+    if archive_type:
+        with contextlib.ExitStack() as stack:
+            # Reading the index and finding the member is timed, decompression happens while parsing
+            with stage("archive") as counters:
+                if member is None:
+                    member = list_archive_members(file_path, archive_type)[0]
+                
+                # Stream the member straight into the parser
+                f = stack.enter_context(open_archive_member(file_path, archive_type, member))
+                counters["bytes_in"] = os.path.getsize(file_path)
+            
+            yield f, detect_file_type(member)
+        return
+    
+    if file_type == "auto":
+        file_type = detect_file_type(file_path)
+    
+    yield file_path, file_type
+
+
+def load_data(file_path, file_type="auto", max_rows=None, member=None, progress=None, selection=None,
+              text_options=None):
+    """
+    Load data from a file or archive into a DataFrame
+    If max_rows is given, only that many rows are read from the file.
+    For archives, member selects the file to read (the first one by default).
+    See read_data for progress, selection and text_options.
+    """
+    with open_source(file_path, file_type, member) as (source, source_type):
+        with stage("parse") as counters:
+            data = read_data(source, source_type, max_rows, progress, selection, text_options)
+            counters.update(rows=len(data), cells=data.size, bytes_in=_bytes_read(source))
+        return data
+
+
+def load_table(file_path, file_type="auto", max_rows=None, member=None, selection=None, text_options=None):
+    """
+    Load data from a file or archive into a ColumnTable, for conversions that only format it
+    HDF5 and .npy files are read straight into column arrays without building
+    a DataFrame, other files go through read_data. See load_data for the options.
+    """
+    with open_source(file_path, file_type, member) as (source, source_type):
+        with stage("parse") as counters:
+            selection = selection or HDF5Selection()
+            if source_type == "h5":
+                with h5py.File(source, 'r') as f:
+                    dataset = f[selection.dataset or first_dataset_name(f)]
+                    table = read_h5_table(dataset, selection.rows, selection.columns, max_rows)
+            elif source_type == "npy":
+                table = read_npy_table(open_npy(source), selection.rows, selection.columns, max_rows)
+            else:
+                table = ColumnTable.from_frame(read_data(source, source_type, max_rows, None, selection,
+                                                         text_options))
+            counters.update(rows=len(table), cells=table.size, bytes_in=_bytes_read(source))
+        return table
+
+
+def load_chunks(file_path, file_type="auto", max_rows=None, member=None, chunk_rows=READ_CHUNK_ROWS, selection=None,
+                text_options=None):
+    """Like load_data, but yields the data as DataFrame chunks (see iter_chunks)"""
+    with open_source(file_path, file_type, member) as (source, source_type):
+        chunks = iter_chunks(source, source_type, max_rows, chunk_rows, selection, text_options)
+        while True:
+            # Only the time spent parsing counts, not the time the consumer spends between chunks
+            with stage("parse") as counters:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    counters["bytes_in"] = _bytes_read(source)
+                else:
+                    counters.update(rows=len(chunk), cells=chunk.size)
+            
+            if chunk is None:
+                return
+            yield chunk
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by the total size of its values"""
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def sizeof(self, value):
+        """Approximate memory used by a value"""
+        return sys.getsizeof(value)
+    
+    def evicted(self, key, value):
+        """Called with each entry dropped to stay under max_bytes"""
+    
+    def lookup(self, key):
+        """Return the value for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+        return None
+    
+    def put(self, key, value):
+        """Add a value, evicting the least recently used ones beyond max_bytes"""
+        nbytes = self.sizeof(value)
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            
+            while self.total_bytes > self.max_bytes and self._entries:
+                old_key, (old_value, old_nbytes) = self._entries.popitem(last=False)
+                self.total_bytes -= old_nbytes
+                evicted.append((old_key, old_value))
+        
+        for old_key, old_value in evicted:
+            self.evicted(old_key, old_value)
+    
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+# Parquet only stores string column names, spilled frames keep the original ones in this attribute
+SPILL_COLUMNS_ATTR = "file_to_latex_columns"
+
+
+class DataCache(LRUCache):
+    """
+    LRU cache of parsed DataFrames, bounded by their total memory use
+    Entries are keyed on the file path, size and mtime plus the load options, so
+    a changed file is never served from the cache. If spill_dir is given, frames
+    evicted from memory are kept there as Parquet files (requires pyarrow) and
+    read back instead of re-parsing the original file. Spill files of earlier
+    versions of a file are removed once a newer version is loaded or spilled.
+    With shared, every parsed frame is written to spill_dir right away, so
+    other processes with a cache on the same directory find it too.
+    """
+    
+    def __init__(self, max_bytes=512 * 1024 ** 2, spill_dir=None, shared=False):
+        super().__init__(max_bytes)
+        self.spill_dir = spill_dir
+        self.shared = shared
+    
+    def sizeof(self, data):
+        return int(data.memory_usage(index=True, deep=True).sum())
+    
+    def file_key(self, file_path, file_type="auto", member=None, selection=None, text_options=None):
+        """Key identifying one version of a file and what to read from it"""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, file_type, member, selection, text_options)
+    
+    def _spill_prefix(self, key):
+        """Start of the spill file names of every version of a file read with the same options"""
+        source = (key[0],) + key[3:-1]
+        return hashlib.sha1(repr(source).encode()).hexdigest() + "-"
+    
+    def _spill_path(self, key):
+        # The version and row limit are kept readable so other versions can be found by name
+        rows = "all" if key[-1] is None else key[-1]
+        return os.path.join(self.spill_dir, f"{self._spill_prefix(key)}{key[1]}-{key[2]}-{rows}.parquet")
+    
+    def prune(self, key):
+        """Remove the spill files of other versions of the file in key, they can never be read again"""
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return
+        
+        prefix = self._spill_prefix(key)
+        current = f"{prefix}{key[1]}-{key[2]}-"
+        for name in os.listdir(self.spill_dir):
+            if name.startswith(prefix) and not name.startswith(current):
+                # Another process sharing the directory may have removed it already
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(self.spill_dir, name))
+    
+    def lookup(self, key):
+        """Return the cached frame for key from memory or the spill directory, or None"""
+        data = super().lookup(key)
+        if data is not None:
+            return data
+        
+        if self.spill_dir and os.path.exists(self._spill_path(key)):
+            try:
+                data = pd.read_parquet(self._spill_path(key))
+            except FileNotFoundError:
+                return None
+            columns = data.attrs.pop(SPILL_COLUMNS_ATTR, None)
+            if columns is not None:
+                data.columns = columns
+            self.put(key, data)
+            return data
+        
+        return None
+    
+    def get(self, file_path, file_type="auto", max_rows=None, member=None, selection=None, text_options=None):
+        """Return cached data for a load with these options, or None"""
+        base = self.file_key(file_path, file_type, member, selection, text_options)
+        
+        data = self.lookup(base + (max_rows,))
+        if data is None and max_rows:
+            # A full load covers any row limit
+            data = self.lookup(base + (None,))
+        if data is None and max_rows:
+            # So does a load with a larger limit, or one that hit the end of the file
+            with self._lock:
+                for key, (cached, _) in self._entries.items():
+                    if key[:-1] == base and key[-1] and (key[-1] >= max_rows or len(cached) < key[-1]):
+                        data = cached
+                        break
+        
+        if data is not None and max_rows and len(data) > max_rows:
+            data = data.head(max_rows)
+        return data
+    
+    def spill(self, key, data):
+        """Keep a frame on disk, if a spill directory is configured"""
+        if not self.spill_dir or os.path.exists(self._spill_path(key)):
+            return
+        
+        self.prune(key)
+        # Named per process and thread, as several may spill the same frame at once
+        partial_path = f"{self._spill_path(key)}.{os.getpid()}-{threading.get_ident()}.part"
+        try:
+            if not all(isinstance(col, str) for col in data.columns):
+                # HDF5, .npy and headerless text files have integer column names
+                columns = [col.item() if isinstance(col, np.generic) else col for col in data.columns]
+                data = data.set_axis([str(col) for col in columns], axis=1)
+                data.attrs = {SPILL_COLUMNS_ATTR: columns}
+            os.makedirs(self.spill_dir, exist_ok=True)
+            data.to_parquet(partial_path)
+            os.replace(partial_path, self._spill_path(key))
+        except Exception:
+            # pyarrow missing or the frame can't be stored (e.g. column names clashing as strings)
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+    
+    def evicted(self, key, data):
+        """Keep an evicted frame on disk; a shared cache wrote it there when it was loaded"""
+        if not self.shared:
+            self.spill(key, data)
+    
+    def load(self, file_path, file_type="auto", max_rows=None, member=None, progress=None, selection=None,
+             text_options=None):
+        """load_data through the cache"""
+        with stage("cache") as counters:
+            data = self.get(file_path, file_type, max_rows, member, selection, text_options)
+            counters["hits" if data is not None else "misses"] = 1
+        if data is None:
+            key = self.file_key(file_path, file_type, member, selection, text_options) + (max_rows,)
+            self.prune(key)
+            data = load_data(file_path, file_type, max_rows=max_rows, member=member, progress=progress,
+                             selection=selection, text_options=text_options)
+            self.put(key, data)
+            if self.shared:
+                self.spill(key, data)
+        return data
+
+
+def booktabs_alignment(num_cols):
+    """Column specification for booktabs tables: a row identifier column and two column groups"""
+    main_cols = num_cols - 1  # Exclude the first column
+    
+    if main_cols >= 2:
+        first_group = main_cols // 2
+        second_group = main_cols - first_group
+        
+        # First column is 'c', followed by first_group 'c's, then a vertical bar, then second_group 'c's
+        return "c " + "c" * first_group + " | " + "c" * second_group
+    
+    # If too few columns, just use all 'c' alignment
+    return "c" * num_cols
+
+
+def tabularx_alignment(data):
+    """Column specification for tabularx: the row identifier column at its natural width, the rest stretched"""
+    num_cols = len(data.columns)
+    return "l" + "X" * (num_cols - 1) if num_cols > 1 else "X"
+
+
+def siunitx_alignment(data):
+    """Column specification aligning numeric columns on the decimal point with siunitx S columns, text on the left"""
+    return "".join("S" if isinstance(dtype, np.dtype) and dtype.kind in "iuf" else "l" for dtype in data.dtypes)
+
+
+# Headings of the two column groups of booktabs tables, from the example table
+DEFAULT_GROUP_NAMES = ("Fall Courses", "Spring Courses")
+
+
+def parse_group_names(text):
+    """
+    Parse column group headings like "Fall Courses,Spring Courses" into a tuple
+    An empty string means no column groups. Raises ValueError unless two names are given.
+    """
+    if not text.strip():
+        return None
+    names = tuple(name.strip() for name in text.split(","))
+    if len(names) != 2 or not all(names):
+        raise ValueError("expected two column group names separated by a comma, or none")
+    return names
+
+
+class TableStyle:
+    """
+    A table style: column specification, rules and wrapper around the shared cell pipeline
+    Every style formats its cells with the vectorized format_rows, so a new
+    style is a declaration rather than another formatter loop. The row and
+    header templates are built once here; formatting a row is then a single
+    concatenation.
+    
+    column_spec is called with the ColumnTable (or its first chunk) and returns
+    the column specification, wrap(tabular, caption, label) completes a table.
+    row_rule goes between rows and row_end_rule after every row. With
+    column_groups, tables of five or more columns get the two column groups of
+    the example table, headed by the group_names given to the formatters.
+    uses_label is False for styles whose tables leave out the label unless
+    one is passed to wrap directly.
+    """
+    
+    def __init__(self, name, column_spec, wrap, precision=2, na_rep="--", environment="tabular", width=None,
+                 top_rule="\\toprule", header_rule="\\midrule", row_rule=None, row_end_rule=None,
+                 bottom_rule="\\bottomrule", bottom_space=False, column_groups=False, header_cell="{}",
+                 uses_label=True, packages=()):
+        self.name = name
+        self.column_spec = column_spec
+        self.wrap = wrap
+        self.precision = precision
+        self.na_rep = na_rep
+        self.environment = environment
+        self.top_rule = top_rule
+        self.header_rule = header_rule
+        self.row_end_rule = row_end_rule
+        self.bottom_rule = bottom_rule
+        self.bottom_space = bottom_space
+        self.column_groups = column_groups
+        self.header_cell = header_cell
+        self.uses_label = uses_label
+        self.packages = tuple(packages)
+        
+        # Precompiled templates
+        self.begin = f"  \\begin{{{environment}}}" + (f"{{{width}}}" if width else "")
+        self.row_prefix = "    "
+        self.row_suffix = f" \\\\\n    {row_end_rule}" if row_end_rule else " \\\\"
+        self.row_separator = f"\n    {row_rule}\n" if row_rule else "\n"
+    
+    def __reduce__(self):
+        # Registered styles reach worker processes by name, their column_spec may be a lambda
+        if TABLE_STYLES.get(self.name) is self:
+            return get_style, (self.name,)
+        return super().__reduce__()
+    
+    def header_cells(self, headers):
+        """Header cells for the escaped column names of a ColumnTable"""
+        return [self.header_cell.format(header) for header in headers]
+    
+    def header_lines(self, headers, group_names=DEFAULT_GROUP_NAMES):
+        """The header rows of a table and the rule below them"""
+        cells = self.header_cells(headers)
+        main_cols = len(cells) - 1
+        if not self.column_groups or not group_names or main_cols < 4:
+            return [f"    {' & '.join(cells)} \\\\", f"    {self.header_rule}"]
+        
+        # Two column groups over the columns after the row identifier, like the example table
+        first_group = main_cols // 2
+        second_group = main_cols - first_group
+        first_name, second_name = group_names
+        return [
+            f"     & \\multicolumn{{{first_group}}}{{c}}{{{first_name}}}"
+            f" & \\multicolumn{{{second_group}}}{{c}}{{{second_name}}} \\\\",
+            f"    \\cmidrule(lr){{2-{first_group + 1}}} \\cmidrule(lr){{{first_group + 2}-{main_cols + 1}}}",
+            f"    {' & '.join([''] + cells[1:])} \\\\",
+            f"    {self.header_rule}    {self.header_rule}",
+        ]
+    
+    def longtable_head(self, table, caption=None, label=None, group_names=DEFAULT_GROUP_NAMES):
+        """
+        The lines of a longtable in this style before its first row
+        The header is repeated on every page and the bottom rule closes every
+        page. A caption goes above the first page's header and is repeated above
+        the header of the following pages, as wrap_longtable_tabular adds it.
+        """
+        header = [f"    {self.top_rule}"] + self.header_lines(table.headers, group_names)
+        first_caption, next_caption = longtable_captions(caption, label) if caption else ([], [])
+        bottom_rule = [f"    {self.bottom_rule}"] if self.bottom_rule else []
+        continued = f"    \\multicolumn{{{len(table.columns)}}}{{r}}{{Continued on next page}} \\\\"
+        return ([f"  \\begin{{longtable}}{{{self.column_spec(table)}}}"] + first_caption + header
+                + ["  \\endfirsthead"] + next_caption + header + ["  \\endhead"]
+                + bottom_rule + [continued, "  \\endfoot"]
+                + bottom_rule + ["  \\endlastfoot"])
+    
+    def join_rows(self, rows):
+        """Join row strings from format_rows into the body of a table"""
+        prefix, suffix = self.row_prefix, self.row_suffix
+        return self.row_separator.join([prefix + row + suffix for row in rows])
+    
+    def format_rows(self, data, jobs=None):
+        """
+        Format the rows of a ColumnTable or DataFrame into the body of a table
+        With jobs above 1, large tables are formatted on that many processes (see format_rows_parallel).
+        """
+        data = as_column_table(data)
+        if jobs and jobs > 1 and data.size >= PARALLEL_FORMAT_MIN_CELLS and data.columns and _can_pickle(self):
+            return format_rows_parallel(data, self, jobs)
+        return self.join_rows(format_rows(data, self.precision, self.na_rep))
+    
+    def format_tabular(self, data, max_rows=None, jobs=None, group_names=DEFAULT_GROUP_NAMES):
+        """Format a ColumnTable or DataFrame into the table environment of this style, without caption and label"""
+        # Cut a DataFrame down before its text columns are converted
+        if max_rows and len(data) > max_rows:
+            data = data.head(max_rows)
+        data = as_column_table(data)
+        
+        if self.environment == "longtable":
+            latex = self.longtable_head(data, group_names=group_names)
+        else:
+            latex = [f"{self.begin}{{{self.column_spec(data)}}}", f"    {self.top_rule}"]
+            latex.extend(self.header_lines(data.headers, group_names))
+        
+        if len(data):
+            latex.append(self.format_rows(data, jobs))
+        
+        if self.environment != "longtable":
+            if self.bottom_space:
+                latex.append("    \\addlinespace")
+            if self.bottom_rule:
+                latex.append(f"    {self.bottom_rule}")
+        
+        latex.append(f"  \\end{{{self.environment}}}")
+        return "\n".join(latex)
+
+
+# Tables with fewer cells are formatted serially, a process pool would take longer to start
+PARALLEL_FORMAT_MIN_CELLS = 1000000
+
+# Shards per worker, so a slow shard doesn't leave the other workers idle
+PARALLEL_FORMAT_SHARDS_PER_JOB = 4
+
+# Workers don't track the shared frame, only the process that created it unlinks it
+_SHARED_MEMORY_ATTACH = {"track": False} if sys.version_info >= (3, 13) else {}
+
+
+def _can_pickle(obj):
+    """Whether obj can be sent to a worker process, styles built with lambdas can't"""
+    try:
+        pickle.dumps(obj)
+    except Exception:
+        return False
+    return True
+
+
+def _share_table(table):
+    """
+    Copy the numeric columns of a ColumnTable into one block of shared memory
+    Returns the SharedMemory (None if no column qualifies) and a layout with
+    an (offset, dtype) per shared column and None for the others. Object
+    columns hold Python objects, so they are sent with each shard.
+    """
+    layout = []
+    size = 0
+    for values in table.columns:
+        if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+            layout.append((size, values.dtype))
+            size += len(values) * values.dtype.itemsize
+        else:
+            layout.append(None)
+    
+    if not size:
+        return None, layout
+    
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    for values, entry in zip(table.columns, layout):
+        if entry is not None:
+            offset, dtype = entry
+            np.ndarray(len(values), dtype, buffer=shm.buf, offset=offset)[:] = values
+    return shm, layout
+
+
+def _format_shard(shm_name, num_rows, layout, objects, row_dtype, rows, columns, style, whole_rows):
+    """
+    Format one shard of a table shared by format_rows_parallel; runs in a worker process
+    rows and columns are (start, stop) ranges and objects holds the shard's
+    unshared columns and their null masks by position. A shard of whole_rows comes back as the
+    finished table body, a shard of columns as partial rows to be joined.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name, **_SHARED_MEMORY_ATTACH) if shm_name else None
+    start, stop = rows
+    
+    def column(i):
+        if layout[i] is None:
+            return objects[i]
+        offset, dtype = layout[i]
+        values = np.ndarray(num_rows, dtype, buffer=shm.buf, offset=offset)[start:stop]
+        return values, _null_mask(values)
+    
+    try:
+        # Every view into the shared block is dropped again before it is closed
+        cells = [format_column(*column(i), row_dtype, style.precision, style.na_rep) for i in range(*columns)]
+    finally:
+        if shm is not None:
+            shm.close()
+    
+    partial_rows = [" & ".join(row) for row in zip(*cells)]
+    return style.join_rows(partial_rows) if whole_rows else partial_rows
+
+
+def _shard_bounds(count, shards):
+    """(start, stop) pairs splitting range(count) into at most shards even parts"""
+    bounds = np.linspace(0, count, min(shards, count) + 1).astype(int).tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def format_rows_parallel(data, style, jobs):
+    """
+    Format the body of a table on a pool of jobs worker processes
+    Long tables are split into blocks of rows, tables with more columns than
+    rows into blocks of columns; either way the result is identical to
+    style.format_rows(data). Numeric columns reach the workers through shared
+    memory, the others are pickled with their shard, as is the style itself,
+    so it must be picklable but needn't be registered.
+    """
+    style = get_style(style)
+    data = as_column_table(data)
+    num_rows, num_cols = len(data), len(data.columns)
+    shards = jobs * PARALLEL_FORMAT_SHARDS_PER_JOB
+    by_columns = num_cols > num_rows
+    
+    shm, layout = _share_table(data)
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = []
+            for bounds in _shard_bounds(num_cols if by_columns else num_rows, shards):
+                rows, columns = ((0, num_rows), bounds) if by_columns else (bounds, (0, num_cols))
+                objects = {
+                    i: (data.columns[i][rows[0]:rows[1]],
+                        None if data.masks[i] is None else data.masks[i][rows[0]:rows[1]])
+                    for i in range(*columns) if layout[i] is None
+                }
+                futures.append(executor.submit(_format_shard, shm.name if shm else None, num_rows, layout,
+                                               objects, data.row_dtype, rows, columns, style, not by_columns))
+            
+            # Collected in submission order, so the shards are reassembled in order
+            results = [future.result() for future in futures]
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    
+    if by_columns:
+        return style.join_rows([" & ".join(parts) for parts in zip(*results)])
+    return style.row_separator.join(text for text in results if text)
+
+
+def format_booktabs_tabular(data, max_rows=None):
+    """
+    Format data into the tabular environment of a booktabs-style table like the example
+    This creates the specific visual style shown in the screenshot
+    """
+    return TABLE_STYLES["booktabs"].format_tabular(data, max_rows)
+
+
+def wrap_booktabs_tabular(tabular, caption=None, label=None):
+    """
+    Wrap a tabular environment from format_booktabs_tabular in a table with the caption below it
+    The label is optional and not used by the GUI's booktabs tables.
+    """
+    latex = []
+    
+    # Begin table environment
+    latex.append("\\begin{table}[htbp]")
+    latex.append("  \\begin{center}")
+    latex.append("  \\centering")
+    latex.append(tabular)
+    
+    # Add caption
+    if caption:
+        latex.append(f"  \\caption{{{caption}}}")
+    
+    # Add label, after the caption so it refers to the table number
+    if label:
+        latex.append(f"  \\label{{{label}}}")
+    
+    # End table environments
+    latex.append("  \\end{center}")
+    latex.append("\\end{table}")
+    
+    return "\n".join(latex)
+
+
+def format_booktabs_table(data, caption=None, max_rows=None):
+    """Format data into a booktabs-style LaTeX table like the example"""
+    return wrap_booktabs_tabular(format_booktabs_tabular(data, max_rows), caption)
+
+
+def format_standard_tabular(data, max_rows=None):
+    """Format data into the tabular environment of a standard table with vertical lines"""
+    return TABLE_STYLES["standard"].format_tabular(data, max_rows)
+
+
+def wrap_standard_tabular(tabular, caption=None, label=None):
+    """Wrap a tabular environment from format_standard_tabular in a table with caption and label above it"""
+    latex = []
+    
+    # Begin table environment
+    latex.append("\\begin{table}[htbp]")
+    latex.append("  \\centering")
+    
+    # Add caption if requested
+    if caption:
+        latex.append(f"  \\caption{{{caption}}}")
+    
+    # Add label
+    if label:
+        latex.append(f"  \\label{{{label}}}")
+    
+    latex.append(tabular)
+    
+    # End table environments
+    latex.append("\\end{table}")
+    
+    return "\n".join(latex)
+
+
+def format_standard_table(data, caption=None, label=None, max_rows=None):
+    """Format data into a standard LaTeX table with vertical lines"""
+    return wrap_standard_tabular(format_standard_tabular(data, max_rows), caption, label)
+
+
+def longtable_captions(caption, label=None):
+    """The caption line above the first page's header of a longtable, and the one above the following pages' headers"""
+    return ([f"  \\caption{{{caption}}}" + (f"\\label{{{label}}}" if label else "") + " \\\\"],
+            [f"  \\caption[]{{{caption}}} \\\\"])
+
+
+def wrap_longtable_tabular(tabular, caption=None, label=None):
+    """
+    Complete a longtable from format_tabular with its caption and label
+    A longtable is its own float: the caption goes above the first page's
+    header and is repeated above the header of the following pages.
+    """
+    if not caption:
+        return tabular
+    
+    begin, rest = tabular.split("\n", 1)
+    first_head, rest = rest.split("  \\endfirsthead\n", 1)
+    first_caption, next_caption = longtable_captions(caption, label)
+    return "\n".join([begin] + first_caption + [first_head + "  \\endfirsthead"] + next_caption + [rest])
+
+
+# Table styles by name, in the order they are offered
+TABLE_STYLES = {}
+
+
+def register_style(style):
+    """Make a TableStyle available by its name to the formatters, the GUI and the command line"""
+    TABLE_STYLES[style.name] = style
+    return style
+
+
+def get_style(name):
+    """Return the registered TableStyle called name; raises ValueError for unknown styles"""
+    if isinstance(name, TableStyle):
+        return name
+    try:
+        return TABLE_STYLES[name]
+    except KeyError:
+        raise ValueError(f"Unknown table style: {name}") from None
+
+
+register_style(TableStyle(
+    "booktabs", lambda data: booktabs_alignment(len(data.columns)), wrap_booktabs_tabular,
+    precision=1, na_rep="-", row_rule="\\midrule", bottom_space=True,
+    column_groups=True, uses_label=False, packages=["booktabs"],
+))
+register_style(TableStyle(
+    "standard", lambda data: f"|{'c' * len(data.columns)}|", wrap_standard_tabular,
+    top_rule="\\hline", header_rule="\\hline", row_end_rule="\\hline", bottom_rule=None,
+))
+register_style(TableStyle(
+    "tabularx", tabularx_alignment, wrap_standard_tabular,
+    environment="tabularx", width="\\linewidth", packages=["booktabs", "tabularx"],
+))
+register_style(TableStyle(
+    "siunitx", siunitx_alignment, wrap_standard_tabular,
+    na_rep="{--}", header_cell="{{{}}}", packages=["booktabs", "siunitx"],
+))
+register_style(TableStyle(
+    "longtable", lambda data: "c" * len(data.columns), wrap_longtable_tabular,
+    environment="longtable", packages=["booktabs", "longtable"],
+))
+
+
+def format_tabular(data, style="booktabs", max_rows=None, jobs=None, group_names=DEFAULT_GROUP_NAMES):
+    """
+    Format the tabular environment of a table in the given style
+    This is the expensive part of a conversion and doesn't depend on the
+    caption or label, so it can be reused while those are edited.
+    With jobs, large tables are formatted on that many processes. group_names
+    head the column groups of styles that have them, None leaves them out.
+    """
+    style = get_style(style)
+    with stage("format") as counters:
+        tabular = style.format_tabular(data, max_rows, jobs, group_names)
+        
+        rows = min(len(data), max_rows) if max_rows else len(data)
+        counters.update(rows=rows, cells=rows * len(data.columns), bytes_out=len(tabular))
+    
+    return tabular
+
+
+def wrap_tabular(tabular, style="booktabs", caption=None, label=None):
+    """Wrap a tabular environment from format_tabular in a complete table"""
+    style = get_style(style)
+    return style.wrap(tabular, caption, label if style.uses_label else None)
+
+
+def dataframe_to_latex(data, style="booktabs", caption=None, label=None, max_rows=None, jobs=None,
+                       group_names=DEFAULT_GROUP_NAMES):
+    """Convert a DataFrame or ColumnTable to LaTeX table code in the given style, formatted on jobs processes if given"""
+    return wrap_tabular(format_tabular(data, style, max_rows, jobs, group_names), style, caption, label)
+
+
+def write_longtable(chunks, f, style="booktabs", caption=None, label=None, progress=None,
+                    group_names=DEFAULT_GROUP_NAMES):
+    """
+    Write DataFrame or ColumnTable chunks to an open text file as a longtable
+    Rows are formatted and written one chunk at a time, so memory use does not
+    grow with the number of rows. The header, rules and cell formatting come
+    from the table style, the head and foot are those of TableStyle.longtable_head,
+    so a longtable style table comes out as dataframe_to_latex would write it.
+    progress, if given, is called with the number of rows written so far.
+    """
+    style = get_style(style)
+    if style.environment == "tabularx":
+        raise ValueError("tabularx tables can't break across pages, use the longtable style instead")
+    
+    chunks = iter(chunks)
+    first_chunk = as_column_table(next(chunks))
+    precision, na_rep = style.precision, style.na_rep
+    # Only a rule that ends every row is kept, rules between rows are left out of long tables
+    prefix, suffix = style.row_prefix, style.row_suffix + "\n"
+    
+    f.write("\n".join(style.longtable_head(first_chunk, caption, label, group_names)) + "\n")
+    
+    # Data rows
+    rows_written = 0
+    for chunk in itertools.chain([first_chunk], chunks):
+        with stage("format") as counters:
+            text = "".join(prefix + row + suffix for row in format_rows(chunk, precision, na_rep))
+            counters.update(rows=len(chunk), cells=chunk.size)
+        
+        with stage("write") as counters:
+            f.write(text)
+            counters["bytes_out"] = len(text)
+        rows_written += len(chunk)
+        if progress is not None:
+            progress(rows_written)
+    
+    f.write("  \\end{longtable}\n")
+    return rows_written
+
+
+def stream_to_latex(file_path, output_path, file_type="auto", member=None, style="booktabs",
+                    caption=None, label=None, max_rows=None, progress=None, selection=None, text_options=None,
+                    group_names=DEFAULT_GROUP_NAMES):
+    """
+    Convert a file straight to a longtable .tex file without loading it whole
+    The output is written to a temporary file first, so a failed or cancelled
+    conversion never leaves a truncated table behind.
+    """
+    chunks = load_chunks(file_path, file_type, max_rows=max_rows, member=member, selection=selection,
+                         text_options=text_options)
+    partial_path = output_path + ".part"
+    try:
+        with open(partial_path, 'w') as f:
+            rows_written = write_longtable(chunks, f, style=style, caption=caption, label=label, progress=progress,
+                                           group_names=group_names)
+        os.replace(partial_path, output_path)
+    finally:
+        chunks.close()
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    
+    return rows_written
+
+
+# Statistics of the summary mode, in the order they become table columns
+SUMMARY_STATS = ("count", "mean", "std", "min", "p25", "p50", "p75", "max")
+
+# Rows sampled per group to estimate quantiles; quantiles of smaller inputs are exact
+QUANTILE_SAMPLE_ROWS = 100000
+
+
+def parse_summary_stats(text):
+    """
+    Parse a list of statistics like "mean,std,p90" into a tuple
+    Besides the names in SUMMARY_STATS, any percentile can be given as "pNN".
+    Raises ValueError for unknown statistics.
+    """
+    stats = tuple(part.strip() for part in text.split(",") if part.strip())
+    for stat in stats:
+        if stat not in SUMMARY_STATS and _quantile(stat) is None:
+            raise ValueError(f"unknown statistic {stat!r}, expected one of {', '.join(SUMMARY_STATS)} or a percentile like p90")
+    return stats or SUMMARY_STATS
+
+
+def _quantile(stat):
+    """The quantile a statistic like "p25" stands for, or None"""
+    if stat.startswith("p") and _is_number(stat[1:]) and 0 <= float(stat[1:]) <= 100:
+        return float(stat[1:]) / 100
+    return None
+
+
+class SummaryOptions(namedtuple("SummaryOptions", ["group_by", "stats"], defaults=[None, SUMMARY_STATS])):
+    """What the summary mode aggregates: all rows, or one row per value of the group_by column"""
+    __slots__ = ()
+    
+    @classmethod
+    def from_strings(cls, group_by="", stats=""):
+        """Build the options from user input, empty strings mean no grouping and the default statistics"""
+        return cls(group_by.strip() or None, parse_summary_stats(stats))
+
+
+class ColumnSummary:
+    """
+    Per-column aggregates of a table, computed one chunk at a time
+    Count, mean and standard deviation are merged across chunks with the
+    parallel variance formula, min and max exactly. Quantiles come from a
+    uniform random sample of up to sample_rows rows per group. Only numeric
+    columns are summarized; with group_by, each value of that column gets its
+    own row in the result.
+    """
+    
+    def __init__(self, group_by=None, stats=SUMMARY_STATS, sample_rows=QUANTILE_SAMPLE_ROWS, seed=0):
+        self.group_by = group_by
+        self.stats = tuple(stats)
+        self.sample_rows = sample_rows
+        self.rng = np.random.default_rng(seed)
+        self.columns = None
+        self.count = self.mean = self.m2 = self.min = self.max = None
+        self.sample = None
+    
+    def add(self, chunk):
+        """Fold a DataFrame chunk into the aggregates"""
+        if self.group_by is not None and self.group_by not in chunk.columns:
+            raise ValueError(f"no column {self.group_by!r} to group by")
+        
+        if self.columns is None:
+            numeric = chunk.drop(columns=[self.group_by] if self.group_by is not None else []).select_dtypes("number")
+            self.columns = list(numeric.columns)
+        
+        # Later chunks may infer a column as text, e.g. from a stray marker, so values are coerced
+        values = chunk[self.columns].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+        keys = chunk[self.group_by] if self.group_by is not None else pd.Series(0, index=chunk.index)
+        grouped = values.groupby(keys.to_numpy(), sort=False, dropna=False)
+        
+        count = grouped.count()
+        mean = grouped.mean().fillna(0.0)
+        m2 = (grouped.var(ddof=0) * count).fillna(0.0)
+        if self.count is None:
+            self.count, self.mean, self.m2, self.min, self.max = count, mean, m2, grouped.min(), grouped.max()
+        else:
+            # Chan et al.'s pairwise update, aligned on the groups of both sides
+            groups = self.count.index.union(count.index, sort=False)
+            count_a, count_b = self.count.reindex(groups, fill_value=0), count.reindex(groups, fill_value=0)
+            mean_a, mean_b = self.mean.reindex(groups, fill_value=0.0), mean.reindex(groups, fill_value=0.0)
+            total = count_a + count_b
+            delta = mean_b - mean_a
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self.mean = (mean_a + delta * (count_b / total)).fillna(0.0)
+                self.m2 = (self.m2.reindex(groups, fill_value=0.0) + m2.reindex(groups, fill_value=0.0)
+                           + (delta ** 2 * (count_a * count_b / total)).fillna(0.0))
+            self.count = total
+            self.min = self.min.reindex(groups).combine(grouped.min().reindex(groups), np.fmin)
+            self.max = self.max.reindex(groups).combine(grouped.max().reindex(groups), np.fmax)
+        
+        if any(_quantile(stat) is not None for stat in self.stats):
+            # Bottom-k sampling: every row gets a random priority and the sample_rows lowest per group are kept
+            sample = values.assign(_group=keys.to_numpy(), _priority=self.rng.random(len(values)))
+            if self.sample is not None:
+                sample = pd.concat([self.sample, sample], ignore_index=True)
+            sample = sample.sort_values("_priority", kind="stable")
+            self.sample = sample.groupby("_group", sort=False, dropna=False).head(self.sample_rows)
+    
+    def statistic(self, stat):
+        """One statistic as a DataFrame of groups by columns"""
+        if stat == "count":
+            return self.count.astype(np.int64)
+        if stat == "mean":
+            return self.mean.where(self.count > 0)
+        if stat == "std":
+            # Sample standard deviation, like pandas
+            return np.sqrt(self.m2 / (self.count - 1)).where(self.count > 1)
+        if stat == "min":
+            return self.min
+        if stat == "max":
+            return self.max
+        
+        columns = self.sample.drop(columns="_priority").groupby("_group", sort=False, dropna=False)
+        return columns.quantile(_quantile(stat)).reindex(self.count.index)
+    
+    def result(self):
+        """
+        The summary as a DataFrame whose first column identifies the rows
+        Without group_by there is a row per column and a column per statistic,
+        with it a row per group and a column per column and statistic.
+        """
+        if self.count is None:
+            raise ValueError("no rows to summarize")
+        
+        statistics = {stat: self.statistic(stat) for stat in self.stats}
+        if self.group_by is None:
+            summary = pd.DataFrame({stat: values.iloc[0] for stat, values in statistics.items()})
+            return summary.rename_axis("Column").reset_index()
+        
+        summary = pd.DataFrame({
+            column if len(self.stats) == 1 else f"{column} {stat}": statistics[stat][column]
+            for column in self.columns for stat in self.stats
+        })
+        try:
+            summary = summary.sort_index()
+        except TypeError:
+            # Groups of mixed types keep the order they were first seen in
+            pass
+        return summary.rename_axis(self.group_by).reset_index()
+
+
+def summarize_chunks(chunks, options=None, progress=None):
+    """
+    Summarize a sequence of DataFrame chunks with ColumnSummary
+    Only the current chunk and the quantile sample are held in memory.
+    progress, if given, is called with the number of rows summarized so far.
+    """
+    options = options or SummaryOptions()
+    summary = ColumnSummary(options.group_by, options.stats)
+    rows = 0
+    for chunk in chunks:
+        with stage("summarize") as counters:
+            summary.add(chunk)
+            counters.update(rows=len(chunk), cells=chunk.size)
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+    return summary.result()
+
+
+def summarize_file(file_path, file_type="auto", member=None, options=None, progress=None, selection=None,
+                   text_options=None):
+    """Summarize every row of a file or archive member in one streaming pass (see summarize_chunks)"""
+    chunks = load_chunks(file_path, file_type, member=member, selection=selection, text_options=text_options)
+    try:
+        return summarize_chunks(chunks, options, progress)
+    finally:
+        chunks.close()
+
+
+# Members of an archive or directory with these extensions are converted into a bundle document
+BUNDLE_EXTENSIONS = [".csv", ".h5", ".txt", ".tsv", ".dat", ".parquet", ".pq", ".feather", ".arrow", ".npy"]
+
+# LaTeX can only hold 18 floats waiting to be placed, so bundle documents flush them this often
+BUNDLE_TABLES_PER_PAGE_BREAK = 10
+
+
+def list_bundle_members(path, file_type="auto"):
+    """
+    List the data files in an archive or directory in sorted order
+    Directories are searched recursively, their members are relative paths.
+    """
+    if os.path.isdir(path):
+        members = [
+            os.path.relpath(os.path.join(dir_path, name), path).replace(os.sep, "/")
+            for dir_path, _, names in os.walk(path) for name in names
+        ]
+    elif detect_archive_type(path, file_type):
+        members = list(archive_index(path, detect_archive_type(path, file_type)))
+    else:
+        raise ValueError(f"{path} is neither a directory nor a tar or zip archive")
+    
+    members = sorted(member for member in members if os.path.splitext(member)[1].lower() in BUNDLE_EXTENSIONS)
+    if not members:
+        raise ValueError(f"No data files found in {path}")
+    
+    return members
+
+
+def bundle_names(members):
+    """Give each member a unique name usable in a label and a file name, e.g. run-1-results for run 1/results.csv"""
+    names = {}
+    used = set()
+    for member in members:
+        base = re.sub(r"[^A-Za-z0-9]+", "-", os.path.splitext(member)[0]).strip("-").lower() or "table"
+        name, n = base, 2
+        while name in used:
+            name, n = f"{base}-{n}", n + 1
+        used.add(name)
+        names[member] = name
+    
+    return names
+
+
+def _convert_bundle_member(path, member, file_type, style, max_rows, label, text_options, group_names):
+    """Convert one member of a bundle to a table; runs in a worker process, so errors are returned"""
+    try:
+        if os.path.isdir(path):
+            data = load_table(os.path.join(path, member), max_rows=max_rows, text_options=text_options)
+        else:
+            data = load_table(path, file_type, max_rows=max_rows, member=member, text_options=text_options)
+        
+        tabular = format_tabular(data, style, max_rows, group_names=group_names)
+        # Bundled tables are there to be referenced, so they get their label whatever the style
+        latex_code = get_style(style).wrap(tabular, escape_latex(member), label)
+        return latex_code, None
+    
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def convert_bundle(path, output_path, file_type="auto", style="booktabs", max_rows=None, layout="document",
+                   label_prefix="tab:", jobs=None, progress=None, text_options=None, group_names=DEFAULT_GROUP_NAMES):
+    """
+    Convert every data file in an archive or directory into its own table
+    layout "document" writes a single standalone document holding all tables,
+    "include" writes one .tex file per table into the output_path directory
+    plus a tables.tex that \\inputs them. Members are parsed and formatted in
+    parallel on a process pool, tables always come out in sorted member order.
+    progress, if given, is called with the number of members done.
+    Returns a list of (member, error) for the members that failed.
+    """
+    packages = ",".join(get_style(style).packages)
+    members = list_bundle_members(path, file_type)
+    names = bundle_names(members)
+    
+    tables = []
+    errors = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_convert_bundle_member, path, member, file_type, style, max_rows,
+                            label_prefix + names[member], text_options, group_names)
+            for member in members
+        ]
+        try:
+            # Collect in submission order, whatever order the workers finish in
+            for done, (member, future) in enumerate(zip(members, futures), start=1):
+                latex_code, error = future.result()
+                if error:
+                    errors.append((member, error))
+                    # Parser errors can span lines, each must stay inside the comment
+                    message = f"{member}: conversion failed: {error}".strip()
+                    latex_code = "".join(f"% {line}\n" for line in message.splitlines())
+                tables.append((member, latex_code))
+                
+                if progress is not None:
+                    progress(done)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    
+    if layout == "include":
+        os.makedirs(output_path, exist_ok=True)
+        for member, latex_code in tables:
+            with open(os.path.join(output_path, names[member] + ".tex"), 'w') as f:
+                f.write(latex_code)
+        
+        with open(os.path.join(output_path, "tables.tex"), 'w') as f:
+            if packages:
+                f.write(f"% Requires \\usepackage{{{packages}}}\n")
+            f.writelines(f"\\input{{{names[member]}}}\n" for member, _ in tables)
+        return errors
+    
+    # One document, written to a temporary file first like stream_to_latex
+    partial_path = output_path + ".part"
+    try:
+        with open(partial_path, 'w') as f:
+            f.write("\\documentclass{article}\n")
+            if packages:
+                f.write(f"\\usepackage{{{packages}}}\n")
+            f.write("\\begin{document}\n")
+            
+            for i, (member, latex_code) in enumerate(tables, start=1):
+                f.write(f"\n{latex_code}\n")
+                if i % BUNDLE_TABLES_PER_PAGE_BREAK == 0 and i < len(tables):
+                    f.write("\\clearpage\n")
+            
+            f.write("\n\\end{document}\n")
+        os.replace(partial_path, output_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    
+    return errors
+
+
+# Bytes scanned at a time when indexing the lines of a large output
+LINE_INDEX_BLOCK_BYTES = 16 * 1024 ** 2
+
+# Outputs up to this size are put into the text view whole, so they select and copy like any text
+VIRTUAL_TEXT_BYTES = 2 * 1024 ** 2
+
+
+class LineBuffer:
+    """
+    Random access to the lines of a large text without splitting it into strings
+    The text is kept as UTF-8 bytes, or memory mapped from a file, with an
+    index of where each line starts, so any range of lines is cheap to fetch.
+    """
+    
+    def __init__(self, data):
+        self.data = data
+        self.path = None
+        self.mapping = None
+        array = np.frombuffer(data, dtype=np.uint8) if isinstance(data, bytes) else data
+        
+        # Find the newlines a block at a time, so indexing a file doesn't need a copy of it in memory
+        newlines = [np.flatnonzero(array[start:start + LINE_INDEX_BLOCK_BYTES] == ord("\n")) + start
+                    for start in range(0, len(array), LINE_INDEX_BLOCK_BYTES)]
+        newlines = np.concatenate(newlines) if newlines else np.empty(0, dtype=np.int64)
+        
+        self.starts = np.concatenate(([0], newlines + 1))
+        self.ends = np.concatenate((newlines, [len(array)]))
+        if len(array) == 0 or array[-1] == ord("\n"):
+            # No line after the final newline
+            self.starts, self.ends = self.starts[:-1], self.ends[:-1]
+    
+    @classmethod
+    def from_text(cls, text):
+        return cls(text.encode("utf-8"))
+    
+    @classmethod
+    def from_file(cls, path):
+        """
+        Memory map a text file, only the lines that are fetched are read from disk
+        The file stays mapped until close is called; Windows can't replace it before then.
+        """
+        if os.path.getsize(path) == 0:
+            buffer = cls(b"")
+        else:
+            with open(path, 'rb') as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = cls(np.frombuffer(mapping, dtype=np.uint8))
+            buffer.mapping = mapping
+        buffer.path = path
+        return buffer
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    @property
+    def nbytes(self):
+        return len(self.data)
+    
+    def text(self):
+        """The whole text as one string"""
+        return bytes(self.data).decode("utf-8", errors="replace")
+    
+    def close(self):
+        """Unmap the file the buffer was mapped from, if any; the buffer is empty afterwards"""
+        # The mapping can only be closed once no array refers to it
+        self.data = b""
+        self.starts = self.ends = np.empty(0, dtype=np.int64)
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+    
+    def lines(self, start, stop):
+        """Lines start to stop (exclusive) as one string, without the final newline"""
+        stop = min(stop, len(self))
+        if start >= stop:
+            return ""
+        
+        data = self.data[self.starts[start]:self.ends[stop - 1]]
+        return bytes(data).decode("utf-8", errors="replace")
+
+
+class VirtualTextView:
+    """
+    Read-only text view that only renders the lines on screen
+    A Tk Text widget gets slow to fill and scroll once it holds a few
+    megabytes, so the lines are kept in a LineBuffer and the widget only ever
+    holds the visible window, which is re-rendered on scroll. Texts up to
+    VIRTUAL_TEXT_BYTES are put into the widget whole instead, so they scroll
+    and select natively; copy_all copies any text. The widgets sit in
+    self.frame, which is placed with pack or grid.
+    """
+    
+    def __init__(self, master, **text_options):
+        self.frame = ttk.Frame(master)
+        self.buffer = LineBuffer(b"")
+        self.top = 0
+        self.whole = True
+        
+        self.text = tk.Text(self.frame, wrap=tk.NONE, **text_options)
+        self.text.grid(row=0, column=0, sticky=tk.NSEW)
+        self.line_height = tkfont.Font(font=self.text["font"]).metrics("linespace")
+        
+        # The vertical scrollbar tracks the position in the buffer, not in the widget
+        self.y_scroll = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.y_scroll.grid(row=0, column=1, sticky=tk.NS)
+        
+        x_scroll = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.text.xview)
+        x_scroll.grid(row=1, column=0, sticky=tk.EW)
+        self.text['xscrollcommand'] = x_scroll.set
+        
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+        
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", lambda event: self.scroll(-3 if event.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.text.bind("<Button-5>", lambda event: self.scroll(3))
+        self.text.bind("<Up>", lambda event: self.scroll(-1))
+        self.text.bind("<Down>", lambda event: self.scroll(1))
+        self.text.bind("<Prior>", lambda event: self.scroll(-self.visible_lines()))
+        self.text.bind("<Next>", lambda event: self.scroll(self.visible_lines()))
+        self.text.bind("<Control-Home>", lambda event: self.scroll(-len(self.buffer)))
+        self.text.bind("<Control-End>", lambda event: self.scroll(len(self.buffer)))
+    
+    def pack(self, **options):
+        self.frame.pack(**options)
+    
+    def grid(self, **options):
+        self.frame.grid(**options)
+    
+    def set_text(self, text):
+        """Show a string"""
+        self.set_buffer(LineBuffer.from_text(text))
+    
+    def set_buffer(self, buffer):
+        """Show the lines of a LineBuffer, e.g. one mapped from a file, from the top; the previous one is closed"""
+        if buffer is not self.buffer:
+            self.buffer.close()
+        self.buffer = buffer
+        self.top = 0
+        
+        self.whole = buffer.nbytes <= VIRTUAL_TEXT_BYTES
+        if self.whole:
+            self.text.config(state=tk.NORMAL)
+            self.text.delete(1.0, tk.END)
+            self.text.insert(tk.END, buffer.text())
+            self.text.config(state=tk.DISABLED)
+            self.text['yscrollcommand'] = self.y_scroll.set
+        else:
+            self.text['yscrollcommand'] = ""
+            self.render()
+    
+    def release(self, path):
+        """Stop showing the file at path, so it can be rewritten while mapped on Windows"""
+        if self.buffer.path is not None and os.path.abspath(self.buffer.path) == os.path.abspath(path):
+            self.set_buffer(LineBuffer(b""))
+    
+    def copy_all(self):
+        """Put the whole text on the clipboard, not only the lines in view"""
+        self.text.clipboard_clear()
+        self.text.clipboard_append(self.buffer.text())
+    
+    def visible_lines(self):
+        return max(1, self.text.winfo_height() // self.line_height)
+    
+    def scroll(self, lines):
+        if self.whole:
+            # The widget's own bindings scroll a whole text
+            return None
+        self.top += lines
+        self.render()
+        return "break"
+    
+    def yview(self, *args):
+        """Scrollbar command"""
+        if self.whole:
+            return self.text.yview(*args)
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.buffer))
+        elif args[0] == "scroll":
+            lines = int(args[1]) * (self.visible_lines() if args[2] == "pages" else 1)
+            self.top += lines
+        self.render()
+    
+    def render(self):
+        """Replace the widget contents with the lines in view"""
+        if self.whole:
+            return
+        visible = self.visible_lines()
+        self.top = max(0, min(self.top, len(self.buffer) - visible))
+        stop = min(len(self.buffer), self.top + visible)
+        
+        # Keep the horizontal position, replacing the contents resets it
+        x_position = self.text.xview()[0]
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, self.buffer.lines(self.top, stop))
+        self.text.config(state=tk.DISABLED)
+        self.text.xview_moveto(x_position)
+        
+        if len(self.buffer):
+            self.y_scroll.set(self.top / len(self.buffer), stop / len(self.buffer))
+        else:
+            self.y_scroll.set(0, 1)
+
+
+# Rows shown per page of the data preview
+PREVIEW_PAGE_ROWS = 100
+
+
+class DataFrameGrid:
+    """
+    Paged table view of a DataFrame
+    Rows are fetched and formatted one page at a time through a callback,
+    so a frame with millions of rows costs no more to show than a small one.
+    The widgets sit in self.frame, which is placed with pack or grid.
+    """
+    
+    def __init__(self, master, page_rows=PREVIEW_PAGE_ROWS):
+        self.frame = ttk.Frame(master)
+        self.page_rows = page_rows
+        self.row_count = 0
+        self.fetch = None
+        self.start = 0
+        
+        self.tree = ttk.Treeview(self.frame, show="headings", selectmode="browse")
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        
+        y_scroll = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        y_scroll.grid(row=0, column=1, sticky=tk.NS)
+        self.tree['yscrollcommand'] = y_scroll.set
+        
+        x_scroll = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        x_scroll.grid(row=1, column=0, sticky=tk.EW)
+        self.tree['xscrollcommand'] = x_scroll.set
+        
+        # Page navigation
+        nav_frame = ttk.Frame(self.frame)
+        nav_frame.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
+        ttk.Button(nav_frame, text="<<", width=3, command=lambda: self.go_to(0)).pack(side=tk.LEFT)
+        ttk.Button(nav_frame, text="<", width=3, command=lambda: self.go_to(self.start - self.page_rows)).pack(side=tk.LEFT)
+        ttk.Button(nav_frame, text=">", width=3, command=lambda: self.go_to(self.start + self.page_rows)).pack(side=tk.LEFT)
+        ttk.Button(nav_frame, text=">>", width=3, command=lambda: self.go_to(self.row_count)).pack(side=tk.LEFT)
+        
+        ttk.Label(nav_frame, text="Go to row:").pack(side=tk.LEFT, padx=(10, 5))
+        self.row_var = tk.StringVar()
+        row_entry = ttk.Entry(nav_frame, textvariable=self.row_var, width=10)
+        row_entry.pack(side=tk.LEFT)
+        row_entry.bind("<Return>", lambda event: self.go_to(int(self.row_var.get()) - 1 if self.row_var.get().isdigit() else 0))
+        
+        self.position_var = tk.StringVar()
+        ttk.Label(nav_frame, textvariable=self.position_var).pack(side=tk.LEFT, padx=10)
+        
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+    
+    def pack(self, **options):
+        self.frame.pack(**options)
+    
+    def grid(self, **options):
+        self.frame.grid(**options)
+    
+    def show(self, row_count, columns, fetch):
+        """
+        Show a table of row_count rows from the first page
+        fetch(start, stop) returns those rows as a DataFrame; it is only called
+        for the page in view.
+        """
+        self.row_count = row_count
+        self.fetch = fetch
+        
+        names = ["#"] + [str(col) for col in columns]
+        self.tree["columns"] = [f"c{i}" for i in range(len(names))]
+        for i, name in enumerate(names):
+            # Fixed widths, so wide frames scroll sideways instead of squeezing every column
+            self.tree.heading(f"c{i}", text=name)
+            self.tree.column(f"c{i}", width=60 if i == 0 else 100, stretch=False, anchor=tk.E if i == 0 else tk.W)
+        
+        self.go_to(0)
+    
+    def show_frame(self, data):
+        """Show a DataFrame held in memory"""
+        self.show(len(data), data.columns, lambda start, stop: data.iloc[start:stop])
+    
+    def go_to(self, row):
+        """Show the page containing row"""
+        last_page = max(0, (self.row_count - 1) // self.page_rows * self.page_rows)
+        self.start = min(max(0, row // self.page_rows * self.page_rows), last_page)
+        stop = min(self.start + self.page_rows, self.row_count)
+        
+        self.tree.delete(*self.tree.get_children())
+        if self.fetch is not None and stop > self.start:
+            page = self.fetch(self.start, stop)
+            for label, values in zip(page.index, page.itertuples(index=False, name=None)):
+                self.tree.insert("", tk.END, values=[str(label)] + [str(value) for value in values])
+        
+        if self.row_count:
+            self.position_var.set(f"Rows {self.start + 1:,}-{stop:,} of {self.row_count:,}")
+        else:
+            self.position_var.set("No rows")
 
 
 class FileToLatexConverter:
@@ -18,12 +2584,24 @@ class FileToLatexConverter:
         
         self.setup_ui()
         
-        # Temporary directory for extracted files
+        # Loading and conversion run on a worker thread so the UI stays responsive
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.job = None
+        self.cancel_event = threading.Event()
+        self.rows_read = 0
+        
+        # Temporary directory for extracted files and parsed data evicted from the cache
         self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = DataCache(spill_dir=os.path.join(self.temp_dir.name, "cache"))
+        
+        # Formatted tabular environments, so caption and label edits don't reformat every cell
+        self.tabular_cache = LRUCache(max_bytes=128 * 1024 ** 2)
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
     def on_closing(self):
-        """Clean up temporary directory on application close"""
+        """Stop background work and clean up temporary directory on application close"""
+        self.cancel_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
         self.temp_dir.cleanup()
         self.root.destroy()
         
@@ -44,6 +2622,41 @@ class FileToLatexConverter:
         
         ttk.Button(input_frame, text="Browse", command=self.browse_file).grid(row=0, column=2, pady=5)
         
+        # Archive member selection, filled from the archive index when an archive is chosen
+        ttk.Label(input_frame, text="Archive Member:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.member_var = tk.StringVar()
+        self.member_combo = ttk.Combobox(input_frame, textvariable=self.member_var, width=47)
+        self.member_combo.grid(row=1, column=1, pady=5, padx=5)
+        
+        # HDF5 dataset and the rows and columns to read from HDF5, Parquet, Feather and .npy files,
+        # empty means the first dataset and everything in it
+        ttk.Label(input_frame, text="HDF5 Dataset:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.h5_dataset_var = tk.StringVar()
+        ttk.Entry(input_frame, textvariable=self.h5_dataset_var, width=50).grid(row=2, column=1, pady=5, padx=5)
+        ttk.Button(input_frame, text="Datasets...", command=self.browse_datasets).grid(row=2, column=2, pady=5)
+        
+        ttk.Label(input_frame, text="Rows:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        slab_frame = ttk.Frame(input_frame)
+        slab_frame.grid(row=3, column=1, sticky=tk.W, pady=5, padx=5)
+        self.h5_rows_var = tk.StringVar()
+        ttk.Entry(slab_frame, textvariable=self.h5_rows_var, width=15).pack(side=tk.LEFT)
+        ttk.Label(slab_frame, text="Columns:").pack(side=tk.LEFT, padx=5)
+        self.h5_columns_var = tk.StringVar()
+        ttk.Entry(slab_frame, textvariable=self.h5_columns_var, width=25).pack(side=tk.LEFT)
+        
+        # CSV/text parsing: columns to read, dtype overrides and parser engine, empty means everything as inferred
+        ttk.Label(input_frame, text="Text Columns:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        text_frame = ttk.Frame(input_frame)
+        text_frame.grid(row=4, column=1, columnspan=2, sticky=tk.W, pady=5, padx=5)
+        self.usecols_var = tk.StringVar()
+        ttk.Entry(text_frame, textvariable=self.usecols_var, width=15).pack(side=tk.LEFT)
+        ttk.Label(text_frame, text="Types:").pack(side=tk.LEFT, padx=5)
+        self.dtype_var = tk.StringVar()
+        ttk.Entry(text_frame, textvariable=self.dtype_var, width=20).pack(side=tk.LEFT)
+        ttk.Label(text_frame, text="Engine:").pack(side=tk.LEFT, padx=5)
+        self.engine_var = tk.StringVar(value="c")
+        ttk.Combobox(text_frame, textvariable=self.engine_var, values=["c", "pyarrow"], width=8).pack(side=tk.LEFT)
+        
         # Options section
         options_frame = ttk.LabelFrame(main_frame, text="Options", padding="10")
         options_frame.pack(fill=tk.X, pady=10)
@@ -51,8 +2664,7 @@ class FileToLatexConverter:
         # File type detection
         ttk.Label(options_frame, text="File Type:").grid(row=0, column=0, sticky=tk.W, pady=5)
         self.file_type_var = tk.StringVar(value="auto")
-        file_types = ["auto", "csv", "h5", "text", "tar", "zip"]
-        ttk.Combobox(options_frame, textvariable=self.file_type_var, values=file_types, width=15).grid(row=0, column=1, sticky=tk.W, pady=5)
+        ttk.Combobox(options_frame, textvariable=self.file_type_var, values=FILE_TYPES, width=15).grid(row=0, column=1, sticky=tk.W, pady=5)
         
         # LaTeX table options
         ttk.Label(options_frame, text="Table Caption:").grid(row=1, column=0, sticky=tk.W, pady=5)
@@ -70,21 +2682,61 @@ class FileToLatexConverter:
         # Table style selection
         ttk.Label(options_frame, text="Table Style:").grid(row=3, column=1, sticky=tk.W, pady=5)
         self.table_style_var = tk.StringVar(value="booktabs")
-        table_styles = ["booktabs", "standard"]
-        ttk.Combobox(options_frame, textvariable=self.table_style_var, values=table_styles, width=15).grid(row=3, column=2, sticky=tk.W, pady=5)
+        ttk.Combobox(options_frame, textvariable=self.table_style_var, values=list(TABLE_STYLES), width=15).grid(row=3, column=2, sticky=tk.W, pady=5)
         
         # Max rows
         ttk.Label(options_frame, text="Max Rows:").grid(row=4, column=0, sticky=tk.W, pady=5)
         self.max_rows_var = tk.StringVar(value="50")
         ttk.Entry(options_frame, textvariable=self.max_rows_var, width=10).grid(row=4, column=1, sticky=tk.W, pady=5)
+        
+        # Run tasks under cProfile, the profile is shown in the Diagnostics tab
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Profile", variable=self.profile_var).grid(row=4, column=2, sticky=tk.W, pady=5)
+        
+        # Re-run the last task whenever the selected file changes on disk
+        self.watch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Watch File", variable=self.watch_var,
+                        command=self.toggle_watch).grid(row=4, column=3, sticky=tk.W, pady=5)
+        
+        # Processes formatting large tables, 1 formats on the worker thread
+        ttk.Label(options_frame, text="Format Workers:").grid(row=6, column=0, sticky=tk.W, pady=5)
+        self.format_jobs_var = tk.StringVar(value="1")
+        ttk.Spinbox(options_frame, textvariable=self.format_jobs_var, from_=1, to=os.cpu_count() or 1,
+                    width=8).grid(row=6, column=1, sticky=tk.W, pady=5)
+        
+        # Headings of the two column groups of booktabs tables, empty for a single header row
+        ttk.Label(options_frame, text="Column Groups:").grid(row=6, column=2, sticky=tk.W, pady=5)
+        self.group_names_var = tk.StringVar(value=",".join(DEFAULT_GROUP_NAMES))
+        ttk.Entry(options_frame, textvariable=self.group_names_var, width=30).grid(row=6, column=3, sticky=tk.W, pady=5)
+        
+        # Summary mode: statistics of every row, optionally one row per group, instead of the first rows
+        self.summary_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Summarize", variable=self.summary_var).grid(row=5, column=0, sticky=tk.W, pady=5)
+        summary_frame = ttk.Frame(options_frame)
+        summary_frame.grid(row=5, column=1, columnspan=3, sticky=tk.W, pady=5)
+        ttk.Label(summary_frame, text="Group By:").pack(side=tk.LEFT)
+        self.group_by_var = tk.StringVar()
+        ttk.Entry(summary_frame, textvariable=self.group_by_var, width=15).pack(side=tk.LEFT, padx=5)
+        ttk.Label(summary_frame, text="Statistics:").pack(side=tk.LEFT, padx=5)
+        self.summary_stats_var = tk.StringVar(value=",".join(SUMMARY_STATS))
+        ttk.Entry(summary_frame, textvariable=self.summary_stats_var, width=35).pack(side=tk.LEFT)
                 
         # Action buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Button(button_frame, text="Convert", command=self.convert_file).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Preview", command=self.preview_data).pack(side=tk.LEFT, padx=5)
+        self.convert_button = ttk.Button(button_frame, text="Convert", command=self.convert_file)
+        self.convert_button.pack(side=tk.LEFT, padx=5)
+        self.preview_button = ttk.Button(button_frame, text="Preview", command=self.preview_data)
+        self.preview_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Save LaTeX", command=self.save_latex).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Copy All", command=self.copy_latex).pack(side=tk.LEFT, padx=5)
+        self.export_button = ttk.Button(button_frame, text="Export Longtable", command=self.export_longtable)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+        self.bundle_button = ttk.Button(button_frame, text="Export Bundle", command=self.export_bundle)
+        self.bundle_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
         
         # Output area
         output_frame = ttk.LabelFrame(main_frame, text="Output", padding="10")
@@ -98,33 +2750,30 @@ class FileToLatexConverter:
         preview_frame = ttk.Frame(self.notebook)
         self.notebook.add(preview_frame, text="Data Preview")
         
-        self.preview_text = tk.Text(preview_frame, wrap=tk.NONE, font=("Courier", 10))
-        self.preview_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Add scrollbars for the preview
-        preview_y_scroll = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.preview_text.yview)
-        preview_y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.preview_text['yscrollcommand'] = preview_y_scroll.set
+        self.preview_grid = DataFrameGrid(preview_frame)
+        self.preview_grid.pack(fill=tk.BOTH, expand=True)
         
-        preview_x_scroll = ttk.Scrollbar(preview_frame, orient=tk.HORIZONTAL, command=self.preview_text.xview)
-        preview_x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
-        self.preview_text['xscrollcommand'] = preview_x_scroll.set
+        self.preview_info_var = tk.StringVar()
+        ttk.Label(preview_frame, textvariable=self.preview_info_var, justify=tk.LEFT).pack(fill=tk.X, pady=(5, 0))
         
         # LaTeX output tab
         latex_frame = ttk.Frame(self.notebook)
         self.notebook.add(latex_frame, text="LaTeX Output")
         
-        self.latex_text = tk.Text(latex_frame, wrap=tk.NONE, font=("Courier", 10))
-        self.latex_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Only the visible lines are rendered, so multi-megabyte tables scroll smoothly
+        self.latex_view = VirtualTextView(latex_frame, font=("Courier", 10))
+        self.latex_view.pack(fill=tk.BOTH, expand=True)
         
-        # Add scrollbars for the LaTeX output
-        latex_y_scroll = ttk.Scrollbar(latex_frame, orient=tk.VERTICAL, command=self.latex_text.yview)
-        latex_y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.latex_text['yscrollcommand'] = latex_y_scroll.set
+        # Diagnostics tab with the stage timings of the last task
+        diagnostics_frame = ttk.Frame(self.notebook)
+        self.notebook.add(diagnostics_frame, text="Diagnostics")
         
-        latex_x_scroll = ttk.Scrollbar(latex_frame, orient=tk.HORIZONTAL, command=self.latex_text.xview)
-        latex_x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
-        self.latex_text['xscrollcommand'] = latex_x_scroll.set
+        self.diagnostics_text = tk.Text(diagnostics_frame, wrap=tk.NONE, font=("Courier", 10))
+        self.diagnostics_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        diagnostics_y_scroll = ttk.Scrollbar(diagnostics_frame, orient=tk.VERTICAL, command=self.diagnostics_text.yview)
+        diagnostics_y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.diagnostics_text['yscrollcommand'] = diagnostics_y_scroll.set
         
         # Status bar
         self.status_var = tk.StringVar()
@@ -132,15 +2781,32 @@ class FileToLatexConverter:
         
         # Initialize variables
         self.data = None
+        self.tabular = None
+        self.tabular_style = None
         self.latex_code = ""
+        self.stats = RunStats()
+        
+        # Watch state: the task to repeat, the (input, .tex) pair last saved, and the contents last seen
+        self.watcher = None
+        self.watch_after = None
+        self.watch_action = None
+        self.watched_digest = None
+        self.saved_latex = None
+        
+        # Caption and label only change the table wrapper, so the output is refreshed right away
+        for var in (self.caption_var, self.label_var, self.include_caption_var):
+            var.trace_add("write", lambda *args: self.refresh_latex())
         
     def browse_file(self):
         """Open file browser dialog to select a file"""
         filetypes = [
-            ("All Supported Files", "*.csv *.h5 *.txt *.tar *.gz *.zip"),
+            ("All Supported Files", "*.csv *.h5 *.txt *.parquet *.pq *.feather *.arrow *.npy *.tar *.gz *.zip"),
             ("CSV Files", "*.csv"),
             ("HDF5 Files", "*.h5"),
             ("Text Files", "*.txt"),
+            ("Parquet Files", "*.parquet *.pq"),
+            ("Feather/Arrow Files", "*.feather *.arrow"),
+            ("NumPy Files", "*.npy"),
             ("TAR Files", "*.tar *.gz"),
             ("ZIP Files", "*.zip"),
             ("All Files", "*.*")
@@ -152,271 +2818,142 @@ class FileToLatexConverter:
             self.status_var.set(f"File selected: {os.path.basename(file_path)}")
             
             # Auto-detect file type
-            extension = os.path.splitext(file_path)[1].lower()
-            if extension == ".csv":
-                self.file_type_var.set("csv")
-            elif extension == ".h5":
-                self.file_type_var.set("h5")
-            elif extension == ".txt":
-                self.file_type_var.set("text")
-            elif extension in [".tar", ".gz"]:
-                self.file_type_var.set("tar")
-            elif extension == ".zip":
-                self.file_type_var.set("zip")
-    
-    def extract_archive(self, file_path):
-        """Extract files from a tar or zip archive"""
-        file_type = self.file_type_var.get()
-        temp_path = self.temp_dir.name
-        
-        try:
-            if file_type == "auto":
-                extension = os.path.splitext(file_path)[1].lower()
-                if extension in [".tar", ".gz"]:
-                    file_type = "tar"
-                elif extension == ".zip":
-                    file_type = "zip"
+            self.file_type_var.set(detect_archive_type(file_path) or detect_file_type(file_path))
             
-            if file_type == "tar":
-                with tarfile.open(file_path, "r:*") as tar:
-                    tar.extractall(path=temp_path)
-            elif file_type == "zip":
-                with zipfile.ZipFile(file_path, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            
-            # Return a list of extracted files
-            extracted_files = []
-            for root, _, files in os.walk(temp_path):
-                for file in files:
-                    extracted_files.append(os.path.join(root, file))
-            
-            if not extracted_files:
-                raise Exception("No files found in archive")
-                
-            return extracted_files
+            self.refresh_archive_members()
+    
+    def get_archive_type(self, file_path):
+        """Return "tar" or "zip" if the selected file is an archive, otherwise None"""
+        return detect_archive_type(file_path, self.file_type_var.get())
+    
+    def list_archive_members(self, file_path):
+        """List the files in a tar or zip archive"""
+        try:
+            return list_archive_members(file_path, self.file_type_var.get())
         
         except Exception as e:
-            messagebox.showerror("Extraction Error", f"Failed to extract archive: {str(e)}")
+            messagebox.showerror("Archive Error", f"Failed to read archive: {str(e)}")
             return []
     
-    def load_file(self, file_path):
-        """Load data from the selected file"""
+    def refresh_archive_members(self):
+        """Fill the archive member list for the selected file"""
+        file_path = self.file_path_var.get()
+        members = []
+        if file_path and self.get_archive_type(file_path):
+            members = self.list_archive_members(file_path)
+        
+        self.member_combo["values"] = members
+        self.member_var.set(members[0] if members else "")
+    
+    def get_selection(self):
+        """Return the dataset, row and column selection from the UI; raises ValueError for malformed ranges"""
+        return HDF5Selection.from_strings(self.h5_dataset_var.get(), self.h5_rows_var.get(), self.h5_columns_var.get())
+    
+    def get_text_options(self):
+        """Return the CSV/text parsing options from the UI; raises ValueError for malformed ones"""
+        return TextOptions.from_strings(self.engine_var.get(), self.usecols_var.get(), self.dtype_var.get())
+    
+    def get_format_jobs(self):
+        """Return the number of formatting processes from the UI, 1 if it isn't a positive number"""
+        jobs = self.format_jobs_var.get()
+        return max(int(jobs), 1) if jobs.isdigit() else 1
+    
+    def get_group_names(self):
+        """Return the column group headings from the UI, or None; raises ValueError unless two are given"""
+        return parse_group_names(self.group_names_var.get())
+    
+    def get_summary_options(self):
+        """Return the summary options from the UI, or None if rows are converted; raises ValueError for unknown statistics"""
+        if not self.summary_var.get():
+            return None
+        return SummaryOptions.from_strings(self.group_by_var.get(), self.summary_stats_var.get())
+    
+    def browse_datasets(self):
+        """Show the groups and datasets of the selected HDF5 file, reading each group only when it is expanded"""
+        file_path = self.file_path_var.get()
+        if not file_path:
+            messagebox.showwarning("No File", "Please select a file first.")
+            return
+        
         file_type = self.file_type_var.get()
+        member = self.member_var.get() or None
         
-        try:
-            # Check if we need to extract an archive first
-            if file_type in ["tar", "zip"] or (file_type == "auto" and any(file_path.endswith(ext) for ext in [".tar", ".gz", ".zip"])):
-                extracted_files = self.extract_archive(file_path)
-                if not extracted_files:
-                    return None
-                
-                # For simplicity, use the first file in the archive
-                # You might want to add a file selection dialog for multiple files
-                file_path = extracted_files[0]
-                # Auto-detect the file type from the extracted file
-                file_type = "auto"
-            
-            # Determine file type if set to auto
-            if file_type == "auto":
-                extension = os.path.splitext(file_path)[1].lower()
-                if extension == ".csv":
-                    file_type = "csv"
-                elif extension == ".h5":
-                    file_type = "h5"
-                else:
-                    file_type = "text"
-            
-            # Load based on file type
-            if file_type == "csv":
-                data = pd.read_csv(file_path)
-                return data
-            
-            elif file_type == "h5":
-                with h5py.File(file_path, 'r') as f:
-                    # HDF5 files can have complex structures
-                    # For simplicity, we'll get the first dataset
-                    datasets = []
-                    
-                    def find_datasets(name, obj):
-                        if isinstance(obj, h5py.Dataset):
-                            datasets.append((name, obj))
-                    
-                    f.visititems(find_datasets)
-                    
-                    if not datasets:
-                        raise ValueError("No datasets found in HDF5 file")
-                    
-                    # Use the first dataset
-                    name, dataset = datasets[0]
-                    # Convert to pandas DataFrame if possible
-                    try:
-                        data = pd.DataFrame(dataset[()])
-                        # If the dataset contains structured arrays, pandas will handle column names
-                        return data
-                    except:
-                        # Fallback for simple arrays
-                        data = pd.DataFrame(dataset[()])
-                        return data
+        window = tk.Toplevel(self.root)
+        window.title("HDF5 Datasets")
+        window.geometry("600x400")
+        
+        tree = ttk.Treeview(window, columns=("info",))
+        tree.heading("#0", text="Name")
+        tree.heading("info", text="Shape / Type")
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        tree_scroll = ttk.Scrollbar(window, orient=tk.VERTICAL, command=tree.yview)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        tree['yscrollcommand'] = tree_scroll.set
+        
+        loaded_groups = set()
+        datasets = set()
+        
+        def add_children(parent, group):
+            try:
+                with open_source(file_path, file_type, member) as (source, source_type):
+                    children = list_h5_group(source, group)
+            except Exception as e:
+                messagebox.showerror("HDF5 Error", f"Failed to read HDF5 file: {str(e)}", parent=window)
+                return
             
-            elif file_type == "text":
-                # Try to determine the delimiter in text files
-                with open(file_path, 'r') as f:
-                    sample = f.read(1024)
-                
-                # Check if it's tab-delimited
-                if '\t' in sample:
-                    data = pd.read_csv(file_path, sep='\t')
-                # Check if it's comma-delimited
-                elif ',' in sample:
-                    data = pd.read_csv(file_path, sep=',')
-                # Otherwise, treat as space-delimited
+            loaded_groups.add(group)
+            for path, is_group, info in children:
+                tree.insert(parent, tk.END, iid=path, text=path.rsplit("/", 1)[-1], values=(info,))
+                if is_group:
+                    # Placeholder child so the group can be expanded
+                    tree.insert(path, tk.END)
                 else:
-                    data = pd.read_csv(file_path, delim_whitespace=True, header=None)
-                
-                return data
-            
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
+                    datasets.add(path)
+        
+        def on_open(event):
+            group = tree.focus()
+            if group not in loaded_groups:
+                tree.delete(*tree.get_children(group))
+                add_children(group, group)
+        
+        def on_choose(event):
+            item = tree.focus()
+            if item in datasets:
+                self.h5_dataset_var.set(item)
+                self.status_var.set(f"HDF5 dataset selected: {item}")
+                window.destroy()
+        
+        tree.bind("<<TreeviewOpen>>", on_open)
+        tree.bind("<Double-1>", on_choose)
+        add_children("", "/")
+    
+    def get_max_rows(self):
+        """Return the row limit from the UI, or None if all rows should be used"""
+        max_rows = int(self.max_rows_var.get()) if self.max_rows_var.get().isdigit() else None
+        return max_rows or None
+    
+    def load_file(self, file_path, max_rows=None, member=None):
+        """
+        Load data from the selected file
+        If max_rows is given, only that many rows are read from the file.
+        For archives, member selects the file to read (the first one by default).
+        """
+        try:
+            return load_data(file_path, self.file_type_var.get(), max_rows=max_rows, member=member)
         
         except Exception as e:
             messagebox.showerror("File Loading Error", f"Failed to load file: {str(e)}")
             return None
     
+    def get_caption(self):
+        """Return the caption from the UI, or None if it should be left out"""
+        return self.caption_var.get() if self.include_caption_var.get() else None
+    
     def format_booktabs_style(self, data):
-        """
-        Format data into a booktabs-style LaTeX table like the example
-        This creates the specific visual style shown in the screenshot
-        """
+        """Format data into a booktabs-style LaTeX table using the UI options"""
         try:
-            # Get options from the UI
-            caption = self.caption_var.get() if self.include_caption_var.get() else None
-            label = self.label_var.get()
-            
-            # Limit number of rows if specified
-            max_rows = int(self.max_rows_var.get()) if self.max_rows_var.get().isdigit() else None
-            if max_rows and len(data) > max_rows:
-                data = data.head(max_rows)
-            
-            # Generate the LaTeX code
-            latex = []
-            
-            # Begin table environment
-            latex.append("\\begin{table}[htbp]")
-            latex.append("  \\begin{center}")
-            latex.append("  \\centering")
-            
-            # Determine the number of columns and create a structure like the example
-            num_cols = len(data.columns)
-            
-            # First column is for row identifiers (like years in the example)
-            # Divide remaining columns into two semester groups if possible
-            main_cols = num_cols - 1  # Exclude the first column
-            
-            if main_cols >= 2:
-                # Split remaining columns into two groups
-                first_group = main_cols // 2
-                second_group = main_cols - first_group
-                
-                # Create the tabular environment with appropriate column formatting
-                # First column is 'c', followed by first_group 'c's, then a vertical bar, then second_group 'c's
-                alignment = "c " + "c" * first_group + " | " + "c" * second_group
-            else:
-                # If too few columns, just use all 'c' alignment
-                alignment = "c" * num_cols
-            
-            latex.append(f"  \\begin{{tabular}}{{{alignment}}}")
-            latex.append("    \\toprule")
-            
-            # Create the first header row with semester groups
-            if main_cols >= 4:  # Need at least 2 columns per group
-                first_header = [""]  # Empty cell in top left
-                
-                # Use column names if they exist, or create defaults
-                first_group_name = "Fall Courses"
-                second_group_name = "Spring Courses"
-                
-                # Add multicolumn headers
-                first_header.append(f"\\multicolumn{{{first_group}}}{{c}}{{{first_group_name}}}")
-                first_header.append(f"\\multicolumn{{{second_group}}}{{c}}{{{second_group_name}}}")
-                
-                latex.append(f"    {' & '.join(first_header)} \\\\")
-                
-                # Add cmidrule separators like in the example
-                first_start = 2  # Columns are 1-indexed in LaTeX
-                first_end = first_start + first_group - 1
-                second_start = first_end + 1
-                second_end = second_start + second_group - 1
-                
-                latex.append(f"    \\cmidrule(lr){{{first_start}-{first_end}}} \\cmidrule(lr){{{second_start}-{second_end}}}")
-                
-                # Add the subheader row with column names
-                column_headers = [""] + list(data.columns)[1:]  # Skip first column for now
-                latex.append(f"    {' & '.join(column_headers)} \\\\")
-                
-                # Add double midrule after headers
-                latex.append("    \\midrule    \\midrule")
-            else:
-                # Simple header for tables with few columns
-                headers = [str(col) for col in data.columns]
-                latex.append(f"    {' & '.join(headers)} \\\\")
-                latex.append("    \\midrule")
-            
-            # Add data rows
-            for i, (_, row) in enumerate(data.iterrows()):
-                row_values = []
-                for val in row:
-                    if pd.isna(val):
-                        # Handle missing values with a dash like in the example
-                        row_values.append("-")
-                    elif isinstance(val, (int, np.integer)):
-                        # Format integers without decimal point
-                        row_values.append(f"{val:d}")
-                    elif isinstance(val, (float, np.floating)):
-                        # Format floats with one decimal place like in the example
-                        if val.is_integer():
-                            row_values.append(f"{int(val)}")
-                        else:
-                            row_values.append(f"{val:.1f}")
-                    else:
-                        # Escape special LaTeX characters in text
-                        val_str = str(val)
-                        for char, replacement in [
-                            ("&", "\\&"),
-                            ("%", "\\%"),
-                            ("$", "\\$"),
-                            ("#", "\\#"),
-                            ("_", "\\_"),
-                            ("{", "\\{"),
-                            ("}", "\\}"),
-                            ("~", "\\textasciitilde"),
-                            ("^", "\\textasciicircum"),
-                            ("\\", "\\textbackslash")
-                        ]:
-                            val_str = val_str.replace(char, replacement)
-                        row_values.append(val_str)
-                
-                latex.append(f"    {' & '.join(row_values)} \\\\")
-                
-                # Add midrule between rows like in the example
-                if i < len(data) - 1:
-                    latex.append("    \\midrule")
-            
-            # Add space before bottomrule and the bottomrule itself
-            latex.append("    \\addlinespace")
-            latex.append("    \\bottomrule")
-            
-            # End tabular environment
-            latex.append("  \\end{tabular}")
-            
-            # Add caption
-            if caption:
-                latex.append(f"  \\caption{{{caption}}}")
-            
-            # End table environments
-            latex.append("  \\end{center}")
-            latex.append("\\end{table}")
-            
-            return "\n".join(latex)
+            return format_booktabs_table(data, caption=self.get_caption(), max_rows=self.get_max_rows())
         
         except Exception as e:
             messagebox.showerror("Conversion Error", f"Failed to convert to LaTeX: {str(e)}")
@@ -424,96 +2961,103 @@ class FileToLatexConverter:
     
     def convert_to_latex(self, data):
         """Convert DataFrame to LaTeX table code"""
-        style = self.table_style_var.get()
+        try:
+            return dataframe_to_latex(
+                data,
+                style=self.table_style_var.get(),
+                caption=self.get_caption(),
+                label=self.label_var.get(),
+                max_rows=self.get_max_rows(),
+                group_names=self.get_group_names()
+            )
         
-        if style == "booktabs":
-            return self.format_booktabs_style(data)
-        else:
-            # Standard LaTeX table style with vertical lines
-            try:
-                # Get options from the UI
-                caption = self.caption_var.get() if self.include_caption_var.get() else None
-                label = self.label_var.get()
-                
-                # Limit number of rows if specified
-                max_rows = int(self.max_rows_var.get()) if self.max_rows_var.get().isdigit() else None
-                if max_rows and len(data) > max_rows:
-                    data = data.head(max_rows)
-                
-                # Generate the LaTeX code
-                latex = []
-                
-                # Begin table environment
-                latex.append("\\begin{table}[htbp]")
-                latex.append("  \\centering")
-                
-                # Add caption if requested
-                if caption:
-                    latex.append(f"  \\caption{{{caption}}}")
-                
-                # Add label
-                if label:
-                    latex.append(f"  \\label{{{label}}}")
-                
-                # Calculate number of columns
-                num_cols = len(data.columns)
-                
-                # Create the tabular environment
-                alignment = "c" * num_cols
-                latex.append(f"  \\begin{{tabular}}{{|{alignment}|}}")
-                latex.append("    \\hline")
-                
-                # Add headers
-                headers = " & ".join([str(col) for col in data.columns])
-                latex.append(f"    {headers} \\\\")
-                latex.append("    \\hline")
-                
-                # Add data rows
-                for _, row in data.iterrows():
-                    row_values = []
-                    for val in row:
-                        if pd.isna(val):
-                            # Handle missing values
-                            row_values.append("--")
-                        elif isinstance(val, (int, np.integer)):
-                            # Format integers without decimal point
-                            row_values.append(f"{val:d}")
-                        elif isinstance(val, (float, np.floating)):
-                            # Format floats with reasonable precision
-                            if val.is_integer():
-                                row_values.append(f"{int(val)}")
-                            else:
-                                row_values.append(f"{val:.2f}")
-                        else:
-                            # Escape special LaTeX characters in text
-                            val_str = str(val)
-                            for char, replacement in [
-                                ("&", "\\&"),
-                                ("%", "\\%"),
-                                ("$", "\\$"),
-                                ("#", "\\#"),
-                                ("_", "\\_"),
-                                ("{", "\\{"),
-                                ("}", "\\}"),
-                                ("~", "\\textasciitilde"),
-                                ("^", "\\textasciicircum"),
-                                ("\\", "\\textbackslash")
-                            ]:
-                                val_str = val_str.replace(char, replacement)
-                            row_values.append(val_str)
-                    
-                    latex.append(f"    {' & '.join(row_values)} \\\\")
-                    latex.append("    \\hline")
-                
-                # End table environments
-                latex.append("  \\end{tabular}")
-                latex.append("\\end{table}")
-                
-                return "\n".join(latex)
-            
-            except Exception as e:
-                messagebox.showerror("Conversion Error", f"Failed to convert to LaTeX: {str(e)}")
-                return ""
+        except Exception as e:
+            messagebox.showerror("Conversion Error", f"Failed to convert to LaTeX: {str(e)}")
+            return ""
+    
+    def start_job(self, message, work, on_success, error_title, error_message, progress_unit="rows read"):
+        """
+        Run work() on the worker thread and hand its result to on_success on the UI thread
+        Progress is shown in the status bar by polling with root.after, as the
+        count passed to report_progress followed by progress_unit.
+        """
+        if self.job is not None and not self.job.done():
+            messagebox.showwarning("Busy", "Please wait for the current task to finish or cancel it.")
+            return
+        
+        self.cancel_event.clear()
+        self.rows_read = 0
+        self.progress_unit = progress_unit
+        self.status_var.set(message)
+        self.convert_button.config(state=tk.DISABLED)
+        self.preview_button.config(state=tk.DISABLED)
+        self.export_button.config(state=tk.DISABLED)
+        self.bundle_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        
+        # Time the stages of this task, display and saving on the UI thread are added to it later
+        self.stats = stats = RunStats()
+        profile = self.profile_var.get()
+        
+        def run():
+            with collect_stats(stats, profile):
+                return work()
+        
+        self.job = self.executor.submit(run)
+        self.root.after(100, self.poll_job, message, on_success, error_title, error_message)
+    
+    def poll_job(self, message, on_success, error_title, error_message):
+        """Check on the background job from the UI thread"""
+        if not self.job.done():
+            if self.rows_read:
+                self.status_var.set(f"{message} {self.rows_read:,} {self.progress_unit}")
+            self.root.after(100, self.poll_job, message, on_success, error_title, error_message)
+            return
+        
+        self.convert_button.config(state=tk.NORMAL)
+        self.preview_button.config(state=tk.NORMAL)
+        self.export_button.config(state=tk.NORMAL)
+        self.bundle_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        
+        try:
+            result = self.job.result()
+        except ConversionCancelled:
+            self.status_var.set("Cancelled")
+            self.show_stats()
+            return
+        except Exception as e:
+            self.status_var.set(error_message)
+            self.show_stats()
+            messagebox.showerror(error_title, f"{error_message}: {str(e)}")
+            return
+        
+        on_success(result)
+        self.show_stats()
+    
+    def show_stats(self):
+        """Add the stage timings of the last task to the status bar and show them in the Diagnostics tab"""
+        summary = self.stats.summary()
+        if summary:
+            self.status_var.set(f"{self.status_var.get()} ({summary})")
+        self.refresh_diagnostics()
+    
+    def refresh_diagnostics(self):
+        """Show the full stats report of the last task in the Diagnostics tab"""
+        self.diagnostics_text.delete(1.0, tk.END)
+        self.diagnostics_text.insert(tk.END, self.stats.format_report())
+    
+    def report_progress(self, rows):
+        """Progress callback for loads on the worker thread; aborts the load when cancelled"""
+        if self.cancel_event.is_set():
+            raise ConversionCancelled()
+        self.rows_read = rows
+    
+    def cancel_job(self):
+        """Abort the running load or conversion"""
+        if self.job is not None and not self.job.done():
+            self.cancel_event.set()
+            self.status_var.set("Cancelling...")
     
     def preview_data(self):
         """Preview the data from the selected file"""
@@ -522,50 +3066,130 @@ class FileToLatexConverter:
             messagebox.showwarning("No File", "Please select a file first.")
             return
         
-        self.data = self.load_file(file_path)
-        if self.data is not None:
-            # Clear previous content
-            self.preview_text.delete(1.0, tk.END)
-            
-            # Show DataFrame preview
-            self.preview_text.insert(tk.END, str(self.data.head(10)))
+        # Read the options on the UI thread, only parse as many rows as the table will use
+        file_type = self.file_type_var.get()
+        member = self.member_var.get() or None
+        max_rows = self.get_max_rows()
+        try:
+            selection = self.get_selection()
+            text_options = self.get_text_options()
+        except ValueError as e:
+            messagebox.showerror("Invalid Options", f"Invalid read options: {str(e)}")
+            return
+        
+        def work():
+            return self.cache.load(file_path, file_type, max_rows=max_rows, member=member, progress=self.report_progress,
+                                   selection=selection, text_options=text_options)
+        
+        def on_success(data):
+            self.data = data
+            self.show_preview(max_rows)
+        
+        self.watch_action = self.preview_data
+        self.start_job("Loading data...", work, on_success, "File Loading Error", "Failed to load file")
+    
+    def show_preview(self, max_rows):
+        """Show the loaded data in the preview tab"""
+        with self.stats.stage("display") as counters:
+            # Only the first page of rows is formatted, the rest when it is paged to
+            self.preview_grid.show_frame(self.data)
             
             # Show information about the data
-            info_text = f"\n\nData Info:\n"
-            info_text += f"Rows: {len(self.data)}\n"
+            info_text = "Data Info:\n"
+            if max_rows and len(self.data) == max_rows:
+                info_text += f"Rows: {len(self.data)} (limited by Max Rows)\n"
+            else:
+                info_text += f"Rows: {len(self.data)}\n"
             info_text += f"Columns: {len(self.data.columns)}\n"
-            info_text += f"Column Names: {list(self.data.columns)}\n"
+            info_text += f"Column Names: {list(self.data.columns)}"
             
-            self.preview_text.insert(tk.END, info_text)
+            self.preview_info_var.set(info_text)
+            counters["rows"] = min(len(self.data), PREVIEW_PAGE_ROWS)
+        
+        # Switch to the preview tab
+        self.notebook.select(0)
+        
+        self.status_var.set("Data loaded successfully")
+    
+    def convert_file(self, watched=False):
+        """
+        Convert the file to LaTeX
+        A conversion repeated by the watch also updates the .tex file last saved from this input.
+        """
+        file_path = self.file_path_var.get()
+        file_type = self.file_type_var.get()
+        member = self.member_var.get() or None
+        max_rows = self.get_max_rows()
+        style = self.table_style_var.get()
+        caption = self.get_caption()
+        label = self.label_var.get()
+        format_jobs = self.get_format_jobs()
+        
+        if not file_path:
+            messagebox.showwarning("No File", "Please select a file first.")
+            return
+        
+        try:
+            selection = self.get_selection()
+            text_options = self.get_text_options()
+            summary = self.get_summary_options()
+            group_names = self.get_group_names()
+        except ValueError as e:
+            messagebox.showerror("Invalid Options", f"Invalid read options: {str(e)}")
+            return
+        
+        def work():
+            # Reuse the formatted cells if only the caption or label changed since the last conversion
+            key = self.cache.file_key(file_path, file_type, member, selection, text_options) + (max_rows, style, summary, group_names)
+            tabular = self.tabular_cache.lookup(key)
+            data = None
+            if tabular is None and summary is not None:
+                # Statistics cover every row, Max Rows only limits the rows of the summary table
+                table = summarize_file(file_path, file_type, member=member, options=summary,
+                                       progress=self.report_progress, selection=selection, text_options=text_options)
+                # The column groups name the course schedule's columns, not statistics
+                tabular = format_tabular(table, style, max_rows, group_names=None)
+                self.tabular_cache.put(key, tabular)
+            elif tabular is None:
+                # The cache makes this instant for a file that was already previewed or converted
+                data = self.cache.load(file_path, file_type, max_rows=max_rows, member=member,
+                                       progress=self.report_progress, selection=selection, text_options=text_options)
+                tabular = format_tabular(data, style, max_rows, format_jobs, group_names)
+                self.tabular_cache.put(key, tabular)
+            if self.cancel_event.is_set():
+                raise ConversionCancelled()
+            return data, tabular
+        
+        def on_success(result):
+            data, self.tabular = result
+            if data is not None:
+                self.data = data
+            self.tabular_style = style
+            self.refresh_latex()
             
-            # Switch to the preview tab
-            self.notebook.select(0)
+            # Switch to the LaTeX output tab
+            self.notebook.select(1)
             
-            self.status_var.set("Data loaded successfully")
-    
-    def convert_file(self):
-        """Convert the file to LaTeX"""
-        if self.data is None:
-            file_path = self.file_path_var.get()
-            if not file_path:
-                messagebox.showwarning("No File", "Please select a file first.")
-                return
+            self.status_var.set("Conversion to LaTeX completed")
             
-            self.data = self.load_file(file_path)
-            if self.data is None:
-                return
+            if watched and self.saved_latex and self.saved_latex[0] == file_path:
+                self.write_latex(self.saved_latex[1])
+                self.status_var.set(f"LaTeX updated in: {os.path.basename(self.saved_latex[1])}")
         
-        # Convert to LaTeX
-        self.latex_code = self.convert_to_latex(self.data)
-        
-        # Display the LaTeX code
-        self.latex_text.delete(1.0, tk.END)
-        self.latex_text.insert(tk.END, self.latex_code)
+        self.watch_action = functools.partial(self.convert_file, watched=True)
+        self.start_job("Converting...", work, on_success, "Conversion Error", "Failed to convert to LaTeX")
+    
+    def refresh_latex(self):
+        """Rebuild the LaTeX code around the last formatted tabular with the current caption and label"""
+        if self.tabular is None:
+            return
         
-        # Switch to the LaTeX output tab
-        self.notebook.select(1)
+        self.latex_code = wrap_tabular(self.tabular, self.tabular_style, self.get_caption(), self.label_var.get())
         
-        self.status_var.set("Conversion to LaTeX completed")
+        # Display the LaTeX code, only the lines in view are put into the Text widget
+        with self.stats.stage("display") as counters:
+            self.latex_view.set_text(self.latex_code)
+            counters["bytes_out"] = len(self.latex_code)
     
     def save_latex(self):
         """Save the LaTeX code to a file"""
@@ -589,17 +3213,1115 @@ class FileToLatexConverter:
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    f.write(self.latex_code)
+                self.write_latex(file_path)
+                self.saved_latex = (input_file, file_path)
                 
                 self.status_var.set(f"LaTeX saved to: {os.path.basename(file_path)}")
                 messagebox.showinfo("Save Successful", f"LaTeX code saved to {file_path}")
             
             except Exception as e:
                 messagebox.showerror("Save Error", f"Failed to save file: {str(e)}")
+    
+    def copy_latex(self):
+        """Copy all of the LaTeX output to the clipboard, including an exported file shown from disk"""
+        if not len(self.latex_view.buffer):
+            messagebox.showwarning("No LaTeX", "Please convert a file to LaTeX first.")
+            return
+        
+        self.latex_view.copy_all()
+        self.status_var.set("LaTeX copied to the clipboard")
+    
+    def write_latex(self, file_path):
+        """Write the LaTeX code to file_path"""
+        self.latex_view.release(file_path)
+        with self.stats.stage("write") as counters:
+            with open(file_path, 'w') as f:
+                f.write(self.latex_code)
+            counters["bytes_out"] = len(self.latex_code)
+        self.refresh_diagnostics()
+    
+    def export_longtable(self):
+        """Stream the selected file into a longtable .tex file without loading it into memory"""
+        input_file = self.file_path_var.get()
+        if not input_file:
+            messagebox.showwarning("No File", "Please select a file first.")
+            return
+        
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".tex",
+            filetypes=[("LaTeX Files", "*.tex"), ("All Files", "*.*")],
+            initialfile=os.path.splitext(os.path.basename(input_file))[0] + "_table.tex"
+        )
+        if not output_path:
+            return
+        
+        self.write_longtable(input_file, output_path)
+    
+    def write_longtable(self, input_file, output_path):
+        """Stream input_file into a longtable at output_path with the current options"""
+        file_type = self.file_type_var.get()
+        member = self.member_var.get() or None
+        max_rows = self.get_max_rows()
+        style = self.table_style_var.get()
+        caption = self.get_caption()
+        label = self.label_var.get()
+        try:
+            selection = self.get_selection()
+            text_options = self.get_text_options()
+            group_names = self.get_group_names()
+        except ValueError as e:
+            messagebox.showerror("Invalid Options", f"Invalid read options: {str(e)}")
+            return
+        
+        def work():
+            return stream_to_latex(input_file, output_path, file_type, member=member, style=style, caption=caption,
+                                   label=label, max_rows=max_rows, progress=self.report_progress, selection=selection,
+                                   text_options=text_options, group_names=group_names)
+        
+        def on_success(rows_written):
+            # Show the exported file, paged in from disk; the previous conversion no longer matches the view
+            self.tabular = None
+            self.latex_code = ""
+            with self.stats.stage("display"):
+                self.latex_view.set_buffer(LineBuffer.from_file(output_path))
+            self.notebook.select(1)
+            
+            self.status_var.set(f"Longtable with {rows_written:,} rows saved to: {os.path.basename(output_path)}")
+        
+        # The output file may be the one on display, which has to be unmapped before it is replaced
+        self.latex_view.release(output_path)
+        self.watch_action = functools.partial(self.write_longtable, input_file, output_path)
+        self.start_job("Exporting longtable...", work, on_success, "Export Error", "Failed to export longtable")
+    
+    def toggle_watch(self):
+        """Start or stop polling the selected file for changes"""
+        if self.watch_after is not None:
+            self.root.after_cancel(self.watch_after)
+            self.watch_after = None
+        self.watcher = None
+        if self.watch_var.get():
+            self.poll_watch()
+    
+    def poll_watch(self):
+        """Check the selected file and repeat the last task once a change has settled"""
+        if not self.watch_var.get():
+            self.watch_after = None
+            return
+        self.watch_after = self.root.after(int(WATCH_INTERVAL * 1000), self.poll_watch)
+        
+        file_path = self.file_path_var.get()
+        if self.watcher is None or self.watcher.paths != [file_path]:
+            # A newly selected file starts over, its first task is run by hand
+            if self.watcher is not None:
+                self.watch_action = None
+            self.watcher = FileWatcher([file_path])
+            self.watched_digest = None
+            return
+        
+        # Changes found while a task runs are picked up by a later poll
+        if self.watch_action is None or (self.job is not None and not self.job.done()):
+            return
+        if self.watcher.poll():
+            self.refresh_changed(file_path)
+    
+    def refresh_changed(self, file_path):
+        """Repeat the last task on the changed file, unless its contents are the same as before"""
+        def work():
+            return content_digest(file_path)
+        
+        def on_success(digest):
+            if digest == self.watched_digest:
+                self.status_var.set(f"{os.path.basename(file_path)} was touched but its contents are unchanged")
+                return
+            self.watched_digest = digest
+            self.watch_action()
+        
+        self.start_job("Checking changed file...", work, on_success, "Watch Error", "Failed to read the changed file")
+    
+    def export_bundle(self):
+        """Convert every data file in the selected archive, or in a chosen directory, into one LaTeX document"""
+        source = self.file_path_var.get()
+        if not source or not (os.path.isdir(source) or self.get_archive_type(source)):
+            source = filedialog.askdirectory(title="Select a Directory of Data Files")
+            if not source:
+                return
+        
+        name = os.path.basename(os.path.normpath(source))
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".tex",
+            filetypes=[("LaTeX Files", "*.tex"), ("All Files", "*.*")],
+            initialfile=os.path.splitext(name[:-len(".gz")] if name.endswith(".tar.gz") else name)[0] + "_tables.tex"
+        )
+        if not output_path:
+            return
+        
+        # Members are typed by their own extensions, only the archive type is taken from the options
+        file_type = self.file_type_var.get() if self.file_type_var.get() in ["tar", "zip"] else "auto"
+        max_rows = self.get_max_rows()
+        style = self.table_style_var.get()
+        try:
+            text_options = self.get_text_options()
+            group_names = self.get_group_names()
+        except ValueError as e:
+            messagebox.showerror("Invalid Options", f"Invalid read options: {str(e)}")
+            return
+        
+        def work():
+            return convert_bundle(source, output_path, file_type, style=style, max_rows=max_rows,
+                                  progress=self.report_progress, text_options=text_options, group_names=group_names)
+        
+        def on_success(errors):
+            self.tabular = None
+            self.latex_code = ""
+            with self.stats.stage("display"):
+                self.latex_view.set_buffer(LineBuffer.from_file(output_path))
+            self.notebook.select(1)
+            
+            status = f"Bundle saved to: {os.path.basename(output_path)}"
+            self.status_var.set(status + (f", {len(errors)} files failed" if errors else ""))
+            if errors:
+                messagebox.showwarning("Some Files Failed", "\n".join(f"{member}: {error}" for member, error in errors))
+        
+        self.latex_view.release(output_path)
+        self.start_job("Exporting bundle...", work, on_success, "Export Error", "Failed to export bundle",
+                       progress_unit="files converted")
+
+
+def output_paths_for(input_paths, output_dir=None, suffix="_table.tex"):
+    """
+    Return the .tex path for each input file, next to it unless an output directory is given
+    Inputs that would share an output name keep their extension in it (data.csv and data.h5), then
+    their directory relative to the other inputs of that name (a/data.csv and b/data.csv).
+    Raises ValueError if two inputs would still be written to the same file.
+    """
+    def output_path(input_path, name):
+        return os.path.join(output_dir or os.path.dirname(input_path), name + suffix)
+    
+    def clashes(names):
+        groups = {}
+        for path, name in names.items():
+            groups.setdefault(output_path(path, name), []).append(path)
+        return [paths for paths in groups.values() if len(paths) > 1]
+    
+    names = {}
+    for path in input_paths:
+        name = os.path.basename(path)
+        names[path] = os.path.splitext(name[:-len(".gz")] if name.endswith(".tar.gz") else name)[0]
+    
+    for paths in clashes(names):
+        for path in paths:
+            names[path] = os.path.basename(path).replace(".", "_")
+    
+    for paths in clashes(names):
+        parents = {path: os.path.dirname(os.path.abspath(path)) for path in paths}
+        common = os.path.commonpath(list(parents.values()))
+        for path in paths:
+            prefix = os.path.relpath(parents[path], common)
+            if prefix != os.curdir:
+                names[path] = prefix.replace(os.sep, "_") + "_" + names[path]
+    
+    for paths in clashes(names):
+        raise ValueError(f"{' and '.join(paths)} would be written to the same file "
+                         f"{output_path(paths[0], names[paths[0]])}")
+    return {path: output_path(path, name) for path, name in names.items()}
+
+
+def content_digest(path, block_size=1024 ** 2):
+    """SHA-256 of a file's contents, or of the names and contents of all files in a directory"""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for dir_path, dir_names, names in os.walk(path):
+            dir_names.sort()
+            for name in sorted(names):
+                file_path = os.path.join(dir_path, name)
+                digest.update(os.path.relpath(file_path, path).replace(os.sep, "/").encode() + b"\0")
+                digest.update(content_digest(file_path, block_size).encode())
+        return digest.hexdigest()
+    
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Bumped when the manifest layout changes; manifests of another version are ignored
+MANIFEST_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def converter_version():
+    """
+    Hash of this module's code, recorded with every manifest entry
+    Any change to the converter may change its output, so outputs built by
+    another version are rebuilt.
+    """
+    return content_digest(__file__)
+
+
+class BuildManifest:
+    """
+    Record of the inputs converted by earlier runs, to skip those that haven't changed
+    Each input is stored with the hash of its contents, the conversion options,
+    the converter version and its output. Paths are relative to the manifest, so a manifest checked
+    in next to a paper stays valid in another checkout. Contents are only
+    re-hashed when a file's size or modification time changed. Without a path
+    the manifest is only kept in memory, e.g. between the rounds of a watch.
+    """
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.base_dir = os.path.dirname(os.path.abspath(path)) if path else os.getcwd()
+        self.entries = {}
+        
+        if path and os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.entries = manifest["entries"]
+    
+    def _relative(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base_dir).replace(os.sep, "/")
+    
+    @staticmethod
+    def normalize_options(options):
+        """Conversion options as plain JSON values, leaving out those that don't change the output"""
+        options = {
+            name: value._asdict() if hasattr(value, "_asdict") else value
+            for name, value in options.items() if name not in ["cache_dir", "format_jobs"]
+        }
+        return json.loads(json.dumps(options))
+    
+    def fingerprint(self, input_path):
+        """
+        Size, mtime and content hash of an input
+        The hash is taken from the manifest if the size and mtime are unchanged.
+        They are read before hashing, so a file changed meanwhile is hashed again next time.
+        """
+        stat = os.stat(input_path) if os.path.isfile(input_path) else None
+        fingerprint = {"size": stat.st_size if stat else None, "mtime_ns": stat.st_mtime_ns if stat else None}
+        
+        entry = self.entries.get(self._relative(input_path))
+        if stat and entry and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            fingerprint["sha256"] = entry["sha256"]
+        else:
+            fingerprint["sha256"] = content_digest(input_path)
+        return fingerprint
+    
+    def is_current(self, input_path, output_path, options, fingerprint):
+        """Whether output_path was built from these input contents with these options by this converter and still exists"""
+        entry = self.entries.get(self._relative(input_path))
+        return (
+            entry is not None
+            and entry["sha256"] == fingerprint["sha256"]
+            and entry["options"] == self.normalize_options(options)
+            and entry.get("converter") == converter_version()
+            and entry["output"] == self._relative(output_path)
+            and os.path.exists(output_path)
+        )
+    
+    def record(self, input_path, output_path, options, fingerprint):
+        """Record a successful conversion of an input with this fingerprint"""
+        self.entries[self._relative(input_path)] = dict(
+            fingerprint,
+            options=self.normalize_options(options),
+            converter=converter_version(),
+            output=self._relative(output_path)
+        )
+    
+    def forget(self, input_path):
+        """Drop an input, so it is converted again on the next run"""
+        self.entries.pop(self._relative(input_path), None)
+    
+    def save(self):
+        """Write the manifest, replacing the old one only once the new one is complete"""
+        if not self.path:
+            return
+        
+        partial_path = self.path + ".part"
+        with open(partial_path, 'w') as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(partial_path, self.path)
+
+
+# Seconds between checks for changed inputs, and how long a changed input must stay unchanged
+WATCH_INTERVAL = 0.5
+WATCH_DEBOUNCE = 1.0
+
+
+def file_signature(path):
+    """Size and mtime of a file, or of every file in a directory; None if it doesn't exist"""
+    try:
+        if os.path.isdir(path):
+            return tuple(
+                (os.path.join(dir_path, name), stat.st_size, stat.st_mtime_ns)
+                for dir_path, dir_names, names in sorted(os.walk(path))
+                for name in sorted(names)
+                for stat in [os.stat(os.path.join(dir_path, name))]
+            )
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    except OSError:
+        return None
+
+
+class FileWatcher:
+    """
+    Polls files and directories for changes of size and mtime
+    A change is only reported once the path has stayed the same for debounce
+    seconds, so a burst of writes from an export leads to one reconversion.
+    Polling an unchanged path costs one stat call. A path that disappears,
+    e.g. while an editor replaces it, is reported once it is back.
+    """
+    
+    def __init__(self, paths, debounce=WATCH_DEBOUNCE):
+        self.paths = list(paths)
+        self.debounce = debounce
+        self.signatures = {path: file_signature(path) for path in self.paths}
+        self.pending = {}
+    
+    def update(self, paths):
+        """
+        Watch paths from now on, e.g. a new expansion of the input patterns
+        Paths that weren't watched before are reported by poll once they have
+        settled, paths that are no longer given are forgotten.
+        """
+        self.paths = list(paths)
+        for path in self.paths:
+            self.signatures.setdefault(path, None)
+        for path in set(self.signatures).difference(self.paths):
+            del self.signatures[path]
+            self.pending.pop(path, None)
+    
+    def poll(self, now=None):
+        """Return the paths that changed and have since settled"""
+        now = time.monotonic() if now is None else now
+        changed = []
+        for path in self.paths:
+            signature = file_signature(path)
+            if signature is None or signature == self.signatures[path]:
+                self.pending.pop(path, None)
+                continue
+            
+            # Restart the debounce whenever the path changes again
+            if path not in self.pending or self.pending[path][0] != signature:
+                self.pending[path] = (signature, now)
+            elif now - self.pending[path][1] >= self.debounce:
+                del self.pending[path]
+                self.signatures[path] = signature
+                changed.append(path)
+        return changed
+
+
+def convert_path(input_path, output_path, file_type="auto", member=None, style="booktabs",
+                 caption=None, label=None, max_rows=None, longtable=False, cache_dir=None, selection=None,
+                 text_options=None, summary=None, format_jobs=None, group_names=DEFAULT_GROUP_NAMES, profile_path=None):
+    """
+    Convert one input file to a .tex file
+    With summary, a SummaryOptions, the table holds column statistics of all rows instead of the rows.
+    format_jobs is the number of processes formatting a large table.
+    Runs in a worker process, so errors are returned instead of raised.
+    Returns (input_path, output_path, seconds, error, stats report); with
+    profile_path, the conversion is profiled and the profile saved there.
+    """
+    start = time.perf_counter()
+    error = None
+    with collect_stats(profile=profile_path is not None) as stats:
+        try:
+            if longtable:
+                stream_to_latex(input_path, output_path, file_type, member=member, style=style,
+                                caption=caption, label=label, max_rows=max_rows, selection=selection,
+                                text_options=text_options, group_names=group_names)
+            else:
+                if summary is not None:
+                    data = summarize_file(input_path, file_type, member=member, options=summary, selection=selection,
+                                          text_options=text_options)
+                    # The column groups name the course schedule's columns, not statistics
+                    group_names = None
+                elif cache_dir:
+                    # Nothing is kept in memory between files, parsed data goes straight to the on-disk cache
+                    data = DataCache(max_bytes=0, spill_dir=cache_dir).load(input_path, file_type, max_rows=max_rows,
+                                                                            member=member, selection=selection,
+                                                                            text_options=text_options)
+                else:
+                    data = load_table(input_path, file_type, max_rows=max_rows, member=member, selection=selection,
+                                      text_options=text_options)
+                latex_code = dataframe_to_latex(data, style=style, caption=caption, label=label, max_rows=max_rows,
+                                                jobs=format_jobs, group_names=group_names)
+                
+                with stage("write") as counters:
+                    with open(output_path, 'w') as f:
+                        f.write(latex_code)
+                    counters["bytes_out"] = len(latex_code)
+        
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    
+    if profile_path and stats.profile is not None:
+        stats.profile.dump_stats(profile_path)
+    
+    return input_path, output_path, time.perf_counter() - start, error, stats.report()
+
+
+def expand_inputs(patterns, directories=False):
+    """Expand input paths and glob patterns into a list of files, and of directories if directories is set"""
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        paths.extend(matches if matches else [pattern])
+    
+    # Keep the first occurrence of each file
+    return list(dict.fromkeys(os.path.normpath(path) if directories else path for path in paths
+                              if directories or not os.path.isdir(path)))
+
+
+def run_bundles(args, manifest=None, only=None):
+    """
+    Convert each archive or directory from the command line into one document of tables
+    With only, just those of the inputs are converted.
+    """
+    inputs = expand_inputs(args.inputs, directories=True)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    
+    options = {
+        "file_type": args.file_type,
+        "style": args.style,
+        "max_rows": args.max_rows or None,
+        "layout": args.layout,
+        "text_options": TextOptions.from_strings(args.engine, args.usecols or "", args.dtype or ""),
+        "group_names": parse_group_names(args.group_names),
+    }
+    if manifest is None and args.manifest:
+        manifest = BuildManifest(args.manifest)
+    
+    try:
+        output_paths = output_paths_for(inputs, args.output_dir, suffix="_tables.tex")
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    failures = 0
+    try:
+        for path in inputs if only is None else [path for path in inputs if path in only]:
+            # The include layout gets a directory named like the document would be
+            output_path = output_paths[path] if args.layout == "document" else os.path.splitext(output_paths[path])[0]
+            
+            start = time.perf_counter()
+            try:
+                if manifest is not None:
+                    fingerprint = manifest.fingerprint(path)
+                    if not args.force and manifest.is_current(path, output_path, options, fingerprint):
+                        manifest.record(path, output_path, options, fingerprint)
+                        print(f"skip   {path} (up to date)")
+                        continue
+                
+                errors = convert_bundle(path, output_path, jobs=args.jobs, **options)
+            except Exception as e:
+                errors = [(None, f"{type(e).__name__}: {e}")]
+            
+            for member, error in errors:
+                print(f"FAILED {path}{': ' + member if member else ''}: {error}", file=sys.stderr)
+            if errors:
+                failures += 1
+                if manifest is not None:
+                    manifest.forget(path)
+                continue
+            
+            if manifest is not None:
+                manifest.record(path, output_path, options, fingerprint)
+            print(f"ok     {path} -> {output_path} ({time.perf_counter() - start:.3f}s)")
+    finally:
+        if manifest is not None:
+            manifest.save()
+    
+    return 1 if failures else 0
+
+
+def run_batch(args, manifest=None, only=None):
+    """
+    Convert every input from the command line in parallel and report per-file results
+    With only, just those of the inputs are converted; output names still
+    account for all of them. manifest overrides the one named by --manifest.
+    """
+    if args.bundle:
+        return run_bundles(args, manifest, only)
+    
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print("No input files found", file=sys.stderr)
+        return 1
+    
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    
+    options = {
+        "file_type": args.file_type,
+        "member": args.member,
+        "style": args.style,
+        "caption": None if args.no_caption else args.caption,
+        "label": args.label,
+        "max_rows": args.max_rows or None,
+        "longtable": args.longtable,
+        "cache_dir": args.cache_dir,
+        "selection": HDF5Selection.from_strings(args.dataset or "", args.rows or "", args.columns or ""),
+        "text_options": TextOptions.from_strings(args.engine, args.usecols or "", args.dtype or ""),
+        "summary": SummaryOptions.from_strings(args.group_by or "", args.stats_list or "") if args.summary else None,
+        "format_jobs": args.format_jobs,
+        "group_names": parse_group_names(args.group_names),
+    }
+    
+    try:
+        output_paths = output_paths_for(inputs, args.output_dir)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if only is not None:
+        inputs = [path for path in inputs if path in only]
+    
+    def profile_path(path):
+        if not args.profile:
+            return None
+        return os.path.join(args.profile, os.path.splitext(os.path.basename(output_paths[path]))[0] + ".prof")
+    
+    failures = 0
+    start = time.perf_counter()
+    
+    # With a manifest, only inputs whose contents or options changed since the last run are converted
+    if manifest is None and args.manifest:
+        manifest = BuildManifest(args.manifest)
+    fingerprints = {}
+    pending = []
+    for path in inputs:
+        if manifest is not None:
+            try:
+                fingerprints[path] = manifest.fingerprint(path)
+            except OSError:
+                # Missing or unreadable, the conversion reports it
+                fingerprints[path] = None
+            
+            if fingerprints[path] and not args.force and manifest.is_current(path, output_paths[path], options,
+                                                                             fingerprints[path]):
+                manifest.record(path, output_paths[path], options, fingerprints[path])
+                print(f"skip   {path} (up to date)")
+                continue
+        pending.append(path)
+    
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = {
+                executor.submit(convert_path, path, output_paths[path], profile_path=profile_path(path), **options): path
+                for path in pending
+            }
+            
+            for future in as_completed(futures):
+                try:
+                    input_path, output_path, elapsed, error, report = future.result()
+                except Exception as e:
+                    # The worker itself died, e.g. out of memory
+                    input_path, output_path, elapsed, error, report = futures[future], None, 0.0, f"{type(e).__name__}: {e}", {}
+                
+                if error:
+                    failures += 1
+                    print(f"FAILED {input_path} ({elapsed:.3f}s): {error}", file=sys.stderr)
+                else:
+                    print(f"ok     {input_path} -> {output_path} ({elapsed:.3f}s)")
+                
+                if manifest is not None:
+                    if error or fingerprints[input_path] is None:
+                        manifest.forget(input_path)
+                    else:
+                        manifest.record(input_path, output_path, options, fingerprints[input_path])
+                
+                if args.stats and report:
+                    print(format_stats(report) + "\n")
+    finally:
+        if manifest is not None:
+            manifest.save()
+    
+    skipped = len(inputs) - len(pending)
+    print(f"Converted {len(pending) - failures}/{len(pending)} files in {time.perf_counter() - start:.3f}s"
+          + (f", {skipped} up to date" if skipped else ""))
+    return 1 if failures else 0
+
+
+def watch_inputs(args, interval=WATCH_INTERVAL):
+    """
+    Convert the inputs, then convert each one again whenever it changes, until interrupted
+    Changes are found by polling size and mtime. Inputs that were only touched
+    are skipped by their content hash, without a --manifest one is kept in memory.
+    The patterns are expanded again on every poll, so new matching files are
+    converted as well; only the new and changed inputs are converted each time.
+    """
+    inputs = expand_inputs(args.inputs, directories=args.bundle)
+    if not inputs:
+        print("No input files found", file=sys.stderr)
+        return 1
+    
+    manifest = BuildManifest(args.manifest)
+    run_batch(args, manifest)
+    
+    # Only the first round is forced, later ones convert what changed
+    args = argparse.Namespace(**dict(vars(args), force=False))
+    watcher = FileWatcher(inputs, debounce=args.debounce)
+    print(f"Watching {len(inputs)} inputs for changes, press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(interval)
+            watcher.update(expand_inputs(args.inputs, directories=args.bundle))
+            changed = watcher.poll()
+            if changed:
+                run_batch(args, manifest, only=changed)
+    except KeyboardInterrupt:
+        return 0
+
+
+# Address the conversion service listens on when --serve is only given a port
+SERVICE_HOST = "127.0.0.1"
+
+# Requests waiting for a worker beyond which the service answers 503
+SERVICE_QUEUE_SIZE = 16
+
+# Memory for parsed inputs in each service worker
+SERVICE_CACHE_BYTES = 256 * 1024 ** 2
+
+# Seconds an idle keep-alive connection stays open
+SERVICE_IDLE_TIMEOUT = 60
+
+# Largest upload the service accepts
+SERVICE_MAX_UPLOAD_BYTES = 1024 ** 3
+
+# Query parameters of a /convert request, named like the command line options
+SERVICE_PARAMS = {"path", "name", "file-type", "member", "dataset", "rows", "columns", "usecols", "dtype", "engine",
+                  "style", "caption", "no-caption", "label", "max-rows", "group-names", "summary", "group-by",
+                  "summary-stats"}
+
+
+def _flag(value):
+    """A query parameter given without a value, or with a true one"""
+    return value.lower() not in ["0", "false", "no", "off"]
 
 
-def main():
+def service_options(params):
+    """
+    Conversion options from the query parameters of a /convert request
+    The names and values are those of the command line options, e.g.
+    style=standard&max-rows=0&usecols=name,price. Returns keyword arguments
+    for _service_convert; raises ValueError for unknown names or bad values.
+    """
+    unknown = set(params) - SERVICE_PARAMS
+    if unknown:
+        raise ValueError(f"unknown options: {', '.join(sorted(unknown))}")
+    
+    file_type = params.get("file-type", "auto")
+    if file_type not in FILE_TYPES:
+        raise ValueError(f"file-type must be one of {', '.join(FILE_TYPES)}")
+    
+    try:
+        max_rows = int(params.get("max-rows", "50"))
+    except ValueError:
+        raise ValueError("max-rows must be a number") from None
+    
+    summary = None
+    if _flag(params.get("summary", "0")):
+        summary = SummaryOptions.from_strings(params.get("group-by", ""), params.get("summary-stats", ""))
+    
+    return {
+        "file_type": file_type,
+        "member": params.get("member") or None,
+        "style": get_style(params.get("style", "booktabs")).name,
+        "caption": None if _flag(params.get("no-caption", "0")) else params.get("caption") or None,
+        "label": params.get("label", "tab:data"),
+        "max_rows": max_rows or None,
+        "selection": HDF5Selection.from_strings(params.get("dataset", ""), params.get("rows", ""),
+                                                params.get("columns", "")),
+        "text_options": TextOptions.from_strings(params.get("engine", "c"), params.get("usecols", ""),
+                                                 params.get("dtype", "")),
+        "summary": summary,
+        "group_names": parse_group_names(params.get("group-names", ",".join(DEFAULT_GROUP_NAMES))),
+    }
+
+
+# Parsed inputs kept by a service worker process between requests, set up by _init_service_worker
+_service_cache = None
+
+
+def _init_service_worker(cache_bytes, spill_dir):
+    global _service_cache
+    _service_cache = DataCache(max_bytes=cache_bytes, spill_dir=spill_dir, shared=True)
+
+
+def _service_convert(input_path, file_type="auto", member=None, style="booktabs", caption=None, label=None,
+                     max_rows=None, selection=None, text_options=None, summary=None, group_names=DEFAULT_GROUP_NAMES):
+    """
+    Convert one file in a service worker and return (LaTeX code, stats report)
+    Inputs are parsed through the worker's cache, which shares what it parses
+    with the other workers, so a file that is requested again unchanged is
+    only formatted, whichever worker gets it.
+    """
+    with collect_stats() as stats:
+        if summary is not None:
+            data = summarize_file(input_path, file_type, member=member, options=summary, selection=selection,
+                                  text_options=text_options)
+            group_names = None
+        else:
+            data = _service_cache.load(input_path, file_type, max_rows=max_rows, member=member, selection=selection,
+                                       text_options=text_options)
+        latex_code = dataframe_to_latex(data, style=style, caption=caption, label=label, max_rows=max_rows,
+                                        group_names=group_names)
+    return latex_code, stats.report()
+
+
+class ServiceError(Exception):
+    """A request the conversion service answers with an error status"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ConversionService:
+    """
+    Converts files to LaTeX for HTTP clients on a pool of worker processes
+    GET or POST /convert?path=FILE converts a local file; POST
+    /convert?name=FILE with the file as the request body converts an upload.
+    The other query parameters are the conversion options, see
+    service_options. At most jobs + queue_size requests are handled at once,
+    more are turned away with 503. Parsed inputs are kept in memory by each
+    worker and as Parquet files in a cache directory all workers share, and an
+    upload is stored under a name derived from its contents, so the same file
+    sent again is served from the cache by any worker.
+    
+    With root, path= only reaches files inside that directory, relative paths
+    are taken from it. local_paths False turns path= away altogether, for
+    services other machines can reach.
+    """
+    
+    def __init__(self, jobs=None, queue_size=SERVICE_QUEUE_SIZE, cache_bytes=SERVICE_CACHE_BYTES, root=None,
+                 local_paths=True):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache_bytes = cache_bytes
+        self.root = os.path.realpath(root) if root is not None else None
+        self.local_paths = local_paths
+        self.slots = threading.BoundedSemaphore(self.jobs + queue_size)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.executor = self._start_pool()
+        self.uploads = {}
+        self._lock = threading.Lock()
+    
+    def _start_pool(self):
+        return ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_service_worker,
+                                   initargs=(self.cache_bytes, os.path.join(self.temp_dir.name, "cache")))
+    
+    def local_path(self, path):
+        """The file a path= request converts; raises ServiceError if the service may not read it"""
+        if not self.local_paths:
+            raise ServiceError(403, "path= is disabled on this address, POST the file with name=FILE instead")
+        if self.root is None:
+            return path
+        
+        # Resolved first, so neither .. nor a symbolic link leads out of the root
+        full_path = os.path.realpath(os.path.join(self.root, path))
+        try:
+            inside = os.path.commonpath([full_path, self.root]) == self.root
+        except ValueError:
+            # On another drive
+            inside = False
+        if not inside:
+            raise ServiceError(403, "path must be inside the directory the service was started with")
+        return full_path
+    
+    def close(self):
+        """Stop the workers and remove stored uploads"""
+        self.executor.shutdown(cancel_futures=True)
+        self.temp_dir.cleanup()
+    
+    def store_upload(self, stream, length, name):
+        """
+        Save an upload of length bytes and return its path
+        The path depends only on the contents and name, and the mtime is fixed,
+        so the worker caches see the same file each time it is sent.
+        """
+        name = os.path.basename(name.replace("\\", "/"))
+        if name in ["", ".", ".."]:
+            raise ServiceError(400, "name must be a file name, e.g. name=data.csv")
+        if length > SERVICE_MAX_UPLOAD_BYTES:
+            raise ServiceError(413, f"uploads are limited to {SERVICE_MAX_UPLOAD_BYTES:,} bytes")
+        
+        digest = hashlib.sha256()
+        fd, part_path = tempfile.mkstemp(dir=self.temp_dir.name, suffix=".part")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                remaining = length
+                while remaining:
+                    block = stream.read(min(remaining, 1024 ** 2))
+                    if not block:
+                        raise ServiceError(400, "the upload ended before Content-Length bytes")
+                    digest.update(block)
+                    f.write(block)
+                    remaining -= len(block)
+            
+            path = os.path.join(self.temp_dir.name, digest.hexdigest()[:32], name)
+            with self._lock:
+                if not self.uploads.get(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(part_path, path)
+                    os.utime(path, ns=(0, 0))
+                self.uploads[path] = self.uploads.get(path, 0) + 1
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        return path
+    
+    def release_upload(self, path):
+        """Remove a stored upload once no request uses it"""
+        with self._lock:
+            self.uploads[path] -= 1
+            if not self.uploads[path]:
+                del self.uploads[path]
+                os.remove(path)
+                os.rmdir(os.path.dirname(path))
+    
+    def convert(self, input_path, options):
+        """Convert a file on the pool and return (LaTeX code, stats report), waiting for a free worker"""
+        executor = self.executor
+        try:
+            return executor.submit(_service_convert, input_path, **options).result()
+        except BrokenProcessPool:
+            # A worker died, e.g. out of memory; later requests get a new pool
+            with self._lock:
+                if self.executor is executor:
+                    self.executor = self._start_pool()
+            raise ServiceError(500, "the worker converting this file stopped unexpectedly")
+        except FileNotFoundError as e:
+            raise ServiceError(404, str(e))
+        except Exception as e:
+            raise ServiceError(422, f"{type(e).__name__}: {e}")
+    
+    def handle(self, request):
+        """Answer one request of a BaseHTTPRequestHandler"""
+        url = urlsplit(request.path)
+        if url.path == "/health":
+            return self.respond(request, 200, "ok\n")
+        if url.path != "/convert" or request.command not in ["GET", "POST"]:
+            return self.respond(request, 404, f"no such endpoint: {request.command} {url.path}\n")
+        
+        # Turned away before the body is read, so the connection can't be reused
+        if not self.slots.acquire(blocking=False):
+            request.close_connection = True
+            return self.respond(request, 503, "too many requests waiting, try again later\n",
+                                {"Retry-After": "1", "Connection": "close"})
+        
+        upload = None
+        try:
+            params = {name: values[-1] for name, values in parse_qs(url.query, keep_blank_values=True).items()}
+            length = int(request.headers.get("Content-Length") or 0)
+            try:
+                if length and "path" in params:
+                    raise ServiceError(400, "send either a path or a file, not both")
+                if length:
+                    upload = self.store_upload(request.rfile, length, params.pop("name", ""))
+                elif "path" not in params:
+                    raise ServiceError(400, "no input: pass path=FILE or POST the file with name=FILE")
+                
+                try:
+                    options = service_options(params)
+                except ValueError as e:
+                    raise ServiceError(400, str(e))
+                
+                start = time.perf_counter()
+                latex_code, report = self.convert(upload or self.local_path(params["path"]), options)
+            except ServiceError as e:
+                if length and upload is None:
+                    # The body wasn't read, the client has to reconnect
+                    request.close_connection = True
+                return self.respond(request, e.status, f"{e}\n")
+            
+            cache = report.get("cache", {})
+            return self.respond(request, 200, latex_code, {
+                "Content-Type": "application/x-tex; charset=utf-8",
+                "X-Conversion-Seconds": f"{time.perf_counter() - start:.3f}",
+                "X-Cache": "hit" if cache.get("hits") else "miss" if cache.get("misses") else "none",
+            })
+        finally:
+            if upload is not None:
+                self.release_upload(upload)
+            self.slots.release()
+    
+    def respond(self, request, status, text, headers=None):
+        """Send a complete response with a Content-Length, which keeps the connection open"""
+        body = text.encode("utf-8")
+        request.send_response(status)
+        headers = dict({"Content-Type": "text/plain; charset=utf-8"}, **(headers or {}))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+def make_service_server(service, host=SERVICE_HOST, port=0):
+    """
+    Bind an HTTP server for a ConversionService, without starting it
+    Each connection is handled on its own thread and kept alive between
+    requests. Port 0 picks a free port, see server.server_address. Run it with
+    serve_forever(), e.g. on a thread, and stop it with shutdown().
+    """
+    # Imported here, http.server adds noticeably to the startup of every other mode
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class ConversionRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        timeout = SERVICE_IDLE_TIMEOUT
+        
+        def do_GET(self):
+            service.handle(self)
+        
+        do_POST = do_GET
+    
+    server = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_address(text):
+    """Parse "HOST:PORT" or "PORT" into (host, port)"""
+    host, _, port = text.rpartition(":")
+    try:
+        return host or SERVICE_HOST, int(port)
+    except ValueError:
+        raise ValueError(f"invalid address {text!r}, expected HOST:PORT or PORT") from None
+
+
+def is_loopback(host):
+    """Whether a server bound to host can only be reached from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # Any other host name may resolve to an outside address
+        return False
+
+
+def serve(args):
+    """
+    Run the conversion service on the --serve address until interrupted
+    Local files can be converted with path= only on a loopback address, or
+    from inside --serve-root.
+    """
+    host, port = parse_address(args.serve)
+    local_paths = args.serve_root is not None or is_loopback(host)
+    service = ConversionService(jobs=args.jobs, queue_size=args.queue_size, root=args.serve_root,
+                                local_paths=local_paths)
+    try:
+        server = make_service_server(service, host, port)
+    except OSError as e:
+        service.close()
+        print(f"Can't listen on {host}:{port}: {e}", file=sys.stderr)
+        return 1
+    
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port}/convert with {service.jobs} workers, press Ctrl+C to stop")
+    if not local_paths:
+        print("path= is disabled on a non-loopback address, pass --serve-root DIR to allow files under DIR")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        server.server_close()
+        service.close()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments; without inputs the GUI is started"""
+    parser = argparse.ArgumentParser(description="Convert CSV, HDF5, text and archive files to LaTeX tables.")
+    parser.add_argument("inputs", nargs="*", help="input files or glob patterns; starts the GUI if none are given")
+    parser.add_argument("-o", "--output-dir", help="directory for the .tex files (default: next to each input)")
+    parser.add_argument("--file-type", default="auto", choices=FILE_TYPES)
+    parser.add_argument("--member", help="archive member to convert (default: the first file)")
+    parser.add_argument("--dataset", help="HDF5 dataset path (default: the first dataset)")
+    parser.add_argument("--rows", help="HDF5/Parquet/Feather/.npy row range to read, e.g. 1000:2000")
+    parser.add_argument("--columns",
+                        help="HDF5/Parquet/Feather/.npy columns to read: names or indices, e.g. year,score or 0:5")
+    parser.add_argument("--usecols", help="CSV/text columns to read: names or indices, e.g. name,price or 0:3")
+    parser.add_argument("--dtype", help="CSV/text column types, e.g. price:float32,count:int32")
+    parser.add_argument("--engine", default="c", choices=["c", "pyarrow"],
+                        help="CSV/text parser; pyarrow is multi-threaded and needs the pyarrow package")
+    parser.add_argument("--style", default="booktabs", choices=list(TABLE_STYLES))
+    parser.add_argument("--caption", help="table caption")
+    parser.add_argument("--no-caption", action="store_true", help="leave out the caption")
+    parser.add_argument("--label", default="tab:data", help="table label")
+    parser.add_argument("--max-rows", type=int, default=50, help="maximum number of rows, 0 for all (default: 50)")
+    parser.add_argument("--group-names", default=",".join(DEFAULT_GROUP_NAMES), metavar="FIRST,SECOND",
+                        help="headings of the two column groups of booktabs tables with four or more data columns, "
+                             "empty for none (default: %(default)s)")
+    parser.add_argument("--longtable", action="store_true",
+                        help="stream rows into a longtable instead of loading the whole file (use with --max-rows 0)")
+    parser.add_argument("--summary", action="store_true",
+                        help="typeset column statistics of all rows instead of the rows, in one pass over the file")
+    parser.add_argument("--group-by", metavar="COLUMN", help="with --summary: one row of statistics per value of COLUMN")
+    parser.add_argument("--summary-stats", dest="stats_list", metavar="LIST",
+                        help=f"with --summary: statistics to compute, e.g. mean,std,p90 (default: {','.join(SUMMARY_STATS)})")
+    parser.add_argument("--bundle", action="store_true",
+                        help="convert every data file in each archive or directory input into one document of tables")
+    parser.add_argument("--layout", default="document", choices=["document", "include"],
+                        help="with --bundle: one standalone document, or one file per table plus a tables.tex to \\input")
+    parser.add_argument("--manifest", metavar="FILE",
+                        help="build manifest: skip inputs whose contents and options match the last run, and record this one")
+    parser.add_argument("--force", action="store_true", help="with --manifest: convert every input anyway")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and convert inputs again when they change, until Ctrl+C")
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE, metavar="SECONDS",
+                        help=f"with --watch: wait until a changed input is unchanged this long (default: {WATCH_DEBOUNCE})")
+    parser.add_argument("--cache-dir", help="keep parsed inputs here as Parquet files to skip parsing on later runs")
+    parser.add_argument("--stats", action="store_true", help="print the time, rows and bytes of each stage per file")
+    parser.add_argument("--profile", metavar="DIR", help="profile each conversion with cProfile and save it in DIR")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--format-jobs", type=int, default=1, metavar="N",
+                        help="processes formatting each large table; best combined with -j 1 (default: 1)")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help=f"run a local HTTP service converting files on -j worker processes (host: {SERVICE_HOST})")
+    parser.add_argument("--queue-size", type=int, default=SERVICE_QUEUE_SIZE, metavar="N",
+                        help=f"with --serve: requests that may wait for a worker (default: {SERVICE_QUEUE_SIZE})")
+    parser.add_argument("--serve-root", metavar="DIR",
+                        help="with --serve: only convert local files under DIR; "
+                             "required for path= requests on a non-loopback address")
+    args = parser.parse_args(argv)
+    if args.summary and (args.longtable or args.bundle):
+        parser.error("--summary can't be combined with --longtable or --bundle")
+    try:
+        parse_group_names(args.group_names)
+    except ValueError as e:
+        parser.error(f"--group-names: {e}")
+    if args.summary:
+        try:
+            parse_summary_stats(args.stats_list or "")
+        except ValueError as e:
+            parser.error(f"--summary-stats: {e}")
+    if args.serve:
+        if args.inputs:
+            parser.error("--serve takes no input files, they are sent with each request")
+        try:
+            parse_address(args.serve)
+        except ValueError as e:
+            parser.error(f"--serve: {e}")
+        if args.serve_root is not None and not os.path.isdir(args.serve_root):
+            parser.error(f"--serve-root: {args.serve_root} is not a directory")
+    elif args.serve_root is not None:
+        parser.error("--serve-root can only be used with --serve")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.serve:
+        sys.exit(serve(args))
+    if args.inputs:
+        sys.exit(watch_inputs(args) if args.watch else run_batch(args))
+    
     root = tk.Tk()
     app = FileToLatexConverter(root)
     root.mainloop()
@@ -0,0 +1,29 @@
+"""Escaping corpus shared by the tests and benchmark.py"""
+
+# Text cells and the LaTeX they must come out as
+ESCAPE_CORPUS = [
+    ("plain text", "plain text"),
+    ("", ""),
+    ("50%", "50\\%"),
+    ("R&D", "R\\&D"),
+    ("$5", "\\$5"),
+    ("#1", "\\#1"),
+    ("snake_case", "snake\\_case"),
+    ("{x}", "\\{x\\}"),
+    ("~/data", "\\textasciitilde{}/data"),
+    ("x^2", "x\\textasciicircum{}2"),
+    ("C:\\temp", "C:\\textbackslash{}temp"),
+    # The backslashes and braces put in by escaping must not be escaped again
+    ("\\&", "\\textbackslash{}\\&"),
+    ("\\{}", "\\textbackslash{}\\{\\}"),
+    ("^~\\", "\\textasciicircum{}\\textasciitilde{}\\textbackslash{}"),
+    ("&%$#_{}~^\\", "\\&\\%\\$\\#\\_\\{\\}\\textasciitilde{}\\textasciicircum{}\\textbackslash{}"),
+    ("naïve café ∑", "naïve café ∑"),
+    ("two\nlines", "two\nlines"),
+]
+
+# Cells with the control characters the column escaper uses internally, which take its per-cell path
+ESCAPE_CONTROL_CORPUS = [
+    ("nul\x00byte", "nul\x00byte"),
+    ("soh\x01_", "soh\x01\\_"),
+]
@@ -0,0 +1,106 @@
+import os
+import tarfile
+import zipfile
+
+import h5py
+import numpy as np
+import pandas as pd
+import pytest
+
+import file_to_latex
+from file_to_latex import convert_bundle, list_archive_members, load_data
+
+FRAME = pd.DataFrame({"name": ["a", "b", "c"], "count": [1, 2, 3], "ratio": [0.5, 1.5, 2.5]})
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Write the same small table as CSV, whitespace separated text and HDF5"""
+    paths = {
+        "t.csv": tmp_path / "t.csv",
+        "t.txt": tmp_path / "t.txt",
+        "t.h5": tmp_path / "t.h5",
+    }
+    FRAME.to_csv(paths["t.csv"], index=False)
+    FRAME.to_csv(paths["t.txt"], index=False, sep=" ")
+    with h5py.File(paths["t.h5"], "w") as f:
+        f.create_dataset("counts", data=np.arange(6).reshape(3, 2))
+    return paths
+
+
+@pytest.fixture(params=["t.tar.gz", "t.zip"])
+def archive(request, tmp_path, inputs):
+    path = tmp_path / request.param
+    if request.param.endswith(".zip"):
+        with zipfile.ZipFile(path, "w") as zip_ref:
+            for name, member in inputs.items():
+                zip_ref.write(member, name)
+    else:
+        with tarfile.open(path, "w:gz") as tar:
+            for name, member in inputs.items():
+                tar.add(member, name)
+    return str(path)
+
+
+def test_members_are_listed_in_order(archive):
+    assert list_archive_members(archive) == ["t.csv", "t.txt", "t.h5"]
+
+
+@pytest.mark.parametrize("member", ["t.csv", "t.txt", "t.h5"])
+def test_member_matches_file(archive, inputs, member):
+    expected = load_data(str(inputs[member]))
+    pd.testing.assert_frame_equal(load_data(archive, member=member), expected)
+
+
+def test_first_member_by_default(archive):
+    pd.testing.assert_frame_equal(load_data(archive), FRAME)
+
+
+def test_max_rows(archive):
+    pd.testing.assert_frame_equal(load_data(archive, member="t.csv", max_rows=2), FRAME.head(2))
+
+
+def test_missing_member(archive):
+    with pytest.raises(ValueError, match="No member named"):
+        load_data(archive, member="missing.csv")
+
+
+def test_rewritten_archive_is_reindexed(tmp_path, inputs):
+    path = str(tmp_path / "t.zip")
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        zip_ref.write(inputs["t.csv"], "first.csv")
+    assert list_archive_members(path) == ["first.csv"]
+    
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        zip_ref.write(inputs["t.csv"], "second.csv")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert list_archive_members(path) == ["second.csv"]
+
+
+convert_bundle_member = file_to_latex._convert_bundle_member
+
+
+def fail_with_lines(path, member, *args):
+    """_convert_bundle_member failing t.txt with a message of several lines"""
+    if member == "t.txt":
+        return None, "ValueError: first line\nsecond line\n\nthird line"
+    return convert_bundle_member(path, member, *args)
+
+
+def test_bundle_errors_stay_in_comments(tmp_path, inputs, monkeypatch):
+    (tmp_path / "bad.csv").write_text("a,b\n1,2\n3,4,5,6\n")
+    
+    # The workers are forked after the patch, so they run it too
+    monkeypatch.setattr(file_to_latex, "_convert_bundle_member", fail_with_lines)
+    output = str(tmp_path / "out" / "bundle.tex")
+    os.makedirs(os.path.dirname(output))
+    errors = convert_bundle(str(tmp_path), output, jobs=1)
+    assert [member for member, _ in errors] == ["bad.csv", "t.txt"]
+    
+    with open(output) as f:
+        latex = f.read()
+    assert "% t.txt: conversion failed: ValueError: first line\n% second line\n% \n% third line\n" in latex
+    assert "% bad.csv: conversion failed: ParserError:" in latex
+    for line in latex.splitlines():
+        assert not line.startswith(("second", "third", "Error", "C error"))
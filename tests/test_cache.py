@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from file_to_latex import DataCache
+
+
+def write_csv(path, values):
+    pd.DataFrame({"x": values}).to_csv(path, index=False)
+    # Make sure the new version gets a new mtime even on coarse clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_spilled_frame_is_read_back(tmp_path):
+    path, spill_dir = str(tmp_path / "data.csv"), str(tmp_path / "spill")
+    write_csv(path, [1, 2, 3])
+    
+    assert DataCache(max_bytes=0, spill_dir=spill_dir).load(path)["x"].tolist() == [1, 2, 3]
+    assert len(os.listdir(spill_dir)) == 1
+    
+    # A new cache, as on the next run, finds the spilled frame
+    cache = DataCache(max_bytes=0, spill_dir=spill_dir)
+    key = cache.file_key(path) + (None,)
+    assert cache.lookup(key)["x"].tolist() == [1, 2, 3]
+
+
+def test_stale_spill_files_are_removed(tmp_path):
+    path, other, spill_dir = str(tmp_path / "data.csv"), str(tmp_path / "other.csv"), str(tmp_path / "spill")
+    write_csv(other, [0])
+    DataCache(max_bytes=0, spill_dir=spill_dir).load(other)
+    
+    for version in range(3):
+        write_csv(path, [version] * 3)
+        cache = DataCache(max_bytes=0, spill_dir=spill_dir)
+        assert cache.load(path, max_rows=2)["x"].tolist() == [version] * 2
+        assert cache.load(path)["x"].tolist() == [version] * 3
+    
+    # The latest version of data.csv with and without a row limit, and other.csv
+    names = os.listdir(spill_dir)
+    assert len(names) == 3
+    assert sum(name.startswith(cache._spill_prefix(cache.file_key(path) + (None,))) for name in names) == 2
+
+
+def test_integer_column_names_are_spilled(tmp_path):
+    path, spill_dir = str(tmp_path / "data.npy"), str(tmp_path / "spill")
+    np.save(path, np.arange(12).reshape(4, 3))
+    
+    expected = DataCache(max_bytes=0, spill_dir=spill_dir).load(path)
+    assert len(os.listdir(spill_dir)) == 1
+    
+    cache = DataCache(max_bytes=0, spill_dir=spill_dir)
+    data = cache.lookup(cache.file_key(path) + (None,))
+    assert list(data.columns) == [0, 1, 2]
+    assert data.equals(expected)
+    assert data.attrs == {}
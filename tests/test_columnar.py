@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from file_to_latex import HDF5Selection, load_chunks, load_data
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+feather = pytest.importorskip("pyarrow.feather")
+
+ROWS = 10000
+FRAME = pd.DataFrame({
+    "a": np.arange(ROWS),
+    "b": np.random.default_rng(0).random(ROWS),
+    "s": [f"x{i}_" for i in range(ROWS)],
+})
+select = HDF5Selection.from_strings
+
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    path = tmp_path_factory.mktemp("columnar")
+    FRAME.to_parquet(path / "d.parquet", row_group_size=1500)
+    feather.write_feather(FRAME, path / "d.feather", chunksize=1700)
+    np.save(path / "d2.npy", np.arange(ROWS * 4, dtype=float).reshape(ROWS, 4))
+    np.save(path / "d1.npy", np.arange(ROWS))
+    rec = np.zeros(ROWS, dtype=[("x", "i4"), ("y", "f8"), ("n", "S5")])
+    rec["x"] = np.arange(ROWS)
+    rec["n"] = b"ab"
+    np.save(path / "dr.npy", rec)
+    return path
+
+
+@pytest.mark.parametrize("name", ["d.parquet", "d.feather"])
+@pytest.mark.parametrize("selection, max_rows, start, stop, columns", [
+    (select(), None, 0, ROWS, ["a", "b", "s"]),
+    (select("", "2000:7000", "b,0"), None, 2000, 7000, ["b", "a"]),
+    (select("", "1490:1510", "s"), 5, 1490, 1495, ["s"]),
+    (select("", "5:5", ""), None, 5, 5, ["a", "b", "s"]),
+    (select("", "9990:", ""), 100, 9990, ROWS, ["a", "b", "s"]),
+])
+def test_arrow_selection(files, name, selection, max_rows, start, stop, columns):
+    data = load_data(files / name, selection=selection, max_rows=max_rows)
+    assert list(data.columns) == columns
+    assert list(data.index) == list(range(start, stop))
+    assert data.astype(object).values.tolist() == FRAME[columns].iloc[start:stop].astype(object).values.tolist()
+    
+    chunks = list(load_chunks(files / name, selection=selection, max_rows=max_rows, chunk_rows=700))
+    assert pd.concat(chunks).equals(data)
+
+
+def test_parquet_reads_only_selected_row_groups(files, monkeypatch):
+    calls = []
+    read_row_group = pq.ParquetFile.read_row_group
+    
+    def record(self, i, columns=None, **kwargs):
+        calls.append((i, tuple(columns)))
+        return read_row_group(self, i, columns=columns, **kwargs)
+    
+    monkeypatch.setattr(pq.ParquetFile, "read_row_group", record)
+    load_data(files / "d.parquet", selection=select("", "1490:1510", "b"))
+    assert calls == [(0, ("b",)), (1, ("b",))]
+
+
+@pytest.mark.parametrize("name, columns, expected_columns", [
+    ("d2.npy", "3,1", [3, 1]),
+    ("d1.npy", "", [0]),
+])
+def test_npy_selection(files, name, columns, expected_columns):
+    values = np.load(files / name)
+    expected = pd.DataFrame(values.reshape(ROWS, -1)).iloc[100:200][expected_columns]
+    selection = select("", "100:200", columns)
+    assert load_data(files / name, selection=selection).equals(expected)
+    assert pd.concat(load_chunks(files / name, selection=selection, chunk_rows=30)).equals(expected)
+
+
+def test_npy_record_fields(files):
+    data = load_data(files / "dr.npy", selection=select("", "5:8", "n,x"))
+    assert list(data.columns) == ["n", "x"]
+    assert data["x"].tolist() == [5, 6, 7]
+    assert data["n"].tolist() == ["ab"] * 3
+
+
+@pytest.mark.parametrize("name, columns", [("d.parquet", "zz"), ("d.feather", "7"), ("d2.npy", "9")])
+def test_bad_columns(files, name, columns):
+    with pytest.raises(ValueError):
+        load_data(files / name, selection=select("", "", columns))
+
+
+def test_object_npy_is_refused(tmp_path):
+    np.save(tmp_path / "obj.npy", np.array([{"a": 1}], dtype=object), allow_pickle=True)
+    with pytest.raises(ValueError):
+        load_data(tmp_path / "obj.npy")
@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from file_to_latex import ColumnTable, LATEX_ESCAPES, escape_latex, escape_latex_column, format_column
+from tests.escape_corpus import ESCAPE_CONTROL_CORPUS, ESCAPE_CORPUS
+
+CORPUS = ESCAPE_CORPUS + ESCAPE_CONTROL_CORPUS
+
+
+@pytest.mark.parametrize("text, expected", CORPUS)
+def test_escape_latex(text, expected):
+    assert escape_latex(text) == expected
+
+
+@pytest.mark.parametrize("corpus", [ESCAPE_CORPUS, CORPUS])
+def test_escape_latex_column(corpus):
+    texts = [text for text, _ in corpus]
+    assert escape_latex_column(texts) == [escaped for _, escaped in corpus]
+
+
+def test_column_matches_cells():
+    rng = random.Random(0)
+    alphabet = list(LATEX_ESCAPES) + ["a", " ", "\x01", "é"]
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))) for _ in range(2000)]
+    assert escape_latex_column(texts) == [escape_latex(text) for text in texts]
+    assert escape_latex_column([]) == []
+
+
+def test_format_column_escapes_text():
+    texts = [text for text, _ in ESCAPE_CORPUS]
+    assert format_column(np.array(texts, dtype=object), None, None, 2, "--") == [escaped for _, escaped in ESCAPE_CORPUS]
+
+
+def test_mixed_column_escapes_only_text():
+    values = np.array([1, "a_b", 2.5, None, "{x}"], dtype=object)
+    na_mask = pd.isna(values)
+    assert format_column(values, na_mask, None, 2, "{--}") == ["1", "a\\_b", "2.50", "{--}", "\\{x\\}"]
+
+
+def test_headers_are_escaped():
+    table = ColumnTable.from_frame(pd.DataFrame({"a_b": [1], "50%": [2], 3: [4]}))
+    assert table.headers == ["a\\_b", "50\\%", "3"]
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import file_to_latex
+from file_to_latex import (TABLE_STYLES, ColumnTable, HDF5Selection, TableStyle, dataframe_to_latex,
+                           format_rows_parallel, get_style, load_data, load_table, siunitx_alignment,
+                           wrap_standard_tabular)
+
+rng = np.random.default_rng(0)
+
+FRAMES = {
+    "ints": pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6]}),
+    "mixnum": pd.DataFrame({"y": [2018, 2019, 2020], "a": [1.25, np.nan, 3.0], "b": [4, 5, 6],
+                            "c": [np.inf, -0.04, -0.0], "d": [1e20, 2.5e19, 0.05]}),
+    "text": pd.DataFrame({"t": pd.Series(["a&b", "50%", "x_y\\z", "{}~^#$", None], dtype=object),
+                          "n": [1, 2, 3, 4, 5], "f": [0.15, 0.25, np.nan, 1.0, 2.345]}),
+    "bools": pd.DataFrame({"a": [True, False], "b": [False, True]}),
+    "mixedobj": pd.DataFrame({"m": [1, "a", 2.5, None, True, np.nan], "k": range(6)}),
+    "dates": pd.DataFrame({"d": pd.to_datetime(["2020-01-01", None]), "v": [1.0, 2.0]}),
+    "cat": pd.DataFrame({"c": pd.Categorical(["a_b", "c"]), "v": [1, 2]}),
+    "nullint": pd.DataFrame({"n": pd.array([1, None], dtype="Int64"), "v": [1.5, 2]}),
+    "f32": pd.DataFrame({"a": np.array([0.1, 0.25, 3], dtype=np.float32), "b": np.array([1, 2, 3], dtype=np.int8)}),
+    "u64": pd.DataFrame({"a": np.array([1, 2**64 - 1], dtype=np.uint64), "b": np.array([1, 2], dtype=np.int64)}),
+    "long": pd.DataFrame(rng.normal(size=(300, 7)) * 100),
+    "wide": pd.DataFrame(rng.normal(size=(5, 40))),
+    "widemix": pd.DataFrame({i: (rng.integers(0, 9, 3) if i % 3 else rng.normal(size=3)) for i in range(20)}),
+    "empty": pd.DataFrame({"a": [], "b": []}),
+    "round": pd.DataFrame({"a": [0.05, 0.15, 0.25, 0.35, 2.675, 1.005]}),
+}
+FRAMES["widemix"][7] = ["a_b", None, "c"]
+
+
+@pytest.mark.parametrize("name", FRAMES)
+@pytest.mark.parametrize("style", TABLE_STYLES)
+def test_column_table_matches_frame(name, style):
+    df = FRAMES[name]
+    for max_rows in (None, 2):
+        expected = dataframe_to_latex(df, style, "Caption", "tab:x", max_rows=max_rows)
+        assert dataframe_to_latex(ColumnTable.from_frame(df), style, "Caption", "tab:x", max_rows=max_rows) == expected
+
+
+@pytest.mark.parametrize("name", ["text", "mixnum", "mixedobj", "long", "wide", "widemix"])
+@pytest.mark.parametrize("style", TABLE_STYLES)
+def test_parallel_matches_serial(name, style):
+    df = FRAMES[name]
+    serial = get_style(style).format_rows(df)
+    for jobs in (2, 3):
+        assert format_rows_parallel(df, style, jobs) == serial
+
+
+def test_small_tables_format_serially(monkeypatch):
+    monkeypatch.setattr(file_to_latex, "format_rows_parallel", None)
+    assert get_style("standard").format_rows(FRAMES["long"], jobs=4) == get_style("standard").format_rows(FRAMES["long"])
+
+
+def test_parallel_uses_unregistered_style():
+    # Shares its name with a registered style, the workers must not look it up
+    style = TableStyle("standard", siunitx_alignment, wrap_standard_tabular, precision=4, na_rep="NA")
+    df = FRAMES["text"]
+    assert format_rows_parallel(df, style, 2) == style.format_rows(df)
+    assert "NA" in format_rows_parallel(df, style, 2)
+
+
+def test_unpicklable_style_formats_serially(monkeypatch):
+    monkeypatch.setattr(file_to_latex, "PARALLEL_FORMAT_MIN_CELLS", 0)
+    monkeypatch.setattr(file_to_latex, "format_rows_parallel", None)
+    style = TableStyle("custom", lambda data: "c" * len(data.columns), wrap_standard_tabular, na_rep="NA")
+    assert style.format_rows(FRAMES["text"], jobs=2) == style.format_rows(FRAMES["text"])
+
+
+@pytest.fixture(scope="module")
+def data_files(tmp_path_factory):
+    h5py = pytest.importorskip("h5py")
+    path = tmp_path_factory.mktemp("data")
+    rec = np.zeros(50, dtype=[("i", "i4"), ("f", "f8"), ("s", "S6"), ("b", "?"), ("u", "u2")])
+    rec["i"] = np.arange(50)
+    rec["f"] = rng.random(50)
+    rec["f"][::7] = np.nan
+    rec["s"] = b"a_b&"
+    rec["b"][::3] = True
+    floats = rng.random((30, 4))
+    floats[::5, 1] = np.nan
+    floats[3, 2] = np.inf
+    np.save(path / "rec.npy", rec)
+    np.save(path / "dt.npy", np.array(["2020-01-01", "NaT"] * 10, dtype="datetime64[ns]"))
+    np.save(path / "i2.npy", rng.integers(0, 100, (30, 6)))
+    np.save(path / "f2.npy", floats)
+    with h5py.File(path / "x.h5", "w") as f:
+        f["a"] = rec
+        f["b"] = rng.integers(0, 9, (40, 5))
+        f["c"] = np.array([b"x%y"] * 10)
+        f.create_dataset("e", data=np.array(["ab", "c_d"] * 5, dtype=object), dtype=h5py.string_dtype())
+    return path
+
+
+@pytest.mark.parametrize("name, selection", [
+    ("rec.npy", None),
+    ("dt.npy", None),
+    ("i2.npy", None),
+    ("i2.npy", HDF5Selection.from_strings("", "5:25", "4,1")),
+    ("f2.npy", None),
+    ("x.h5", HDF5Selection("/a")),
+    ("x.h5", HDF5Selection("/a", None, ("s", "f"))),
+    ("x.h5", HDF5Selection("/b", (3, 30), (1, 3))),
+    ("x.h5", HDF5Selection("/c")),
+    ("x.h5", HDF5Selection("/e")),
+])
+def test_load_table_matches_load_data(data_files, name, selection):
+    path = data_files / name
+    for style in TABLE_STYLES:
+        for max_rows in (None, 8):
+            expected = dataframe_to_latex(load_data(path, max_rows=max_rows, selection=selection), style, max_rows=max_rows)
+            table = load_table(path, max_rows=max_rows, selection=selection)
+            assert dataframe_to_latex(table, style, max_rows=max_rows) == expected
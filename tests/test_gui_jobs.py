@@ -0,0 +1,228 @@
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import file_to_latex
+from file_to_latex import ConversionCancelled, DataCache, FileToLatexConverter, LRUCache, RunStats
+
+pytest.importorskip("tkinter")
+
+
+class Var:
+    """Stands in for a Tk variable"""
+    
+    def __init__(self, value=""):
+        self.value = value
+    
+    def get(self):
+        return self.value
+    
+    def set(self, value):
+        self.value = value
+
+
+class Widget:
+    """Stands in for the widgets the jobs update"""
+    
+    def __init__(self):
+        self.text = ""
+        self.state = None
+    
+    def config(self, state=None, **options):
+        self.state = state
+    
+    def delete(self, *args):
+        self.text = ""
+    
+    def insert(self, index, text):
+        self.text += text
+    
+    def select(self, index):
+        pass
+    
+    def set_text(self, text):
+        self.text = text
+
+
+class Root:
+    """Runs root.after callbacks in order when pumped, like the Tk mainloop"""
+    
+    def __init__(self):
+        self.pending = []
+    
+    def after(self, ms, callback, *args):
+        self.pending.append((callback, args))
+    
+    def pump(self, timeout=10):
+        deadline = time.monotonic() + timeout
+        while self.pending:
+            assert time.monotonic() < deadline, "job didn't finish"
+            callback, args = self.pending.pop(0)
+            time.sleep(0.01)
+            callback(*args)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """A converter with stand-ins for its Tk root, variables and widgets"""
+    messages = []
+    monkeypatch.setattr(file_to_latex, "messagebox", types.SimpleNamespace(
+        showwarning=lambda title, message: messages.append(("warning", title, message)),
+        showerror=lambda title, message: messages.append(("error", title, message)),
+    ))
+    
+    app = FileToLatexConverter.__new__(FileToLatexConverter)
+    app.messages = messages
+    app.root = Root()
+    app.executor = ThreadPoolExecutor(max_workers=1)
+    app.job = None
+    app.cancel_event = threading.Event()
+    app.rows_read = 0
+    app.stats = RunStats()
+    app.cache = DataCache()
+    app.tabular_cache = LRUCache(max_bytes=10 ** 8)
+    app.data = app.tabular = app.tabular_style = app.saved_latex = app.watch_action = None
+    app.latex_code = ""
+    for name in ["convert_button", "preview_button", "export_button", "bundle_button", "cancel_button",
+                 "diagnostics_text", "latex_view", "notebook"]:
+        setattr(app, name, Widget())
+    for name, value in [("status", ""), ("profile", False), ("file_path", ""), ("file_type", "auto"),
+                        ("member", ""), ("max_rows", "50"), ("table_style", "booktabs"), ("caption", "Scores"),
+                        ("include_caption", True), ("label", "tab:scores"), ("format_jobs", "1"),
+                        ("h5_dataset", ""), ("h5_rows", ""), ("h5_columns", ""), ("engine", "c"), ("usecols", ""),
+                        ("dtype", ""), ("summary", False), ("group_by", ""), ("summary_stats", ""),
+                        ("group_names", "Fall Courses,Spring Courses")]:
+        setattr(app, f"{name}_var", Var(value))
+    yield app
+    app.executor.shutdown(wait=True)
+
+
+def test_result_reaches_ui_thread(app):
+    results = []
+    ui_thread = threading.get_ident()
+    
+    def on_success(result):
+        results.append((result, threading.get_ident()))
+    
+    app.start_job("Working...", lambda: 42, on_success, "Error", "Failed")
+    assert app.cancel_button.state == file_to_latex.tk.NORMAL
+    app.root.pump()
+    
+    assert results == [(42, ui_thread)]
+    assert app.cancel_button.state == file_to_latex.tk.DISABLED
+    assert app.convert_button.state == file_to_latex.tk.NORMAL
+
+
+def test_progress_is_polled(app):
+    reported, proceed = threading.Event(), threading.Event()
+    
+    def work():
+        app.report_progress(1234)
+        reported.set()
+        proceed.wait(10)
+    
+    app.start_job("Loading...", work, lambda result: None, "Error", "Failed")
+    reported.wait(10)
+    callback, args = app.root.pending.pop(0)
+    callback(*args)
+    assert app.status_var.get() == "Loading... 1,234 rows read"
+    
+    proceed.set()
+    app.root.pump()
+
+
+def test_cancel_aborts_job(app):
+    started, cancelled = threading.Event(), threading.Event()
+    results = []
+    
+    def work():
+        started.set()
+        cancelled.wait(10)
+        for rows in range(100):
+            app.report_progress(rows)
+        return "finished"
+    
+    app.start_job("Loading...", work, results.append, "Error", "Failed")
+    started.wait(10)
+    app.cancel_job()
+    assert app.status_var.get() == "Cancelling..."
+    cancelled.set()
+    app.root.pump()
+    
+    assert results == []
+    assert app.status_var.get().startswith("Cancelled")
+    assert isinstance(app.job.exception(), ConversionCancelled)
+    assert app.messages == []
+
+
+def test_errors_are_shown(app):
+    def work():
+        raise ValueError("bad input")
+    
+    app.start_job("Loading...", work, lambda result: None, "File Loading Error", "Failed to load file")
+    app.root.pump()
+    assert app.status_var.get().startswith("Failed to load file")
+    assert app.messages == [("error", "File Loading Error", "Failed to load file: bad input")]
+
+
+def test_busy_while_job_runs(app):
+    proceed = threading.Event()
+    app.start_job("Working...", lambda: proceed.wait(10), lambda result: None, "Error", "Failed")
+    app.start_job("Again...", lambda: None, lambda result: None, "Error", "Failed")
+    assert app.messages[0][:2] == ("warning", "Busy")
+    
+    proceed.set()
+    app.root.pump()
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"Year": [2018, 2019], "a": [4.5, 4.25], "b": [3.9, 4.1]}).to_csv(path, index=False)
+    return path
+
+
+def test_caption_edits_reuse_formatted_cells(app, data_file, monkeypatch):
+    calls = []
+    format_tabular = file_to_latex.format_tabular
+    
+    def counting_format_tabular(*args, **kwargs):
+        calls.append(args[1])
+        return format_tabular(*args, **kwargs)
+    
+    monkeypatch.setattr(file_to_latex, "format_tabular", counting_format_tabular)
+    app.file_path_var.set(str(data_file))
+    app.convert_file()
+    app.root.pump()
+    assert "\\caption{Scores}" in app.latex_code
+    
+    # Only the wrapper changes, the cached tabular is reused
+    app.caption_var.set("Ratings")
+    app.label_var.set("tab:ratings")
+    app.convert_file()
+    app.root.pump()
+    assert "\\caption{Ratings}" in app.latex_code and "Scores" not in app.latex_code
+    assert calls == ["booktabs"]
+    
+    app.table_style_var.set("standard")
+    app.convert_file()
+    app.root.pump()
+    assert calls == ["booktabs", "standard"]
+    assert "\\hline" in app.latex_code
+
+
+def test_changed_file_is_formatted_again(app, data_file):
+    app.file_path_var.set(str(data_file))
+    app.convert_file()
+    app.root.pump()
+    assert "2018 & 4.5 & 3.9" in app.latex_code
+    
+    pd.DataFrame({"Year": [2020], "a": [1.5], "b": [2.5]}).to_csv(data_file, index=False)
+    app.convert_file()
+    app.root.pump()
+    assert "2020 & 1.5 & 2.5" in app.latex_code
+    assert "2018" not in app.latex_code
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from file_to_latex import HDF5Selection, load_chunks, load_data, load_table
+
+h5py = pytest.importorskip("h5py")
+
+VALUES = np.arange(60).reshape(12, 5)
+select = HDF5Selection.from_strings
+
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    path = tmp_path_factory.mktemp("hdf5")
+    rec = np.zeros(12, dtype=[("x", "i4"), ("y", "f8"), ("n", "S5")])
+    rec["x"] = np.arange(12)
+    rec["y"] = np.arange(12) / 4
+    with h5py.File(path / "d.h5", "w") as f:
+        f["grid"] = VALUES
+        f["rec"] = rec
+    np.save(path / "d.npy", VALUES)
+    return path
+
+
+@pytest.mark.parametrize("columns, expected", [("4,1", [4, 1]), ("3,0,1", [3, 0, 1]), ("2,3", [2, 3]), ("1,1,0", [1, 0])])
+def test_columns_keep_selected_order(files, columns, expected):
+    selection = select("/grid", "2:9", columns)
+    data = load_data(files / "d.h5", selection=selection)
+    assert data.equals(pd.DataFrame(VALUES).iloc[2:9][expected])
+    assert pd.concat(load_chunks(files / "d.h5", selection=selection, chunk_rows=3)).equals(data)
+    assert load_table(files / "d.h5", selection=selection).to_frame(2).equals(data)
+    
+    # The same selection of the same array in a .npy file
+    assert load_data(files / "d.npy", selection=select("", "2:9", columns)).equals(data)
+
+
+def test_compound_fields_keep_selected_order(files):
+    data = load_data(files / "d.h5", selection=select("/rec", "0:3", "y,0"))
+    assert list(data.columns) == ["y", "x"]
+    assert data["x"].tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize("dataset, columns, message", [
+    ("/grid", "5", "out of range"),
+    ("/grid", "1,9", "out of range"),
+    ("/grid", "a", "not found"),
+    ("/rec", "z", "not found"),
+    ("/rec", "3", "out of range"),
+])
+def test_invalid_columns(files, dataset, columns, message):
+    with pytest.raises(ValueError, match=message):
+        load_data(files / "d.h5", selection=select(dataset, "", columns))
@@ -0,0 +1,37 @@
+import os
+
+from file_to_latex import LineBuffer
+
+
+def test_lines():
+    buffer = LineBuffer.from_text("first\nsecond\nthird\n")
+    assert len(buffer) == 3
+    assert buffer.lines(0, 2) == "first\nsecond"
+    assert buffer.lines(2, 10) == "third"
+    assert buffer.lines(3, 4) == ""
+    assert buffer.text() == "first\nsecond\nthird\n"
+
+
+def test_mapped_file_can_be_replaced_after_close(tmp_path):
+    path = str(tmp_path / "out.tex")
+    with open(path, "w") as f:
+        f.write("a\nb\n")
+    
+    buffer = LineBuffer.from_file(path)
+    assert buffer.path == path and buffer.lines(1, 2) == "b"
+    buffer.close()
+    assert len(buffer) == 0 and buffer.mapping is None
+    
+    # The export writes a .part file and replaces the shown one with it
+    with open(path + ".part", "w") as f:
+        f.write("c\n")
+    os.replace(path + ".part", path)
+    assert LineBuffer.from_file(path).text() == "c\n"
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.tex"
+    path.write_text("")
+    buffer = LineBuffer.from_file(str(path))
+    assert len(buffer) == 0 and buffer.text() == ""
+    buffer.close()
@@ -0,0 +1,53 @@
+import os
+
+import file_to_latex
+from file_to_latex import BuildManifest, parse_args, run_batch
+
+
+def build(tmp_path, *options):
+    return run_batch(parse_args([str(tmp_path / "data.csv"), "--manifest", str(tmp_path / "manifest.json"),
+                                 "--jobs", "1", *options]))
+
+
+def test_unchanged_inputs_are_skipped(tmp_path, capsys):
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+    assert build(tmp_path) == 0
+    assert "ok " in capsys.readouterr().out
+    
+    assert build(tmp_path) == 0
+    assert "(up to date)" in capsys.readouterr().out
+    
+    # Other options change the output
+    assert build(tmp_path, "--style", "standard") == 0
+    assert "ok " in capsys.readouterr().out
+    
+    (tmp_path / "data.csv").write_text("a,b\n3,4\n")
+    assert build(tmp_path, "--style", "standard") == 0
+    assert "ok " in capsys.readouterr().out
+    with open(tmp_path / "data_table.tex") as f:
+        assert "3 & 4" in f.read()
+
+
+def test_missing_output_is_rebuilt(tmp_path, capsys):
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+    assert build(tmp_path) == 0
+    os.remove(tmp_path / "data_table.tex")
+    capsys.readouterr()
+    
+    assert build(tmp_path) == 0
+    assert "ok " in capsys.readouterr().out
+    assert os.path.exists(tmp_path / "data_table.tex")
+
+
+def test_other_converter_version_rebuilds(tmp_path, monkeypatch, capsys):
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+    assert build(tmp_path) == 0
+    assert BuildManifest(str(tmp_path / "manifest.json")).entries["data.csv"]["converter"] == (
+        file_to_latex.converter_version())
+    capsys.readouterr()
+    
+    monkeypatch.setattr(file_to_latex, "converter_version", lambda: "upgraded")
+    assert build(tmp_path) == 0
+    assert "ok " in capsys.readouterr().out
+    assert build(tmp_path) == 0
+    assert "(up to date)" in capsys.readouterr().out
@@ -0,0 +1,43 @@
+import tarfile
+
+import numpy as np
+import pytest
+
+from file_to_latex import HDF5Selection, collect_stats, load_data, load_table
+
+# Rows after the first three can't be parsed, so a load that gets past them fails
+TEXT = "a,b\n1,2\n3,4\n5,6\n7,8,9,10\n\"unterminated\n"
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(TEXT)
+    return path
+
+
+def test_only_needed_rows_are_parsed(text_file):
+    assert load_data(str(text_file), max_rows=2)["a"].tolist() == [1, 3]
+    assert load_data(str(text_file), max_rows=3, progress=lambda rows: None)["b"].tolist() == [2, 4, 6]
+
+
+def test_only_needed_rows_of_archive_member_are_parsed(tmp_path, text_file):
+    archive = tmp_path / "data.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(text_file, "data.csv")
+    assert load_data(str(archive), member="data.csv", max_rows=3)["a"].tolist() == [1, 3, 5]
+
+
+def test_only_needed_rows_of_hdf5_are_read(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    path = tmp_path / "data.h5"
+    with h5py.File(path, "w") as f:
+        f["values"] = np.arange(30000, dtype=np.int64).reshape(10000, 3)
+    
+    with collect_stats() as stats:
+        data = load_data(str(path), max_rows=10, selection=HDF5Selection("/values", (100, None)))
+    assert data.index.tolist() == list(range(100, 110))
+    assert data[0].tolist() == list(range(300, 330, 3))
+    assert stats.report()["parse"]["rows"] == 10
+    
+    assert len(load_table(str(path), max_rows=10)) == 10
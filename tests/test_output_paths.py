@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from file_to_latex import output_paths_for, parse_args, run_batch
+
+
+def test_next_to_input():
+    assert output_paths_for([os.path.join("a", "data.csv")]) == {
+        os.path.join("a", "data.csv"): os.path.join("a", "data_table.tex"),
+    }
+
+
+def test_output_dir_and_tar_gz():
+    paths = output_paths_for(["a.csv", os.path.join("x", "b.tar.gz")], "out", suffix="_tables.tex")
+    assert paths == {
+        "a.csv": os.path.join("out", "a_tables.tex"),
+        os.path.join("x", "b.tar.gz"): os.path.join("out", "b_tables.tex"),
+    }
+
+
+def test_extensions_tell_inputs_apart():
+    paths = output_paths_for(["data.csv", "data.h5", "other.csv"], "out")
+    assert paths == {
+        "data.csv": os.path.join("out", "data_csv_table.tex"),
+        "data.h5": os.path.join("out", "data_h5_table.tex"),
+        "other.csv": os.path.join("out", "other_table.tex"),
+    }
+
+
+def test_directories_tell_inputs_apart():
+    first, second, nested = (os.path.join("a", "data.csv"), os.path.join("b", "data.csv"),
+                             os.path.join("b", "c", "data.csv"))
+    paths = output_paths_for([first, second, nested], "out")
+    assert paths == {
+        first: os.path.join("out", "a_data_csv_table.tex"),
+        second: os.path.join("out", "b_data_csv_table.tex"),
+        nested: os.path.join("out", "b_c_data_csv_table.tex"),
+    }
+    assert len(set(paths.values())) == 3
+
+
+def test_same_directories_only_clash_without_output_dir():
+    first, second = os.path.join("a", "data.csv"), os.path.join("b", "data.csv")
+    assert output_paths_for([first, second]) == {
+        first: os.path.join("a", "data_table.tex"),
+        second: os.path.join("b", "data_table.tex"),
+    }
+
+
+def test_remaining_clash_raises():
+    with pytest.raises(ValueError, match="same file"):
+        output_paths_for([os.path.join("a", "data.csv"), os.path.join(".", "a", "data.csv")], "out")
+
+
+def test_batch_fails_on_clash(tmp_path, capsys):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "data.csv").write_text("x,y\n1,2\n")
+    
+    first, second = str(tmp_path / "a" / "data.csv"), str(tmp_path / "b" / "data.csv")
+    out = tmp_path / "out"
+    assert run_batch(parse_args([first, second, "-o", str(out), "--jobs", "1"])) == 0
+    assert sorted(os.listdir(out)) == ["a_data_csv_table.tex", "b_data_csv_table.tex"]
+    
+    assert run_batch(parse_args([first, os.path.join(str(tmp_path), ".", "a", "data.csv"), "-o", str(out)])) == 1
+    assert "same file" in capsys.readouterr().err
@@ -0,0 +1,125 @@
+import http.client
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from file_to_latex import ConversionService, dataframe_to_latex, is_loopback, load_data, make_service_server
+
+FRAME = pd.DataFrame({"name": ["a_b", "c", "d"], "count": [1, 2, 3], "ratio": [0.5, 1.25, None]})
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("service")
+    FRAME.to_csv(path / "data.csv", index=False)
+    return path
+
+
+def start(service):
+    """Serve on a free localhost port on a thread, return (server, request function)"""
+    server = make_service_server(service, "127.0.0.1", port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    
+    def request(method, url, body=None):
+        connection = http.client.HTTPConnection(host, port, timeout=60)
+        try:
+            connection.request(method, url, body=body)
+            response = connection.getresponse()
+            return response.status, response.getheader("X-Cache"), response.read().decode()
+        finally:
+            connection.close()
+    
+    return server, request
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = ConversionService(jobs=2, queue_size=2)
+    server, request = start(service)
+    yield service, request
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def expected_latex(path):
+    return dataframe_to_latex(load_data(path, max_rows=50), "booktabs", None, "tab:data", 50)
+
+
+def test_health(service):
+    _, request = service
+    assert request("GET", "/health")[0] == 200
+
+
+def test_convert_path_then_cache_hits(service, data_dir):
+    _, request = service
+    path = str(data_dir / "data.csv")
+    status, cache, latex = request("GET", f"/convert?path={path}")
+    assert (status, cache, latex) == (200, "miss", expected_latex(path))
+    
+    # Parsed inputs are shared, so every worker finds it
+    for _ in range(4):
+        assert request("GET", f"/convert?path={path}")[:2] == (200, "hit")
+
+
+def test_upload(service, data_dir):
+    svc, request = service
+    body = (data_dir / "data.csv").read_bytes()
+    status, _, latex = request("POST", "/convert?name=data.csv&style=standard&max-rows=2", body)
+    assert status == 200
+    assert latex == dataframe_to_latex(FRAME, "standard", None, "tab:data", 2)
+    
+    assert request("POST", "/convert?name=data.csv&style=standard&max-rows=2", body)[:2] == (200, "hit")
+    
+    # Uploads are removed once the response is sent
+    deadline = time.monotonic() + 10
+    while svc.uploads and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert svc.uploads == {}
+
+
+@pytest.mark.parametrize("method, url, status", [
+    ("GET", "/convert", 400),
+    ("GET", "/convert?path=data.csv&bogus=1", 400),
+    ("GET", "/convert?path=data.csv&style=nosuch", 400),
+    ("GET", "/convert?path=/no/such/file.csv", 404),
+    ("GET", "/nothing", 404),
+])
+def test_errors(service, method, url, status):
+    _, request = service
+    assert request(method, url)[0] == status
+
+
+def test_root_limits_paths(data_dir):
+    service = ConversionService(jobs=1, root=str(data_dir))
+    server, request = start(service)
+    try:
+        assert request("GET", "/convert?path=data.csv")[0] == 200
+        assert request("GET", f"/convert?path={data_dir / 'data.csv'}")[0] == 200
+        assert request("GET", "/convert?path=../data.csv")[0] == 403
+        assert request("GET", f"/convert?path={os.path.abspath(__file__)}")[0] == 403
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_paths_disabled(data_dir):
+    service = ConversionService(jobs=1, local_paths=False)
+    server, request = start(service)
+    try:
+        assert request("GET", f"/convert?path={data_dir / 'data.csv'}")[0] == 403
+        assert request("POST", "/convert?name=data.csv", (data_dir / "data.csv").read_bytes())[0] == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_is_loopback():
+    assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
+    assert not is_loopback("0.0.0.0") and not is_loopback("192.168.1.2") and not is_loopback("example.com")
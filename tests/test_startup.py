@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+import file_to_latex
+
+# Modules importing file_to_latex must not load, they are imported on first use
+DEFERRED_MODULES = ["pandas", "numpy", "h5py", "tkinter", "pyarrow"]
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True,
+                          cwd=os.path.dirname(file_to_latex.__file__)).stdout
+
+
+def test_import_is_lazy():
+    loaded = run_python("import sys, file_to_latex; print(*sys.modules)").split()
+    assert [name for name in DEFERRED_MODULES if name in loaded] == []
+
+
+def test_heavy_modules_load_on_first_use():
+    loaded = run_python(
+        "import sys, file_to_latex; file_to_latex.pd.DataFrame(); print(*sys.modules)"
+    ).split()
+    assert "pandas" in loaded
+    assert "h5py" not in loaded and "tkinter" not in loaded
@@ -0,0 +1,83 @@
+import os
+import threading
+
+import pandas as pd
+
+from file_to_latex import DataCache, RunStats, collect_stats, convert_path, format_stats, stage
+
+
+def test_stage_totals():
+    stats = RunStats()
+    stats.add("parse", 0.5, rows=10, bytes_in=100)
+    stats.add("parse", 0.25, rows=5, bytes_in=50)
+    stats.add("format", 0.125, cells=30)
+    
+    assert stats.report() == {
+        "parse": {"seconds": 0.75, "calls": 2, "rows": 15, "bytes_in": 150},
+        "format": {"seconds": 0.125, "calls": 1, "cells": 30},
+    }
+    assert stats.summary() == "parse 0.750s, format 0.125s"
+    
+    lines = format_stats(stats.report()).splitlines()
+    assert lines[1].split()[:5] == ["parse", "2", "0.750", "15", "-"]
+    assert lines[-1].split() == ["total", "0.875"]
+
+
+def test_stage_outside_collect_stats_is_a_no_op():
+    with stage("parse") as counters:
+        counters["rows"] = 1
+    
+    with collect_stats() as stats:
+        with stage("parse") as counters:
+            counters["rows"] = 2
+    assert stats.report()["parse"]["rows"] == 2
+
+
+def test_threads_record_their_own_stats():
+    reports = {}
+    
+    def run(name):
+        with collect_stats() as stats:
+            with stage(name):
+                pass
+        reports[name] = stats.report()
+    
+    threads = [threading.Thread(target=run, args=(name,)) for name in ["a", "b"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert {name: list(report) for name, report in reports.items()} == {"a": ["a"], "b": ["b"]}
+
+
+def test_conversion_stages(tmp_path):
+    path, output = str(tmp_path / "data.csv"), str(tmp_path / "data.tex")
+    pd.DataFrame({"a": range(5), "b": ["x"] * 5, "c": [0.5] * 5}).to_csv(path, index=False)
+    
+    *_, error, report = convert_path(path, output)
+    assert error is None
+    assert list(report) == ["parse", "format", "write"]
+    assert (report["parse"]["rows"], report["parse"]["cells"]) == (5, 15)
+    assert report["parse"]["bytes_in"] == os.path.getsize(path)
+    assert (report["format"]["rows"], report["format"]["cells"]) == (5, 15)
+    assert report["write"]["bytes_out"] == os.path.getsize(output)
+
+
+def test_cache_hits_and_misses(tmp_path):
+    path = str(tmp_path / "data.csv")
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(path, index=False)
+    cache = DataCache()
+    
+    with collect_stats() as stats:
+        cache.load(path)
+        cache.load(path)
+        cache.load(path, max_rows=2)
+    assert stats.report()["cache"]["misses"] == 1
+    assert stats.report()["cache"]["hits"] == 2
+    assert stats.report()["parse"]["calls"] == 1
+
+
+def test_profile_is_captured():
+    with collect_stats(profile=True) as stats:
+        sorted(range(1000))
+    assert "function calls" in stats.format_report()
@@ -0,0 +1,64 @@
+import io
+
+import pandas as pd
+import pytest
+
+from file_to_latex import TABLE_STYLES, dataframe_to_latex, format_tabular, parse_group_names, wrap_tabular, write_longtable
+
+FRAME = pd.DataFrame({
+    "Year": [2018, 2019, 2020, 2021, 2022],
+    "a": [4.5, None, 4.25, 4.0, 3.5],
+    "b": [3.9, 4.1, 4.0, 4.2, 4.3],
+    "c": [4, 5, 3, 4, 5],
+    "d": [4.25, 4.35, 4.5, 4.0, 3.75],
+})
+
+
+def stream(style, caption=None, label=None, chunk_rows=2, **options):
+    chunks = [FRAME.iloc[start:start + chunk_rows] for start in range(0, len(FRAME), chunk_rows)]
+    f = io.StringIO()
+    assert write_longtable(chunks, f, style, caption, label, **options) == len(FRAME)
+    return f.getvalue()
+
+
+@pytest.mark.parametrize("caption, label", [(None, None), ("Scores", None), ("Scores", "tab:scores")])
+def test_streamed_longtable_matches_longtable_style(caption, label):
+    assert stream("longtable", caption, label) == dataframe_to_latex(FRAME, "longtable", caption, label) + "\n"
+
+
+def test_streamed_head_repeats_caption():
+    latex = stream("booktabs", "Scores", "tab:scores")
+    assert "\\caption{Scores}\\label{tab:scores} \\\\" in latex
+    assert "\\caption[]{Scores} \\\\" in latex
+    assert "continued from previous page" not in latex
+    assert latex.count("\\multicolumn{2}{c}{Fall Courses}") == 2
+
+
+def test_group_names():
+    assert "{Fall Courses}" in dataframe_to_latex(FRAME)
+    
+    latex = dataframe_to_latex(FRAME, group_names=("Before", "After"))
+    assert "\\multicolumn{2}{c}{Before} & \\multicolumn{2}{c}{After}" in latex
+    assert "Fall Courses" not in latex
+    
+    latex = dataframe_to_latex(FRAME, group_names=None)
+    assert "\\multicolumn" not in latex and "Year & a & b & c & d \\\\" in latex
+    
+    # Styles without column groups ignore the names
+    assert "Before" not in dataframe_to_latex(FRAME, "standard", group_names=("Before", "After"))
+
+
+def test_parse_group_names():
+    assert parse_group_names("Fall Courses, Spring Courses") == ("Fall Courses", "Spring Courses")
+    assert parse_group_names(" ") is None
+    for text in ["one", "a,b,c", "a,"]:
+        with pytest.raises(ValueError):
+            parse_group_names(text)
+
+
+@pytest.mark.parametrize("style", TABLE_STYLES)
+def test_wrapping_a_cached_tabular(style):
+    # The GUI formats the tabular once and only wraps it again when the caption or label change
+    tabular = format_tabular(FRAME, style)
+    for caption, label in [(None, None), ("Scores", None), ("Scores", "tab:scores"), ("Other", "tab:other")]:
+        assert wrap_tabular(tabular, style, caption, label) == dataframe_to_latex(FRAME, style, caption, label)
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from file_to_latex import SummaryOptions, convert_path, summarize_file
+
+FRAME = pd.DataFrame({
+    "Year": [2018, 2019, 2020, 2021],
+    "a": [1.5, 2.0, None, 4.5],
+    "b": [1, 2, 3, 4],
+    "c": [4, 5, 6, 7],
+    "team": ["x", "y", "x", "y"],
+})
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.csv"
+    FRAME.to_csv(path, index=False)
+    return str(path)
+
+
+def test_summary_statistics(data_file):
+    summary = summarize_file(data_file, options=SummaryOptions.from_strings("", "count,mean,max"))
+    assert list(summary.columns) == ["Column", "count", "mean", "max"]
+    assert summary["Column"].tolist() == ["Year", "a", "b", "c"]
+    assert summary.set_index("Column").loc["a"].tolist() == [3, 8 / 3, 4.5]
+
+
+def test_grouped_summary(data_file):
+    summary = summarize_file(data_file, options=SummaryOptions.from_strings("team", "mean"))
+    assert list(summary.columns) == ["team", "Year", "a", "b", "c"]
+    assert summary["team"].tolist() == ["x", "y"]
+    assert summary["a"].tolist() == [1.5, 3.25]
+
+
+@pytest.mark.parametrize("style", ["booktabs", "standard"])
+def test_rendered_summary_table(data_file, tmp_path, style):
+    output = str(tmp_path / "summary.tex")
+    *_, error, _ = convert_path(data_file, output, style=style, summary=SummaryOptions.from_strings("", ""))
+    assert error is None
+    
+    with open(output) as f:
+        latex = f.read()
+    assert "Column & count & mean & std & min & p25 & p50 & p75 & max \\\\" in latex
+    assert "    a & 3 & " in latex
+    assert "Fall Courses" not in latex
+    assert "multicolumn" not in latex
@@ -0,0 +1,41 @@
+import pytest
+
+from file_to_latex import DataCache, TextOptions, dataframe_to_latex, load_data
+
+
+@pytest.fixture
+def header_only(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("a,b\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+@pytest.mark.parametrize("max_rows", [None, 0, 5])
+def test_header_only_file(header_only, engine, max_rows):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    options = TextOptions(engine=engine)
+    progress = []
+    
+    data = load_data(header_only, max_rows=max_rows, progress=progress.append, text_options=options)
+    assert list(data.columns) == ["a", "b"]
+    assert len(data) == 0
+    assert load_data(header_only, max_rows=max_rows, text_options=options).columns.tolist() == ["a", "b"]
+    
+    # The GUI loads through the cache with a progress callback
+    data = DataCache().load(header_only, max_rows=max_rows, progress=progress.append, text_options=options)
+    assert list(data.columns) == ["a", "b"]
+    assert "a & b" in dataframe_to_latex(data, "standard")
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_no_rows_requested(tmp_path, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n3,4\n")
+    
+    data = load_data(str(path), max_rows=0, progress=lambda rows: None, text_options=TextOptions(engine=engine))
+    assert list(data.columns) == ["a", "b"]
+    assert len(data) == 0
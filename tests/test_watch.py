@@ -0,0 +1,41 @@
+import os
+
+import file_to_latex
+from file_to_latex import FileWatcher, parse_args, watch_inputs
+
+
+def test_new_paths_are_reported_once_settled(tmp_path):
+    old, new = str(tmp_path / "a.csv"), str(tmp_path / "b.csv")
+    for path in (old, new):
+        with open(path, "w") as f:
+            f.write("x\n1\n")
+    
+    watcher = FileWatcher([old], debounce=1.0)
+    watcher.update([old, new])
+    assert watcher.poll(now=0.0) == []
+    assert watcher.poll(now=1.0) == [new]
+    assert watcher.poll(now=2.0) == []
+    
+    watcher.update([new])
+    assert watcher.paths == [new] and old not in watcher.signatures
+
+
+def test_watch_converts_new_matches(tmp_path, monkeypatch, capsys):
+    with open(tmp_path / "a.csv", "w") as f:
+        f.write("x\n1\n")
+    
+    def sleep(seconds, polls=iter(range(3))):
+        poll = next(polls, None)
+        if poll is None:
+            raise KeyboardInterrupt
+        if poll == 0:
+            with open(tmp_path / "b.csv", "w") as f:
+                f.write("y\n2\n")
+    
+    monkeypatch.setattr(file_to_latex.time, "sleep", sleep)
+    args = parse_args([str(tmp_path / "*.csv"), "--watch", "--debounce", "0", "--jobs", "1"])
+    assert watch_inputs(args) == 0
+    
+    assert os.path.exists(tmp_path / "b_table.tex")
+    output = capsys.readouterr().out
+    assert output.count("a.csv ->") == 1 and output.count("b.csv ->") == 1